@@ -43,6 +43,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'Users.instrumentation.RequestInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -75,11 +76,23 @@ WSGI_APPLICATION = 'ForeSight.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/4.1/ref/settings/#databases
+# Transactions take the write lock when they start, so exams submitted at the
+# same time wait up to 'timeout' seconds for each other instead of failing
+# with "database is locked" when a reading transaction starts writing. Tests
+# run on a file as well, the shared in-memory database fails concurrent
+# writers with "database table is locked" instead of making them wait
 
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'timeout': 20,
+            'transaction_mode': 'IMMEDIATE',
+        },
+        'TEST': {
+            'NAME': BASE_DIR / 'test_db.sqlite3',
+        },
     }
 }
 
@@ -138,6 +151,169 @@ SESSION_EXPIRE_AT_BROWSER_CLOSE = True
 SESSION_ENGINE = 'django.contrib.sessions.backends.signed_cookies'
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+# Every cached value of the project goes to the default cache. The in-memory cache
+# is only shared by the threads of one process; to share it between processes use
+# e.g. 'django.core.cache.backends.filebased.FileBasedCache' or
+# 'django.core.cache.backends.db.DatabaseCache' (then run createcachetable)
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'foresight',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    }
+}
+
+
+# Exam session store
+# Keeps the questions of every ongoing exam until it is submitted. The in-memory
+# store only works with a single process, use 'Users.exam_store.CacheExamSessionStore'
+# with a database or file based cache (OPTIONS: {'CACHE': '<alias>'}) otherwise
+
+EXAM_SESSION_STORE = {
+    'BACKEND': 'Users.exam_store.LocMemExamSessionStore',
+    'OPTIONS': {
+        'MAX_ENTRIES': 10000,
+        'TIMEOUT': 3 * 60 * 60,
+    }
+}
+
+
+# Question pools
+# IDs of the questions of each subject, cached to pick the questions of a new
+# test without loading every question. Pools are dropped whenever a question is
+# added, edited or deleted; with more than one process use a shared cache so
+# that every process sees the invalidation
+
+QUESTION_POOL = {
+    'CACHE': 'default',
+    'TIMEOUT': 60 * 60,
+}
+
+
+# Catalog cache
+# Programmes and subjects listed by the programme selector, the question form
+# and the catalog APIs. Entries are kept in the memory of each process and in
+# the cache, keyed by a version that changes whenever a programme, subject or
+# question is written; with more than one process use a shared cache
+
+CATALOG_CACHE = {
+    'CACHE': 'default',
+    'TIMEOUT': 60 * 60,
+    'MAX_ENTRIES': 64,
+}
+
+
+# Paper buffer
+# Ready-made model test papers kept per programme by background threads, so that
+# a burst of students starting a test is served from memory. DEPTH is the number
+# of papers kept per programme, the hit rate is served at api/paper-buffer
+
+PAPER_BUFFER = {
+    'ENABLED': True,
+    'DEPTH': 20,
+    'WORKERS': 2,
+}
+
+
+# Dashboard statistics
+# Aggregated results of each user shown on the dashboard, cached until the user
+# stores or removes an exam. The bar chart covers the WINDOW most recent exams
+# averaged into at most POINTS bars
+
+DASHBOARD_STATS = {
+    'CACHE': 'default',
+    'TIMEOUT': 60 * 60,
+    'WINDOW': 500,
+    'POINTS': 50,
+}
+
+
+# Answer analytics
+# Each refresh only counts the answers of the exams stored since the previous
+# one. Exams younger than LAG seconds are left for the next refresh; raise it on
+# databases where exams can commit out of their CreatedAt order (SQLite cannot)
+
+ANALYTICS = {
+    'LAG': 0,
+}
+
+
+# Tiered cache
+# Hot aggregates computed on demand, kept in the memory of each process for
+# LOCAL_TTL seconds in front of the shared CACHE. Values are fresh for TTL
+# seconds (+/- JITTER) then served STALE seconds more while being recomputed
+# in the background. NAMESPACES overrides the options of single namespaces.
+# A namespace is invalidated once a write to the rows it serves is committed,
+# see INVALIDATED_BY in Users/tiered_cache.py
+
+TIERED_CACHE = {
+    'ENABLED': True,
+    'CACHE': 'default',
+    'TTL': 60,
+    'STALE': 5 * 60,
+    'JITTER': 0.1,
+    'LOCAL_TTL': 5,
+    'LOCAL_MAX_ENTRIES': 1000,
+    'LOCK_TIMEOUT': 30,
+    'WORKERS': 2,
+    'NAMESPACES': {
+        'leaderboard': {
+            'TTL': 30,
+        },
+        'api-lists': {
+            'TTL': 10,
+            'STALE': 60,
+        },
+    },
+}
+
+
+# Near-duplicate questions
+# AddQuestion and PopulateQuestions flag a question whose MinHash similarity
+# with a question of the same subject is at least THRESHOLD. Reworded copies
+# sharing their options score around 0.6-0.8, see FindDuplicateQuestions
+
+NEAR_DUPLICATES = {
+    'THRESHOLD': 0.7,
+}
+
+
+# Request instrumentation
+# Counts the queries, outbound HTTP calls, serializer and template time of every
+# request. SERVER_TIMING sends them as a Server-Timing header, LOG writes them as
+# a JSON line to the 'Users.instrumentation' logger, which also warns about
+# requests running more than QUERY_WARNING queries (None to disable)
+
+REQUEST_INSTRUMENTATION = {
+    'ENABLED': True,
+    'SERVER_TIMING': DEBUG,
+    'LOG': False,
+    'QUERY_WARNING': 50,
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'Users.instrumentation': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
+
 # SMTP Configurations
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 EMAIL_HOST = "smtp.gmail.com"
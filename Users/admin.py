@@ -3,7 +3,7 @@ from django.contrib import admin
 from django.contrib.auth import get_user_model
 from django.contrib.auth.admin import UserAdmin
 from django.utils.translation import gettext_lazy as _
-from .models import Programme, Subject, Questions, Exams, ResultDetails, FeedBack
+from .models import Programme, Subject, Questions, Exams, ResultDetails, FeedBack, QuestionStatistics, SubjectStatistics
 
 
 class CustomUserAdmin(UserAdmin):
@@ -38,13 +38,21 @@ class QuestionsAdmin(admin.ModelAdmin):
 
 
 class ExamsAdmin(admin.ModelAdmin):
-    list_display = ('ID', 'UserID', 'ProgrammeName', 'CorrectCounter', 'Date')
+    list_display = ('ID', 'UserID', 'ProgrammeID', 'CorrectCounter', 'Date')
 
 
 class ResultsDetailsAdmin(admin.ModelAdmin):
     list_display = ('ID', 'ResultID', 'QuestionID', 'UserAnswer')
 
 
+class QuestionStatisticsAdmin(admin.ModelAdmin):
+    list_display = ('QuestionID', 'SubjectID', 'TimesAnswered', 'TimesCorrect', 'TimesSkipped', 'Difficulty', 'UpdatedAt')
+
+
+class SubjectStatisticsAdmin(admin.ModelAdmin):
+    list_display = ('SubjectID', 'TimesAnswered', 'TimesCorrect', 'TimesSkipped', 'Accuracy', 'UpdatedAt')
+
+
 class FeedBackAdmin(admin.ModelAdmin):
     list_display = ('ID', 'Name', 'Email')
 
@@ -56,3 +64,5 @@ admin.site.register(Programme, ProgrammeAdmin)
 admin.site.register(Questions, QuestionsAdmin)
 admin.site.register(get_user_model(), CustomUserAdmin)
 admin.site.register(ResultDetails, ResultsDetailsAdmin)
+admin.site.register(QuestionStatistics, QuestionStatisticsAdmin)
+admin.site.register(SubjectStatistics, SubjectStatisticsAdmin)
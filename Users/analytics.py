@@ -0,0 +1,268 @@
+import time
+import uuid
+import datetime
+from collections import Counter, defaultdict
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q, Count, Sum
+from django.utils.timezone import now
+from .models import *
+from .results import SKIPPED, ID_SIZE
+from .tiered_cache import InvalidateTieredCache
+
+
+DEFAULT_ANALYTICS = {
+    'LAG': 0,
+}
+
+# Counters of QuestionStatistics and the matching keys of CountAnswers
+QUESTION_COUNTERS = {
+    'TimesAnswered': 'answered',
+    'TimesCorrect': 'correct',
+    'TimesSkipped': 'skipped',
+    'OptionOneChosen': 'option_one',
+    'OptionTwoChosen': 'option_two',
+    'OptionThreeChosen': 'option_three',
+    'OptionFourChosen': 'option_four',
+}
+
+
+def GetAnalyticsConfig():
+    return {**DEFAULT_ANALYTICS, **getattr(settings, 'ANALYTICS', {})}
+
+
+def CountAnswers(sheets):
+    """
+    Count the answers of each question of the given exams
+
+    The answers are counted in Python from the ResultSheet of each exam,
+    then the counts are matched with the options of their questions in a
+    single query
+
+    Parameters:
+        sheets (QuerySet): The ResultSheet rows to be counted
+
+    Returns:
+        List: One dict per answered question with its subject and counters
+    """
+
+    counts = Counter()
+
+    for paper, answers in sheets.order_by().values_list('Paper', 'Answers').iterator(chunk_size=2000):
+        paper = bytes(paper)
+        counts.update(zip([paper[index:index + ID_SIZE] for index in range(0, len(paper), ID_SIZE)], bytes(answers)))
+
+    chosen = defaultdict(Counter)
+
+    for (question_id, option), count in counts.items():
+        chosen[uuid.UUID(bytes=question_id)][option] += count
+
+    questions = Questions.objects.filter(ID__in=list(chosen)).values_list('ID', 'SubjectID', 'Answer', 'OptionOne', 'OptionTwo', 'OptionThree', 'OptionFour')
+    rows = []
+
+    # Answers of deleted questions are not counted
+    for question_id, subject_id, answer, *options in questions:
+        options_chosen = chosen[question_id]
+
+        rows.append({
+            'QuestionID': question_id,
+            'QuestionID__SubjectID': subject_id,
+            'answered': sum(options_chosen.values()),
+            'correct': sum(options_chosen[index + 1] for index, option in enumerate(options) if option == answer),
+            'skipped': options_chosen[SKIPPED],
+            **{key: options_chosen[index + 1] for index, key in enumerate(['option_one', 'option_two', 'option_three', 'option_four'])},
+        })
+
+    return rows
+
+
+def GetDifficulty(answered, correct):
+    return 1 - correct / answered if answered else 0.0
+
+
+def NewQuestionStatistics(row, updated_at):
+    return QuestionStatistics(
+        QuestionID_id=row['QuestionID'],
+        SubjectID_id=row['QuestionID__SubjectID'],
+        Difficulty=GetDifficulty(row['answered'], row['correct']),
+        UpdatedAt=updated_at,
+        **{field: row[key] for field, key in QUESTION_COUNTERS.items()}
+    )
+
+
+def ReplaceQuestionStatistics(answers, updated_at):
+    """
+    Recompute the statistics of every question from the given answers
+
+    Parameters:
+        answers (QuerySet): Every ResultSheet row to be counted
+        updated_at (datetime): The time the statistics are computed at
+
+    Returns:
+        tuple: The number of questions having statistics and the number of answers counted
+    """
+
+    rows = CountAnswers(answers)
+
+    QuestionStatistics.objects.all().delete()
+    QuestionStatistics.objects.bulk_create([NewQuestionStatistics(row, updated_at) for row in rows], batch_size=1000)
+
+    return len(rows), sum(row['answered'] for row in rows)
+
+
+def FoldQuestionStatistics(answers, updated_at):
+    """
+    Add the given answers to the statistics already stored for their questions
+
+    Parameters:
+        answers (QuerySet): The ResultSheet rows not counted yet
+        updated_at (datetime): The time the statistics are computed at
+
+    Returns:
+        tuple: The number of questions whose statistics changed and the number of answers counted
+    """
+
+    rows = CountAnswers(answers)
+
+    stored = QuestionStatistics.objects.filter(QuestionID__in=[row['QuestionID'] for row in rows]).values_list('QuestionID', *QUESTION_COUNTERS)
+    stored = {counters[0]: dict(zip(QUESTION_COUNTERS, counters[1:])) for counters in stored}
+
+    question_statistics = []
+
+    for row in rows:
+        counters = stored.get(row['QuestionID'], {})
+        row = {**row, **{key: row[key] + counters.get(field, 0) for field, key in QUESTION_COUNTERS.items()}}
+
+        question_statistics.append(NewQuestionStatistics(row, updated_at))
+
+    # Inserted for new questions, overwritten with the summed counters otherwise
+    QuestionStatistics.objects.bulk_create(
+        question_statistics,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=['QuestionID'],
+        update_fields=[*QUESTION_COUNTERS, 'Difficulty', 'UpdatedAt']
+    )
+
+    return len(rows), sum(row['answered'] for row in rows)
+
+
+def ComputeSubjectStatistics(updated_at):
+    """
+    Summarize the stored question statistics per subject
+
+    Parameters:
+        updated_at (datetime): The time the statistics are computed at
+
+    Returns:
+        List: Unsaved SubjectStatistics, one per subject having answered questions
+    """
+
+    grouped_questions = (
+        QuestionStatistics.objects
+        .order_by()
+        .values('SubjectID')
+        .annotate(answered=Sum('TimesAnswered'), correct=Sum('TimesCorrect'), skipped=Sum('TimesSkipped'))
+    )
+
+    return [
+        SubjectStatistics(
+            SubjectID_id=row['SubjectID'],
+            TimesAnswered=row['answered'],
+            TimesCorrect=row['correct'],
+            TimesSkipped=row['skipped'],
+            Accuracy=row['correct'] / row['answered'] if row['answered'] else 0.0,
+            UpdatedAt=updated_at,
+        )
+        for row in grouped_questions
+    ]
+
+
+def StoredAfter(created_at, exam_id):
+    """
+    Build the condition selecting the exams stored after the given (CreatedAt, ID) keyset
+
+    Parameters:
+        created_at (datetime): CreatedAt of an exam
+        exam_id (UUID): ID of the exam
+
+    Returns:
+        Q: The condition to filter Exams with
+    """
+
+    return Q(CreatedAt__gt=created_at) | Q(CreatedAt=created_at, ID__gt=exam_id)
+
+
+def RefreshAnalytics(rebuild=False):
+    """
+    Bring the question and subject statistics up to date
+
+    Only the answers of the exams stored after the watermark are counted and
+    added to the stored statistics. The first refresh, or one asked to
+    rebuild, recounts every answer. Deleted exams stay counted until the
+    next rebuild
+
+    Parameters:
+        rebuild (bool): Optional. Recount every stored answer instead
+
+    Returns:
+        dict: {'rebuild': bool, 'exams': int, 'answers': int, 'questions': int, 'subjects': int, 'seconds': float}
+    """
+
+    start = time.perf_counter()
+    config = GetAnalyticsConfig()
+
+    with transaction.atomic():
+        watermark = AnalyticsWatermark.objects.select_for_update().first() or AnalyticsWatermark()
+        rebuild = rebuild or watermark.LastExamCreatedAt is None
+
+        updated_at = now()
+
+        # Exams committed out of CreatedAt order are missed unless they are older than LAG seconds
+        exams = Exams.objects.filter(CreatedAt__lte=updated_at - datetime.timedelta(seconds=config['LAG']))
+
+        if not rebuild:
+            exams = exams.filter(StoredAfter(watermark.LastExamCreatedAt, watermark.LastExamID))
+
+        last_exam = exams.order_by('-CreatedAt', '-ID').values('CreatedAt', 'ID').first()
+
+        if last_exam is None and not rebuild:
+            return {'rebuild': False, 'exams': 0, 'answers': 0, 'questions': 0, 'subjects': 0, 'seconds': time.perf_counter() - start}
+
+        if last_exam is not None:
+            # Exams stored while counting are left for the next refresh
+            exams = exams.exclude(StoredAfter(last_exam['CreatedAt'], last_exam['ID']))
+
+        answers = ResultSheet.objects.filter(ResultID__in=exams.values('ID'))
+
+        if rebuild:
+            questions, total_answers = ReplaceQuestionStatistics(answers, updated_at)
+
+        else:
+            questions, total_answers = FoldQuestionStatistics(answers, updated_at)
+
+        subject_statistics = ComputeSubjectStatistics(updated_at)
+
+        SubjectStatistics.objects.all().delete()
+        SubjectStatistics.objects.bulk_create(subject_statistics, batch_size=1000)
+
+        if last_exam is not None:
+            watermark.LastExamCreatedAt = last_exam['CreatedAt']
+            watermark.LastExamID = last_exam['ID']
+
+        watermark.UpdatedAt = updated_at
+        watermark.save()
+
+        # The analytics endpoints serve their pages from the 'api-lists' tiered cache
+        transaction.on_commit(lambda: InvalidateTieredCache('api-lists'))
+
+        total_exams = exams.count()
+
+    return {
+        'rebuild': rebuild,
+        'exams': total_exams,
+        'answers': total_answers,
+        'questions': questions,
+        'subjects': len(subject_statistics),
+        'seconds': time.perf_counter() - start,
+    }
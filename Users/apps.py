@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'Users'
+
+    def ready(self):
+        # Connect the receivers keeping the question pools, totals, paper buffers, dashboard statistics, catalog, question signatures, tiered caches and search triggers up to date
+        from . import question_pool, question_totals, paper_buffer, dashboard_stats, catalog, near_duplicates, tiered_cache, full_text
@@ -0,0 +1,123 @@
+import time
+import threading
+from collections import OrderedDict
+from django.conf import settings
+from django.db import transaction
+from django.core.cache import caches
+from django.dispatch import receiver
+from django.db.models.signals import post_save, post_delete
+from .models import *
+
+
+DEFAULT_CATALOG_CACHE = {
+    'CACHE': 'default',
+    'TIMEOUT': 60 * 60,
+    'MAX_ENTRIES': 64,
+}
+
+KEY_PREFIX = 'catalog'
+VERSION_KEY = f'{KEY_PREFIX}:version'
+
+# Entries of the current process, least recently used first
+_entries = OrderedDict()
+_lock = threading.Lock()
+
+
+def GetCatalogConfig():
+    return {**DEFAULT_CATALOG_CACHE, **getattr(settings, 'CATALOG_CACHE', {})}
+
+
+def GetCatalogVersion(cache):
+    """
+    Return the current version of the catalog, shared by every process through the cache
+
+    A version missing from the cache restarts from the clock, so that a
+    version lost to eviction is never reused
+
+    Parameters:
+        cache (BaseCache): The cache holding the version
+
+    Returns:
+        int: The version
+    """
+
+    version = cache.get(VERSION_KEY)
+
+    if version is None:
+        version = time.time_ns()
+
+        if not cache.add(VERSION_KEY, version, None):
+            version = cache.get(VERSION_KEY, version)
+
+    return version
+
+
+def GetCatalog(name, build):
+    """
+    Return an entry of the programme, subject and question catalog
+
+    Entries are looked up in the memory of the process, then in the cache,
+    and only built from the database when missing from both. They are keyed
+    by the catalog version, so a new version makes every process rebuild
+    them. Returned entries are shared and must not be modified
+
+    Parameters:
+        name (str): Name of the entry
+        build (callable): Builds the entry from the database
+
+    Returns:
+        The entry
+    """
+
+    config = GetCatalogConfig()
+    cache = caches[config['CACHE']]
+    key = f'{KEY_PREFIX}:{GetCatalogVersion(cache)}:{name}'
+
+    with _lock:
+        if key in _entries:
+            _entries.move_to_end(key)
+
+            return _entries[key]
+
+    value = cache.get(key)
+
+    if value is None:
+        value = build()
+        cache.set(key, value, config['TIMEOUT'])
+
+    with _lock:
+        _entries[key] = value
+
+        # Entries of older versions are never used again and fall out first
+        while len(_entries) > config['MAX_ENTRIES']:
+            _entries.popitem(last=False)
+
+    return value
+
+
+def BumpCatalogVersion():
+    """
+    Start a new catalog version so that every process rebuilds its entries
+    """
+
+    cache = caches[GetCatalogConfig()['CACHE']]
+
+    try:
+        cache.incr(VERSION_KEY)
+
+    except ValueError:
+        cache.set(VERSION_KEY, time.time_ns(), None)
+
+
+@receiver(post_save, sender=Programme)
+@receiver(post_save, sender=Subject)
+@receiver(post_save, sender=Questions)
+@receiver(post_delete, sender=Programme)
+@receiver(post_delete, sender=Subject)
+@receiver(post_delete, sender=Questions)
+def bump_catalog_version(sender, instance, **kwargs):
+    """
+    Signal receiver starting a new catalog version once a programme, subject or question change is committed
+    """
+
+    transaction.on_commit(BumpCatalogVersion)
@@ -0,0 +1,157 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.dispatch import receiver
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_save, post_delete
+from .models import *
+
+
+DEFAULT_DASHBOARD_STATS = {
+    'CACHE': 'default',
+    'TIMEOUT': 60 * 60,
+    'WINDOW': 500,
+    'POINTS': 50,
+}
+
+KEY_PREFIX = 'dashboard-stats'
+
+
+def GetStatsConfig():
+    return {**DEFAULT_DASHBOARD_STATS, **getattr(settings, 'DASHBOARD_STATS', {})}
+
+
+def MakeKey(user_id):
+    return f'{KEY_PREFIX}:{user_id}'
+
+
+def Downsample(results, points):
+    """
+    Average consecutive results into at most the given number of points
+
+    Parameters:
+        results (list): (correct, incorrect) of each exam in the order they were taken
+        points (int): The highest number of points returned
+
+    Returns:
+        List: [(first exam index, last exam index, mean correct, mean incorrect), ...]
+    """
+
+    series = []
+    size = -(-len(results) // points) if results else 1
+
+    for start in range(0, len(results), size):
+        window = results[start:start + size]
+
+        series.append((
+            start,
+            start + len(window) - 1,
+            round(sum(correct for correct, _ in window) / len(window), 2),
+            round(sum(incorrect for _, incorrect in window) / len(window), 2),
+        ))
+
+    return series
+
+
+def BuildDashboardStats(user_id, WINDOW=500, POINTS=50, **options):
+    """
+    Aggregate the exams of a user in the database
+
+    Parameters:
+        user_id: ID of the user
+        WINDOW (int): Number of most recent exams in the series
+        POINTS (int): Highest number of points in the series
+
+    Returns:
+        dict: {
+            'tests_taken': int,
+            'correct': int,
+            'incorrect': int,
+            'programmes': {'<programme>': int, ...},
+            'series': [{'first': int, 'last': int, 'correct': float, 'incorrect': float}, ...]
+        }
+    """
+
+    exams = Exams.objects.filter(UserID=user_id)
+
+    totals = exams.aggregate(
+                tests_taken=Count('ID'),
+                correct=Coalesce(Sum('CorrectCounter'), 0),
+                questions=Coalesce(Sum('TotalQuestions'), 0),
+            )
+
+    standings = LeaderBoardStanding.objects.filter(UserID=user_id).order_by('ProgrammeID__Name')
+    programmes = dict(standings.values_list('ProgrammeID__Name', 'TestsTaken'))
+
+    # Exams of the same day only differ by the time they were stored
+    recent = exams.order_by('-CreatedAt', '-ID').values_list('CorrectCounter', 'TotalQuestions')[:WINDOW]
+    recent = [(correct, total - correct) for correct, total in reversed(recent)]
+
+    # Exams before the window are numbered too, so that labels stay the same as the history grows
+    skipped = totals['tests_taken'] - len(recent)
+
+    return {
+        'tests_taken': totals['tests_taken'],
+        'correct': totals['correct'],
+        'incorrect': totals['questions'] - totals['correct'],
+        'programmes': programmes,
+        'series': [
+            {
+                'first': skipped + first + 1,
+                'last': skipped + last + 1,
+                'correct': correct,
+                'incorrect': incorrect,
+            }
+            for first, last, correct, incorrect in Downsample(recent, POINTS)
+        ],
+    }
+
+
+def GetDashboardStats(user_id):
+    """
+    Return the dashboard statistics of a user, cached until the user stores or removes an exam
+
+    Parameters:
+        user_id: ID of the user
+
+    Returns:
+        dict: The statistics as returned by BuildDashboardStats
+    """
+
+    config = GetStatsConfig()
+    cache = caches[config['CACHE']]
+    key = MakeKey(user_id)
+
+    stats = cache.get(key)
+
+    if stats is None:
+        stats = BuildDashboardStats(user_id, **config)
+        cache.set(key, stats, config['TIMEOUT'])
+
+    return stats
+
+
+def InvalidateDashboardStats(user_id):
+    """
+    Drop the cached statistics of a user so that they are rebuilt on next use
+
+    Parameters:
+        user_id: ID of the user whose exams changed
+    """
+
+    caches[GetStatsConfig()['CACHE']].delete(MakeKey(user_id))
+
+
+@receiver(post_save, sender=Exams)
+@receiver(post_delete, sender=Exams)
+def invalidate_dashboard_stats(sender, instance, **kwargs):
+    """
+    Signal receiver dropping the statistics of the user of a stored or deleted exam
+
+    The statistics are dropped once the transaction commits, so that a dashboard
+    view running in the meantime cannot cache them without the new exam
+    """
+
+    user_id = instance.UserID_id
+    transaction.on_commit(lambda: InvalidateDashboardStats(user_id))
@@ -0,0 +1,168 @@
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+
+DEFAULT_EXAM_SESSION_STORE = {
+    'BACKEND': 'Users.exam_store.LocMemExamSessionStore',
+    'OPTIONS': {},
+}
+
+
+class BaseExamSessionStore:
+    """
+    Base class for storing the papers of ongoing exams
+
+    Each attempt is saved under a random key and holds only what is needed
+    to rebuild and score the paper on any worker:
+
+        {
+            'UserID': str,             # ID of the user taking the exam
+            'Programme': str | None,   # Name of the programme of the paper
+            'Questions': [str, ...],   # IDs of the questions in paper order
+            'ChoiceOrders': [str, ...] # Order of the options of each question, e.g. '2013'
+        }
+    """
+
+    def __init__(self, TIMEOUT=3 * 60 * 60, **options):
+        self.timeout = TIMEOUT
+
+    def Create(self, attempt):
+        """
+        Store a new attempt
+
+        Parameters:
+            attempt (dict): The attempt to be stored
+
+        Returns:
+            str: The key under which the attempt is stored
+        """
+
+        key = uuid.uuid4().hex
+        self.Set(key, attempt)
+
+        return key
+
+    def Set(self, key, attempt):
+        raise NotImplementedError('Subclasses of BaseExamSessionStore must provide a Set() method')
+
+    def Get(self, key):
+        raise NotImplementedError('Subclasses of BaseExamSessionStore must provide a Get() method')
+
+    def Delete(self, key):
+        raise NotImplementedError('Subclasses of BaseExamSessionStore must provide a Delete() method')
+
+    def Pop(self, key):
+        """
+        Retrieve an attempt and remove it from the store
+
+        Parameters:
+            key (str): The key of the attempt
+
+        Returns:
+            dict: The stored attempt or None if it does not exist or has expired
+        """
+
+        attempt = self.Get(key)
+
+        if attempt is not None:
+            self.Delete(key)
+
+        return attempt
+
+
+class LocMemExamSessionStore(BaseExamSessionStore):
+    """
+    In-memory LRU store with time based eviction
+
+    Suitable for a single process only, attempts are not visible to other workers
+    """
+
+    def __init__(self, MAX_ENTRIES=10000, **options):
+        super().__init__(**options)
+
+        self.max_entries = MAX_ENTRIES
+        self.lock = threading.Lock()
+        self.attempts = OrderedDict()
+
+    def Set(self, key, attempt):
+        with self.lock:
+            self.attempts[key] = (time.monotonic() + self.timeout, attempt)
+            self.attempts.move_to_end(key)
+
+            while len(self.attempts) > self.max_entries:
+                self.attempts.popitem(last=False)
+
+    def Get(self, key):
+        with self.lock:
+            value = self.attempts.get(key)
+
+            if value is None:
+                return None
+
+            expires_at, attempt = value
+
+            if expires_at < time.monotonic():
+                del self.attempts[key]
+                return None
+
+            self.attempts.move_to_end(key)
+
+            return attempt
+
+    def Delete(self, key):
+        with self.lock:
+            self.attempts.pop(key, None)
+
+
+class CacheExamSessionStore(BaseExamSessionStore):
+    """
+    Store backed by one of the caches configured in settings.CACHES
+
+    Use it with a database or file based cache when the site runs on more
+    than one process, so that any worker can score a submitted paper
+    """
+
+    def __init__(self, CACHE='default', KEY_PREFIX='exam-session', **options):
+        super().__init__(**options)
+
+        self.cache = caches[CACHE]
+        self.key_prefix = KEY_PREFIX
+
+    def MakeKey(self, key):
+        return f'{self.key_prefix}:{key}'
+
+    def Set(self, key, attempt):
+        self.cache.set(self.MakeKey(key), attempt, self.timeout)
+
+    def Get(self, key):
+        return self.cache.get(self.MakeKey(key))
+
+    def Delete(self, key):
+        self.cache.delete(self.MakeKey(key))
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def GetExamSessionStore():
+    """
+    Return the exam session store configured by settings.EXAM_SESSION_STORE
+    """
+
+    global _store
+
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                config = getattr(settings, 'EXAM_SESSION_STORE', DEFAULT_EXAM_SESSION_STORE)
+                backend = import_string(config['BACKEND'])
+
+                _store = backend(**config.get('OPTIONS', {}))
+
+    return _store
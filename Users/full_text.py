@@ -0,0 +1,264 @@
+"""
+Full-text search over question titles and options, report issues and
+feedback messages
+
+On SQLite each model has an FTS5 table holding a copy of the text of its
+rows, created by migration 0037 and kept in sync by triggers, so rows
+inserted in bulk or updated with QuerySet.update() are indexed as well.
+The FTS5 rowid of a row is the INTEGER PRIMARY KEY of its entry in
+<table>_rows, which VACUUM never renumbers, unlike the implicit rowid of
+the model tables. Nothing refers to the model tables, so migrations may
+remake them; SQLite drops their triggers with the old table, and the
+post_migrate receiver below recreates them and reindexes every row. On
+any doubt about the index, run `manage.py RebuildSearchIndex`.
+
+Searched text supports:
+
+    word1 word2     Rows containing both words, in any order
+    "word1 word2"   Rows containing the exact phrase
+    wor*            Rows containing a word starting with 'wor'
+
+Results are ranked by relevance (bm25). Other databases fall back to
+case-insensitive substring matching of each term, unranked.
+"""
+
+import re
+from django.db import connection, transaction
+from django.db.models import Q
+from django.db.models.signals import post_migrate
+from django.dispatch import receiver
+from .models import *
+
+
+# FTS5 table and indexed columns of each searchable model
+SEARCH_INDEXES = {
+    Questions: ('questions_fts', ['Title', 'OptionOne', 'OptionTwo', 'OptionThree', 'OptionFour']),
+    ReportQuestion: ('reports_fts', ['Issue']),
+    FeedBack: ('feedbacks_fts', ['Message']),
+}
+
+TERM_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+_available = None
+
+
+def IsFullTextAvailable():
+    """
+    Tell whether the FTS5 tables exist in the default database
+
+    Returns:
+        bool: True on SQLite once migration 0037 has been applied
+    """
+
+    global _available
+
+    if _available is None:
+        tables = set(connection.introspection.table_names()) if connection.vendor == 'sqlite' else set()
+        _available = all(table in tables for table, _ in SEARCH_INDEXES.values())
+
+    return _available
+
+
+def ParseTerms(text):
+    """
+    Split searched text into phrases and words
+
+    Parameters:
+        text (str): The text entered by the user
+
+    Returns:
+        List: (text, is_prefix) tuples, a phrase is never a prefix
+    """
+
+    terms = []
+
+    for phrase, word in TERM_PATTERN.findall(text or ''):
+        if phrase.strip():
+            terms.append((phrase.strip(), False))
+
+        elif word.strip('*"'):
+            terms.append((word.strip('*"'), word.endswith('*')))
+
+    return terms
+
+
+def BuildMatchQuery(terms, columns=None):
+    """
+    Build an FTS5 MATCH expression from parsed terms
+
+    Every term is quoted, so the text of the user can never be read as
+    FTS5 operators
+
+    Parameters:
+        terms (List): The terms returned by ParseTerms
+        columns (List): Optional. Only match these indexed columns
+
+    Returns:
+        str: The MATCH expression
+    """
+
+    query = ' '.join('"{}"{}'.format(term.replace('"', '""'), '*' if is_prefix else '') for term, is_prefix in terms)
+
+    if columns:
+        query = '{%s} : (%s)' % (' '.join(columns), query)
+
+    return query
+
+
+def FullTextSearch(queryset, text, columns=None):
+    """
+    Filter a queryset of a searchable model by full-text search
+
+    Parameters:
+        queryset (QuerySet): Rows of Questions, ReportQuestion or FeedBack
+        text (str): The searched text
+        columns (List): Optional. Only search these indexed columns
+
+    Returns:
+        QuerySet: The matching rows, most relevant first on SQLite. Empty when the text has no terms
+    """
+
+    table, indexed_columns = SEARCH_INDEXES[queryset.model]
+    columns = columns or indexed_columns
+    terms = ParseTerms(text)
+
+    if not terms:
+        return queryset.none()
+
+    if not IsFullTextAvailable():
+        condition = Q()
+
+        for term, _ in terms:
+            term_condition = Q()
+
+            for column in columns:
+                term_condition |= Q(**{f'{column}__icontains': term})
+
+            condition &= term_condition
+
+        return queryset.filter(condition)
+
+    meta = queryset.model._meta
+    quote_name = connection.ops.quote_name
+    match = BuildMatchQuery(terms, None if columns == indexed_columns else columns)
+
+    # A single join: the FTS5 table yields the matching rowids with their rank, <table>_rows maps them to the rows
+    matching = queryset.extra(
+                    select={'search_rank': f'{table}.rank'},
+                    tables=[table, f'{table}_rows'],
+                    where=[
+                        f'{table} MATCH %s',
+                        f'{table}_rows."SearchRowID" = {table}.rowid',
+                        f'{table}_rows."ID" = {quote_name(meta.db_table)}.{quote_name(meta.pk.column)}',
+                    ],
+                    params=[match],
+                )
+
+    return matching.order_by('search_rank', 'pk')
+
+
+def GetTriggerStatements(table, content, columns):
+    """
+    Build the statements of the triggers keeping an FTS5 table in sync with its model table
+
+    Parameters:
+        table (str): The FTS5 table
+        content (str): The model table
+        columns (List): The indexed columns
+
+    Returns:
+        dict: The CREATE TRIGGER statement of each trigger name
+    """
+
+    names = ', '.join(f'"{column}"' for column in columns)
+    new_values = ', '.join(f'new."{column}"' for column in columns)
+    row_id = f'(SELECT "SearchRowID" FROM {table}_rows WHERE "ID" = %s."ID")'
+
+    return {
+        f'{table}_insert': (
+            f'CREATE TRIGGER {table}_insert AFTER INSERT ON "{content}" BEGIN '
+            f'INSERT OR IGNORE INTO {table}_rows("ID") VALUES (new."ID"); '
+            f'INSERT INTO {table}(rowid, {names}) VALUES ({row_id % "new"}, {new_values}); END'
+        ),
+        f'{table}_delete': (
+            f'CREATE TRIGGER {table}_delete AFTER DELETE ON "{content}" BEGIN '
+            f'DELETE FROM {table} WHERE rowid = {row_id % "old"}; '
+            f'DELETE FROM {table}_rows WHERE "ID" = old."ID"; END'
+        ),
+        f'{table}_update': (
+            f'CREATE TRIGGER {table}_update AFTER UPDATE OF {names} ON "{content}" BEGIN '
+            f'DELETE FROM {table} WHERE rowid = {row_id % "old"}; '
+            f'INSERT INTO {table}(rowid, {names}) VALUES ({row_id % "new"}, {new_values}); END'
+        ),
+    }
+
+
+def GetMissingTriggers():
+    """
+    List the triggers keeping the FTS5 tables in sync that are missing
+
+    Returns:
+        List: Names of the missing triggers
+    """
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        triggers = {row[0] for row in cursor.fetchall()}
+
+    expected = [trigger for model, (table, columns) in SEARCH_INDEXES.items() for trigger in GetTriggerStatements(table, model._meta.db_table, columns)]
+
+    return [trigger for trigger in expected if trigger not in triggers]
+
+
+def RebuildSearchIndexes():
+    """
+    Recreate the missing triggers and reindex every row of every searchable model
+
+    Rows inserted or deleted while the triggers were missing are added to or
+    removed from <table>_rows first
+
+    Returns:
+        dict: The number of rows indexed per FTS5 table
+    """
+
+    indexed = {}
+    missing = GetMissingTriggers()
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        for model, (table, columns) in SEARCH_INDEXES.items():
+            content = connection.ops.quote_name(model._meta.db_table)
+            names = ', '.join(f'"{column}"' for column in columns)
+            content_values = ', '.join(f'{content}."{column}"' for column in columns)
+
+            for trigger, statement in GetTriggerStatements(table, model._meta.db_table, columns).items():
+                if trigger in missing:
+                    cursor.execute(statement)
+
+            cursor.execute(f'DELETE FROM {table}_rows WHERE "ID" NOT IN (SELECT "ID" FROM {content})')
+            cursor.execute(f'INSERT OR IGNORE INTO {table}_rows("ID") SELECT "ID" FROM {content}')
+            cursor.execute(f'DELETE FROM {table}')
+            cursor.execute(
+                f'INSERT INTO {table}(rowid, {names}) SELECT {table}_rows."SearchRowID", {content_values} '
+                f'FROM {table}_rows JOIN {content} ON {content}."ID" = {table}_rows."ID"'
+            )
+            indexed[table] = model.objects.count()
+
+    return indexed
+
+
+@receiver(post_migrate)
+def restore_search_indexes(sender, **kwargs):
+    """
+    Reindex after a migration remade a searchable table and so dropped its triggers
+    """
+
+    global _available
+
+    if sender.name != 'Users':
+        return
+
+    # Migrations may have created or dropped the FTS5 tables
+    _available = None
+
+    if IsFullTextAvailable() and GetMissingTriggers():
+        RebuildSearchIndexes()
@@ -0,0 +1,224 @@
+import json
+import time
+import logging
+import functools
+import contextvars
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from django.conf import settings
+from django.db import connections
+from django.core.exceptions import MiddlewareNotUsed
+
+try:
+    import requests
+
+except ImportError:
+    requests = None
+
+
+DEFAULT_REQUEST_INSTRUMENTATION = {
+    'ENABLED': True,
+    'SERVER_TIMING': False,
+    'LOG': False,
+    'QUERY_WARNING': 50,
+}
+
+# Server-Timing names of what is measured, in the order they are sent
+KINDS = ['db', 'http', 'serializer', 'template']
+
+logger = logging.getLogger(__name__)
+
+_current = contextvars.ContextVar('request_metrics', default=None)
+_hooks_installed = False
+
+
+def GetInstrumentationConfig():
+    return {**DEFAULT_REQUEST_INSTRUMENTATION, **getattr(settings, 'REQUEST_INSTRUMENTATION', {})}
+
+
+class RequestMetrics:
+    """
+    Number of calls and time spent per kind of work during a request or block
+    """
+
+    def __init__(self):
+        self.calls = Counter()
+        self.seconds = Counter()
+        self.total = 0.0
+
+        # Kinds being timed, so that nested calls are only timed once
+        self.active = set()
+
+    def Add(self, kind, seconds, calls=1):
+        self.calls[kind] += calls
+        self.seconds[kind] += seconds
+
+    def Merge(self, metrics):
+        self.calls.update(metrics.calls)
+        self.seconds.update(metrics.seconds)
+
+    def AsDict(self):
+        values = {'total_ms': round(self.total * 1000, 2)}
+
+        for kind in KINDS:
+            values[f'{kind}_calls'] = self.calls[kind]
+            values[f'{kind}_ms'] = round(float(self.seconds[kind]) * 1000, 2)
+
+        return values
+
+    def ServerTiming(self):
+        """
+        Format the metrics as the value of a Server-Timing header
+
+        Returns:
+            str: One metric per kind with its duration in milliseconds and number of calls
+        """
+
+        metrics = [f'{kind};dur={self.seconds[kind] * 1000:.2f};desc="{self.calls[kind]} calls"' for kind in KINDS]
+        metrics.append(f'total;dur={self.total * 1000:.2f}')
+
+        return ', '.join(metrics)
+
+
+def CountQuery(execute, sql, params, many, context):
+    metrics = _current.get()
+    start = time.perf_counter()
+
+    try:
+        return execute(sql, params, many, context)
+
+    finally:
+        if metrics is not None:
+            metrics.Add('db', time.perf_counter() - start)
+
+
+def Timed(function, kind):
+    """
+    Wrap a function so that its calls are recorded in the metrics being collected
+
+    Parameters:
+        function (callable): The function to be wrapped
+        kind (str): One of KINDS
+
+    Returns:
+        callable: The wrapped function, unchanged outside of instrumented blocks
+    """
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        metrics = _current.get()
+
+        if metrics is None or kind in metrics.active:
+            return function(*args, **kwargs)
+
+        metrics.active.add(kind)
+        start = time.perf_counter()
+
+        try:
+            return function(*args, **kwargs)
+
+        finally:
+            metrics.active.discard(kind)
+            metrics.Add(kind, time.perf_counter() - start)
+
+    return wrapper
+
+
+def InstallHooks():
+    """
+    Time outbound HTTP calls, serializers and template rendering
+
+    The hooks are installed once per process and only record anything
+    inside an Instrument block. Serializer time covers building .data,
+    including the queries it runs
+    """
+
+    global _hooks_installed
+
+    if _hooks_installed:
+        return
+
+    from rest_framework.serializers import BaseSerializer
+    from django.template.backends.django import Template
+
+    BaseSerializer.data = property(Timed(BaseSerializer.data.fget, 'serializer'))
+    Template.render = Timed(Template.render, 'template')
+
+    if requests is not None:
+        requests.Session.send = Timed(requests.Session.send, 'http')
+
+    _hooks_installed = True
+
+
+@contextmanager
+def Instrument():
+    """
+    Collect the queries, outbound HTTP calls, serializer and template time of a block
+
+    A nested block collects its own metrics and adds them to the enclosing one
+
+    Yields:
+        RequestMetrics: The metrics of the block, complete once it exits
+    """
+
+    InstallHooks()
+
+    parent = _current.get()
+    metrics = RequestMetrics()
+    token = _current.set(metrics)
+    start = time.perf_counter()
+
+    try:
+        with ExitStack() as stack:
+            # The enclosing block already counts the queries of this thread
+            if parent is None:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(CountQuery))
+
+            yield metrics
+
+    finally:
+        metrics.total = time.perf_counter() - start
+        _current.reset(token)
+
+        if parent is not None:
+            parent.Merge(metrics)
+
+
+class RequestInstrumentationMiddleware:
+    """
+    Measure every request, send the metrics as a Server-Timing header,
+    optionally log them as JSON and warn about views running too many queries
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.config = GetInstrumentationConfig()
+
+        if not self.config['ENABLED']:
+            raise MiddlewareNotUsed
+
+    def __call__(self, request):
+        with Instrument() as metrics:
+            response = self.get_response(request)
+
+        view = request.resolver_match.view_name if request.resolver_match else None
+
+        if self.config['SERVER_TIMING']:
+            response['Server-Timing'] = metrics.ServerTiming()
+
+        if self.config['LOG']:
+            logger.info(json.dumps({
+                'method': request.method,
+                'path': request.path,
+                'view': view,
+                'status': response.status_code,
+                **metrics.AsDict(),
+            }))
+
+        limit = self.config['QUERY_WARNING']
+
+        if limit is not None and metrics.calls['db'] > limit:
+            logger.warning('%s %s (%s) ran %d queries, more than %d', request.method, request.path, view, metrics.calls['db'], limit)
+
+        return response
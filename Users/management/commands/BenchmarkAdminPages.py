@@ -0,0 +1,92 @@
+import time
+import statistics
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.core.management.base import BaseCommand, CommandError
+from Users.models import *
+
+
+def GetAdminPages():
+    pages = [
+        '/users/',
+        '/exams/',
+        '/programmes/',
+        '/subjects/',
+        '/questions/',
+        '/feedbacks/',
+        '/reports/',
+    ]
+
+    user = CustomUser.objects.filter(is_superuser=False).first()
+    programme = Programme.objects.first()
+
+    if user:
+        pages += [f'/users/edit/{user.id}', f'/exams/{user.email}']
+
+        if programme:
+            pages.append(f'/exams/{user.email}/{programme.Name}')
+
+    if programme:
+        pages += [f'/subjects/{programme.Name}', f'/questions/{programme.Name}']
+
+        subject = Subject.objects.filter(ProgrammeID=programme).first()
+
+        if subject:
+            pages += [
+                f'/questions/{programme.Name}/{subject.Name}',
+                f'/subjects/{programme.Name}/{subject.Name}/edit'
+            ]
+
+    return pages
+
+
+class BenchmarkAdminPages:
+    def __init__(self, Repeat):
+        self.Repeat = Repeat
+        self.Client = Client(HTTP_HOST='localhost')
+
+        admin = CustomUser.objects.filter(is_superuser=True).first()
+
+        if admin is None:
+            raise CommandError('A superuser is required to benchmark admin pages')
+
+        self.Client.force_login(admin)
+
+    def Measure(self, page):
+        timings = []
+
+        for _ in range(self.Repeat):
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                response = self.Client.get(page)
+                timings.append((time.perf_counter() - start) * 1000)
+
+        return {
+            'page': page,
+            'status': response.status_code,
+            'queries': len(queries),
+            'mean': statistics.mean(timings),
+            'max': max(timings),
+        }
+
+    def Action(self):
+        return [self.Measure(page) for page in GetAdminPages()]
+
+
+class Command(BaseCommand):
+    help = 'Measure the response time and number of queries of every admin list page'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help='Number of requests made per page')
+
+    def handle(self, *args, **options):
+        results = BenchmarkAdminPages(options['repeat']).Action()
+
+        self.stdout.write(f"{'Page':<60}{'Status':>8}{'Queries':>9}{'Mean (ms)':>12}{'Max (ms)':>11}")
+
+        for result in results:
+            self.stdout.write(
+                f"{result['page']:<60}{result['status']:>8}{result['queries']:>9}"
+                f"{result['mean']:>12.2f}{result['max']:>11.2f}"
+            )
@@ -0,0 +1,68 @@
+from django.db import transaction
+from django.core.management.base import BaseCommand, CommandError
+from Users.models import *
+from Users.analytics import RefreshAnalytics, QUESTION_COUNTERS
+from .PopulateResults import PopulateResults
+
+
+class BenchmarkAnalytics:
+    def __init__(self, NewResults, BaseResults=0, Keep=False):
+        self.NewResults = NewResults
+        self.BaseResults = BaseResults
+        self.Keep = Keep
+
+        self.UserObj = CustomUser.objects.filter(is_superuser=False).first()
+
+        if self.UserObj is None or not Questions.objects.exists():
+            raise CommandError('At least one non-superuser and some questions are required')
+
+    def Snapshot(self):
+        fields = ['QuestionID', *QUESTION_COUNTERS, 'Difficulty']
+
+        return set(QuestionStatistics.objects.values_list(*fields))
+
+    def Action(self):
+        with transaction.atomic():
+            if self.BaseResults:
+                PopulateResults('Random', self.UserObj.email, self.BaseResults).Action()
+
+            results = [('full, before', RefreshAnalytics(rebuild=True))]
+
+            PopulateResults('Random', self.UserObj.email, self.NewResults).Action()
+
+            results.append(('incremental', RefreshAnalytics()))
+            incremental = self.Snapshot()
+
+            results.append(('full, after', RefreshAnalytics(rebuild=True)))
+            matches = incremental == self.Snapshot()
+
+            # Leave the database as it was unless the generated results are wanted
+            if not self.Keep:
+                transaction.set_rollback(True)
+
+        return results, matches
+
+
+class Command(BaseCommand):
+    help = 'Compare the incremental and the full refresh of the answer statistics on results generated by PopulateResults'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--results', type=int, default=20, help='Number of exams generated between the refreshes')
+        parser.add_argument('--base-results', type=int, default=0, help='Number of exams generated before the first refresh')
+        parser.add_argument('--keep', action='store_true', help='Keep the generated exams and the refreshed statistics')
+
+    def handle(self, *args, **options):
+        if options['results'] < 1 or options['base_results'] < 0:
+            raise CommandError('--results must be a positive number and --base-results cannot be negative')
+
+        results, matches = BenchmarkAnalytics(options['results'], options['base_results'], options['keep']).Action()
+
+        self.stdout.write(f"{'Refresh':<16}{'Exams':>8}{'Answers':>10}{'Questions':>11}{'Seconds':>10}")
+
+        for name, stats in results:
+            self.stdout.write(f"{name:<16}{stats['exams']:>8}{stats['answers']:>10}{stats['questions']:>11}{stats['seconds']:>10.3f}")
+
+        if not matches:
+            raise CommandError('The incremental refresh does not match the full refresh')
+
+        self.stdout.write('The incremental refresh matches the full refresh')
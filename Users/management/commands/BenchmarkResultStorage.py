@@ -0,0 +1,169 @@
+import time
+import statistics
+from django.db import connection, transaction
+from django.db.models import F, Q, Count
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.core.management.base import BaseCommand, CommandError
+from Users.models import *
+from Users.analytics import CountAnswers
+from Users.results import UnpackAnswers, GetUserAnswer
+from .GenerateLoad import GenerateLoad
+from .PopulateQuestions import PopulateQuestions
+from .BenchmarkSuite import Percentile
+
+
+def CountAnswerRows(details):
+    """
+    Count the answers of each question from ResultDetails rows, as analytics did before ResultSheet
+    """
+
+    return list(
+        details
+        .order_by()
+        .values('QuestionID', 'QuestionID__SubjectID')
+        .annotate(
+            answered=Count('ID'),
+            correct=Count('ID', filter=Q(UserAnswer=F('QuestionID__Answer'))),
+            skipped=Count('ID', filter=Q(UserAnswer='-')),
+            option_one=Count('ID', filter=Q(UserAnswer=F('QuestionID__OptionOne'))),
+            option_two=Count('ID', filter=Q(UserAnswer=F('QuestionID__OptionTwo'))),
+            option_three=Count('ID', filter=Q(UserAnswer=F('QuestionID__OptionThree'))),
+            option_four=Count('ID', filter=Q(UserAnswer=F('QuestionID__OptionFour'))),
+        )
+    )
+
+
+class BenchmarkResultStorage:
+    def __init__(self, Users, ExamsPerUser, Seed=0, Iterations=200):
+        self.Users = Users
+        self.ExamsPerUser = ExamsPerUser
+        self.Seed = Seed
+        self.Iterations = Iterations
+
+    def WriteResultDetails(self):
+        """
+        Store every generated exam a second time as ResultDetails rows
+        """
+
+        questions = Questions.objects.in_bulk()
+
+        with transaction.atomic():
+            for sheet in ResultSheet.objects.iterator(chunk_size=1000):
+                details = []
+
+                for question_id, option, unknown_answer in UnpackAnswers(sheet):
+                    question = questions[question_id]
+                    choices = [question.OptionOne, question.OptionTwo, question.OptionThree, question.OptionFour]
+                    user_answer = GetUserAnswer(choices, option, unknown_answer)
+
+                    details.append(ResultDetails(ResultID_id=sheet.ResultID_id, QuestionID=question, UserAnswer=user_answer))
+
+                ResultDetails.objects.bulk_create(details)
+
+    def GetStorage(self, model):
+        """
+        Return the bytes used by the table of a model and its indexes, read from the dbstat table of SQLite
+        """
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT SUM(dbstat.pgsize) FROM dbstat JOIN sqlite_master ON sqlite_master.name = dbstat.name '
+                'WHERE sqlite_master.tbl_name = %s',
+                [model._meta.db_table]
+            )
+
+            return cursor.fetchone()[0] or 0
+
+    def Measure(self, read, arguments):
+        timings = []
+
+        for argument in arguments:
+            start = time.perf_counter()
+            read(argument)
+            timings.append((time.perf_counter() - start) * 1000)
+
+        return {'p50': Percentile(timings, 50), 'p95': Percentile(timings, 95), 'mean': statistics.mean(timings)}
+
+    def ReadDetails(self, exam_id):
+        return [(detail.QuestionID, detail.UserAnswer) for detail in ResultDetails.objects.filter(ResultID=exam_id).select_related('QuestionID')]
+
+    def ReadSheet(self, exam_id):
+        answers = UnpackAnswers(ResultSheet.objects.get(ResultID=exam_id))
+        questions = Questions.objects.in_bulk([question_id for question_id, _, _ in answers])
+
+        return [(questions[question_id], option, unknown_answer) for question_id, option, unknown_answer in answers]
+
+    def Action(self):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+
+        try:
+            if connection.vendor != 'sqlite':
+                raise CommandError('The storage is measured with the dbstat table of SQLite')
+
+            PopulateQuestions().Action()
+            GenerateLoad(self.Users, self.ExamsPerUser, self.Seed).Action()
+            self.WriteResultDetails()
+
+            total_exams = Exams.objects.count()
+            answers = ResultDetails.objects.count()
+            exams = list(Exams.objects.order_by('?').values_list('ID', flat=True)[:self.Iterations])
+
+            storage = {'details': self.GetStorage(ResultDetails), 'sheets': self.GetStorage(ResultSheet)}
+
+            reads = {
+                'details': self.Measure(self.ReadDetails, exams),
+                'sheets': self.Measure(self.ReadSheet, exams),
+            }
+
+            analytics = {}
+
+            for name, count in [('details', lambda: CountAnswerRows(ResultDetails.objects.all())), ('sheets', lambda: CountAnswers(ResultSheet.objects.all()))]:
+                start = time.perf_counter()
+                count()
+                analytics[name] = time.perf_counter() - start
+
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        return {
+            'exams': total_exams,
+            'answers': answers,
+            'storage': storage,
+            'reads': reads,
+            'analytics': analytics,
+        }
+
+
+class Command(BaseCommand):
+    help = 'Compare the storage and read latency of ResultDetails rows and ResultSheet rows on a seeded test database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=500, help='Number of users generated in the test database')
+        parser.add_argument('--exams-per-user', type=int, default=10, help='Average number of exams per generated user')
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the generated data')
+        parser.add_argument('--iterations', type=int, default=200, help='Number of exams read with each storage')
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 or options['exams_per_user'] < 1 or options['iterations'] < 1:
+            raise CommandError('--users, --exams-per-user and --iterations must be positive numbers')
+
+        results = BenchmarkResultStorage(options['users'], options['exams_per_user'], options['seed'], options['iterations']).Action()
+        answers = results['answers']
+
+        self.stdout.write(f"{results['exams']} exams, {answers} answers\n")
+        self.stdout.write(f"{'Storage':<10}{'Bytes':>14}{'Bytes/answer':>14}{'Read p50 (ms)':>15}{'Read p95 (ms)':>15}{'Analytics (s)':>15}")
+
+        for name in ['details', 'sheets']:
+            reads = results['reads'][name]
+
+            self.stdout.write(
+                f"{name:<10}{results['storage'][name]:>14}{results['storage'][name] / answers:>14.1f}"
+                f"{reads['p50']:>15.3f}{reads['p95']:>15.3f}{results['analytics'][name]:>15.3f}"
+            )
+
+        self.stdout.write(
+            f"\nResultSheet rows take {results['storage']['sheets'] / results['storage']['details']:.1%} of the space of ResultDetails rows, "
+            f"an exam is read {results['reads']['details']['p50'] / results['reads']['sheets']['p50']:.1f}x faster (p50)"
+        )
@@ -0,0 +1,85 @@
+import time
+import random
+import statistics
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.core.management.base import BaseCommand, CommandError
+from Users.models import *
+from Users.exam_store import GetExamSessionStore
+
+
+class BenchmarkResultSubmission:
+    def __init__(self, PaperSizes, Repeat):
+        self.Repeat = Repeat
+        self.PaperSizes = PaperSizes
+        self.Store = GetExamSessionStore()
+        self.Client = Client(HTTP_HOST='localhost')
+
+        self.UserObj = CustomUser.objects.filter(is_superuser=False).first()
+        self.ProgrammeObj = Programme.objects.first()
+
+        if self.UserObj is None or self.ProgrammeObj is None:
+            raise CommandError('At least one non-superuser and one programme are required')
+
+        self.Client.force_login(self.UserObj)
+        self.QuestionIDs = list(Questions.objects.filter(SubjectID__ProgrammeID=self.ProgrammeObj).values_list('ID', flat=True))
+
+    def Submit(self, paper_size):
+        question_ids = random.sample(self.QuestionIDs, min(paper_size, len(self.QuestionIDs)))
+
+        attempt_key = self.Store.Create(
+            {
+                'UserID': str(self.UserObj.id),
+                'Programme': self.ProgrammeObj.Name,
+                'Questions': [question_id.hex for question_id in question_ids],
+                'ChoiceOrders': ['0123'] * len(question_ids),
+            }
+        )
+
+        data = {'attempt': attempt_key}
+
+        for index in range(len(question_ids)):
+            data[f'choices {index + 1}'] = str(random.randint(1, 4))
+
+        # Roll back every submission so that the benchmark leaves the database untouched
+        with transaction.atomic():
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                self.Client.post('/result/', data)
+                elapsed = (time.perf_counter() - start) * 1000
+
+            transaction.set_rollback(True)
+
+        return len(question_ids), len(queries), elapsed
+
+    def Action(self):
+        results = []
+
+        for paper_size in self.PaperSizes:
+            runs = [self.Submit(paper_size) for _ in range(self.Repeat)]
+
+            results.append({
+                'paper_size': runs[0][0],
+                'queries': max(run[1] for run in runs),
+                'mean': statistics.mean(run[2] for run in runs),
+                'max': max(run[2] for run in runs),
+            })
+
+        return results
+
+
+class Command(BaseCommand):
+    help = 'Measure the number of queries and the latency of submitting papers of different sizes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[10, 50, 100], help='Number of questions per paper')
+        parser.add_argument('--repeat', type=int, default=5, help='Number of papers submitted per size')
+
+    def handle(self, *args, **options):
+        results = BenchmarkResultSubmission(options['sizes'], options['repeat']).Action()
+
+        self.stdout.write(f"{'Paper Size':<12}{'Queries':>9}{'Mean (ms)':>12}{'Max (ms)':>11}")
+
+        for result in results:
+            self.stdout.write(f"{result['paper_size']:<12}{result['queries']:>9}{result['mean']:>12.2f}{result['max']:>11.2f}")
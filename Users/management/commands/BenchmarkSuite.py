@@ -0,0 +1,324 @@
+import sys
+import json
+import math
+import time
+import random
+import statistics
+import django
+from django.conf import settings
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.utils.timezone import now
+from django.core.management.base import BaseCommand, CommandError
+from Users.models import *
+from Users.paper_buffer import GetPaperBuffer
+from .GenerateLoad import GenerateLoad
+from .PopulateQuestions import PopulateQuestions
+from .BenchmarkAdminPages import GetAdminPages
+
+
+def Percentile(values, percent):
+    """
+    Return the nearest-rank percentile of the given values
+
+    Parameters:
+        values (List): The measured values
+        percent (float): The percentile, between 0 and 100
+
+    Returns:
+        float: The smallest value greater than or equal to percent% of the values
+    """
+
+    ordered = sorted(values)
+
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+class BenchmarkSuite:
+    def __init__(self, Users, ExamsPerUser, Seed=0, Iterations=20, Warmup=2):
+        self.Users = Users
+        self.ExamsPerUser = ExamsPerUser
+        self.Seed = Seed
+        self.Iterations = Iterations
+        self.Warmup = Warmup
+
+        self.Random = random.Random(Seed)
+        self.Signups = 0
+
+    def SeedDatabase(self):
+        """
+        Fill the test database with the bundled questions and generated users
+
+        The first generated user takes the user-side requests, its password
+        is the one GenerateLoad gives every user
+        """
+
+        PopulateQuestions().Action()
+        GenerateLoad(self.Users, self.ExamsPerUser, self.Seed).Action()
+
+        self.UserObj = CustomUser.objects.get(email=f'load{self.Seed}-0@example.com')
+        self.AdminObj = CustomUser.objects.create_superuser(email='benchmark-admin@example.com', password='root', FullName='Benchmark Admin')
+
+        questions = list(Questions.objects.order_by('ID')[:20])
+
+        FeedBack.objects.bulk_create(
+            [FeedBack(Name=f'User {index}', Email=f'user{index}@example.com', Message='The dashboard is slow') for index in range(20)]
+        )
+
+        ReportQuestion.objects.bulk_create(
+            [ReportQuestion(UserID=self.UserObj, QuestionID=question, Issue='The answer is wrong') for question in questions]
+        )
+
+        self.UserClient = Client()
+        self.UserClient.force_login(self.UserObj)
+
+        self.AdminClient = Client()
+        self.AdminClient.force_login(self.AdminObj)
+
+    def StartTest(self):
+        response = self.UserClient.get(f'/model-test/{self.ProgrammeName}')
+        data = {'attempt': response.context['attempt']}
+
+        for index in range(len(response.context['questions'])):
+            data[f'choices {index + 1}'] = str(self.Random.randint(1, 4))
+
+        return data
+
+    def SignUp(self):
+        self.Signups += 1
+
+        return Client().post(
+            '/signup/',
+            {
+                'email': f'benchmark-signup-{self.Signups}@example.com',
+                'full_name': 'Benchmark User',
+                'new_password1': 'root',
+                'dob-year': '2000',
+                'dob-month': '1',
+                'dob-day': '1',
+                'gen': 'male',
+            }
+        )
+
+    def GetScenarios(self):
+        """
+        List the requests to be measured
+
+        Returns:
+            List: (name, path, request, prepare) tuples. prepare, when given, runs
+                  unmeasured before each request and its result is passed to it
+        """
+
+        programme = Programme.objects.filter(subject__questions__isnull=False).order_by('Name').first()
+        subject = Subject.objects.filter(ProgrammeID=programme).order_by('Name').first()
+        exam = Exams.objects.filter(UserID=self.UserObj).order_by('-CreatedAt').first() or Exams.objects.first()
+
+        self.ProgrammeName = programme.Name
+
+        user_client = self.UserClient
+        admin_client = self.AdminClient
+        email = self.UserObj.email
+
+        scenarios = [
+            ('signup', '/signup/', lambda _: self.SignUp(), None),
+            ('login', '/login/', lambda _: Client().post('/login/', {'email': email, 'new_password1': 'root'}), None),
+            ('program selector', '/program-selector/', lambda _: user_client.get('/program-selector/'), None),
+            ('model test start', f'/model-test/{programme.Name}', lambda _: user_client.get(f'/model-test/{programme.Name}'), None),
+            ('result submit', '/result/', lambda data: user_client.post('/result/', data), self.StartTest),
+            ('detailed history', f'/detailed-result/{exam.Slug}', lambda _: user_client.get(f'/detailed-result/{exam.Slug}'), None),
+            ('dashboard', '/dashboard/', lambda _: user_client.get('/dashboard/'), None),
+            ('leaderboard', f'/leaderboard/?rank-by={programme.Name}', lambda _: user_client.get('/leaderboard/', {'rank-by': programme.Name}), None),
+        ]
+
+        searches = [
+            ('/user-search/', {'search-type': 'email', 'search-value': 'load'}),
+            ('/users-exams-search/', {'search-type': 'email', 'search-value': 'load'}),
+            ('/users-exams-programme-search/', {'search-type': 'programme', 'search-value': programme.Name, 'user': email}),
+            ('/detailed-exams-search/', {'search-type': 'total correct answered', 'search-value': '50', 'user': email, 'programme': programme.Name}),
+            ('/subject-search/', {'search-type': 'programme', 'search-value': programme.Name}),
+            ('/question-programme-search/', {'search-type': 'programme', 'search-value': programme.Name}),
+            ('/question-per-programme-search/', {'search-type': 'subjects', 'search-value': subject.Name, 'programme': programme.Name}),
+            ('/question-search/', {'search-type': 'title', 'search-value': 'the', 'programme': programme.Name, 'subject': subject.Name}),
+            ('/report-search/', {'search-type': 'issue', 'search-value': 'wrong'}),
+            ('/feedback-search/', {'search-type': 'message', 'search-value': 'slow'}),
+        ]
+
+        for page in GetAdminPages():
+            scenarios.append((f'admin {page}', page, lambda _, page=page: admin_client.get(page), None))
+
+        for page, params in searches:
+            scenarios.append((f"admin {page} {params['search-type']}", page, lambda _, page=page, params=params: admin_client.get(page, params), None))
+
+        return scenarios
+
+    def Measure(self, name, path, request, prepare=None):
+        for _ in range(self.Warmup):
+            request(prepare() if prepare else None)
+
+        timings = []
+        statuses = set()
+        queries = 0
+
+        for _ in range(self.Iterations):
+            argument = prepare() if prepare else None
+
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                response = request(argument)
+                timings.append((time.perf_counter() - start) * 1000)
+
+            statuses.add(response.status_code)
+            queries = max(queries, len(captured))
+
+        return {
+            'name': name,
+            'path': path,
+            'status': sorted(statuses),
+            'requests': len(timings),
+            'throughput': 1000 * len(timings) / sum(timings),
+            'p50': Percentile(timings, 50),
+            'p95': Percentile(timings, 95),
+            'mean': statistics.mean(timings),
+            'max': max(timings),
+            'queries': queries,
+        }
+
+    def Action(self, progress=None):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+
+        try:
+            start = time.perf_counter()
+            self.SeedDatabase()
+            seconds = time.perf_counter() - start
+
+            results = []
+
+            for scenario in self.GetScenarios():
+                results.append(self.Measure(*scenario))
+
+                if progress:
+                    progress(results[-1])
+
+            paper_buffer = GetPaperBuffer()
+
+            # Refills still running would query the database being destroyed
+            if paper_buffer:
+                paper_buffer.Clear()
+                paper_buffer.executor.shutdown(wait=True)
+
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        return {
+            'meta': {
+                'created': now().isoformat(),
+                'python': sys.version.split()[0],
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'debug': settings.DEBUG,
+                'seed': self.Seed,
+                'users': self.Users,
+                'exams_per_user': self.ExamsPerUser,
+                'iterations': self.Iterations,
+                'warmup': self.Warmup,
+                'seed_seconds': seconds,
+            },
+            'results': results,
+        }
+
+
+def CompareResults(baseline, results, tolerance):
+    """
+    Compare the results of a run with the results of a previous run
+
+    Parameters:
+        baseline (dict): The JSON written by a previous run
+        results (dict): The results of this run
+        tolerance (float): The allowed relative increase of the p95 latency
+
+    Returns:
+        List: (name, baseline p95, p95, baseline queries, queries, is regression) per scenario of both runs
+    """
+
+    previous = {result['name']: result for result in baseline['results']}
+    comparison = []
+
+    for result in results['results']:
+        before = previous.get(result['name'])
+
+        if before is None:
+            continue
+
+        is_regression = result['queries'] > before['queries'] or result['p95'] > before['p95'] * (1 + tolerance)
+        comparison.append((result['name'], before['p95'], result['p95'], before['queries'], result['queries'], is_regression))
+
+    return comparison
+
+
+class Command(BaseCommand):
+    help = 'Measure the latency, throughput and queries of the user and admin pages on a seeded test database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200, help='Number of users generated in the test database')
+        parser.add_argument('--exams-per-user', type=int, default=5, help='Average number of exams per generated user')
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the generated data and answers')
+        parser.add_argument('--iterations', type=int, default=20, help='Number of measured requests per scenario')
+        parser.add_argument('--warmup', type=int, default=2, help='Number of unmeasured requests per scenario')
+        parser.add_argument('--output', help='Write the results to this JSON file')
+        parser.add_argument('--compare', help='JSON file of a previous run to compare the results with')
+        parser.add_argument('--tolerance', type=float, default=0.5, help='Allowed relative increase of the p95 latency when comparing')
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 or options['iterations'] < 1 or options['warmup'] < 0:
+            raise CommandError('--users and --iterations must be positive numbers and --warmup cannot be negative')
+
+        baseline = None
+
+        if options['compare']:
+            with open(options['compare'], 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+
+        self.stdout.write(f"{'Scenario':<72}{'Status':>10}{'Req/s':>9}{'p50 (ms)':>10}{'p95 (ms)':>10}{'Queries':>9}")
+
+        def progress(result):
+            status = ','.join(str(code) for code in result['status'])
+
+            self.stdout.write(
+                f"{result['name']:<72}{status:>10}{result['throughput']:>9.1f}"
+                f"{result['p50']:>10.2f}{result['p95']:>10.2f}{result['queries']:>9}"
+            )
+
+        suite = BenchmarkSuite(options['users'], options['exams_per_user'], options['seed'], options['iterations'], options['warmup'])
+        results = suite.Action(progress)
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=4)
+
+            self.stdout.write(f"Results written to {options['output']}")
+
+        errors = [result['name'] for result in results['results'] if max(result['status']) >= 400]
+
+        if errors:
+            raise CommandError(f"Failed requests in: {', '.join(errors)}")
+
+        if baseline is None:
+            return
+
+        comparison = CompareResults(baseline, results, options['tolerance'])
+
+        self.stdout.write(f"\n{'Scenario':<72}{'p95 before':>12}{'p95 after':>11}{'Queries':>12}")
+
+        for name, p95_before, p95_after, queries_before, queries_after, is_regression in comparison:
+            self.stdout.write(
+                f"{name:<72}{p95_before:>12.2f}{p95_after:>11.2f}{f'{queries_before} -> {queries_after}':>12}"
+                f"{'  REGRESSION' if is_regression else ''}"
+            )
+
+        regressions = [row[0] for row in comparison if row[-1]]
+
+        if regressions:
+            raise CommandError(f"{len(regressions)} scenarios regressed compared to {options['compare']}")
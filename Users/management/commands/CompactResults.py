@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+from Users.results import CompactResultDetails
+
+
+class Command(BaseCommand):
+    help = 'Store a ResultSheet for every exam only having ResultDetails rows, e.g. rows written by an older version'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Number of sheets inserted per query')
+        parser.add_argument('--prune', action='store_true', help='Delete the ResultDetails rows of every exam having a sheet afterwards')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be a positive number')
+
+        stats = CompactResultDetails(options['batch_size'], options['prune'])
+
+        self.stdout.write(f"Compacted {stats['answers']} answers of {stats['exams']} exams")
+
+        if stats['unknown']:
+            self.stdout.write(f"{stats['unknown']} answers match none of the current options of their question and are stored as unknown, their text is kept")
+
+        if options['prune']:
+            self.stdout.write(f"Deleted {stats['pruned']} ResultDetails rows")
@@ -0,0 +1,58 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from Users.models import Questions
+from Users.near_duplicates import StoreMissingSignatures, LoadNearDuplicateIndex, GetNearDuplicatesConfig
+
+
+class FindDuplicateQuestions:
+    def __init__(self, Threshold=None, AcrossSubjects=False, Rebuild=False):
+        self.Threshold = GetNearDuplicatesConfig()['THRESHOLD'] if Threshold is None else Threshold
+        self.AcrossSubjects = AcrossSubjects
+        self.Rebuild = Rebuild
+
+    def Action(self):
+        start = time.perf_counter()
+        computed = StoreMissingSignatures(self.Rebuild)
+
+        index = LoadNearDuplicateIndex()
+        clusters = index.Clusters(self.Threshold, not self.AcrossSubjects)
+
+        questions = Questions.objects.select_related('SubjectID__ProgrammeID').in_bulk(
+                        [question_id for cluster in clusters for question_id in cluster]
+                    )
+
+        return {
+            'questions': len(index),
+            'computed': computed,
+            'clusters': [[questions[question_id] for question_id in cluster if question_id in questions] for cluster in clusters],
+            'seconds': time.perf_counter() - start,
+        }
+
+
+class Command(BaseCommand):
+    help = 'Report the clusters of near-duplicate questions across the whole question bank'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threshold', type=float, help='Lowest estimated similarity of near-duplicates, NEAR_DUPLICATES["THRESHOLD"] by default')
+        parser.add_argument('--across-subjects', action='store_true', help='Also group similar questions of different subjects')
+        parser.add_argument('--rebuild', action='store_true', help='Recompute the signature of every question first')
+
+    def handle(self, *args, **options):
+        if options['threshold'] is not None and not 0 < options['threshold'] <= 1:
+            raise CommandError('--threshold must be between 0 and 1')
+
+        stats = FindDuplicateQuestions(options['threshold'], options['across_subjects'], options['rebuild']).Action()
+
+        for number, cluster in enumerate(stats['clusters'], 1):
+            self.stdout.write(f'\nCluster {number} ({len(cluster)} questions)')
+
+            for question in cluster:
+                subject = question.SubjectID
+                self.stdout.write(f'  {question.ID}  {subject.ProgrammeID.Name} / {subject.Name}  {question.Title[:80]}')
+
+        duplicates = sum(len(cluster) for cluster in stats['clusters'])
+
+        self.stdout.write(
+            f"\n{len(stats['clusters'])} clusters with {duplicates} of {stats['questions']} questions, "
+            f"computed {stats['computed']} signatures in {stats['seconds']:.2f}s"
+        )
@@ -0,0 +1,284 @@
+import time
+import uuid
+import random
+import datetime
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from django.db import connections, transaction
+from django.utils.text import slugify
+from django.utils.timezone import now
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from Users.models import *
+from Users.results import PackAnswers, SKIPPED, UNKNOWN
+
+
+FIRST_NAMES = ['Aarav', 'Anish', 'Bikash', 'Deepa', 'Gita', 'Hari', 'Kiran', 'Manisha', 'Nabin', 'Pooja', 'Rajesh', 'Sita', 'Sujan', 'Usha']
+LAST_NAMES = ['Adhikari', 'Basnet', 'Gurung', 'Karki', 'Magar', 'Poudel', 'Rai', 'Sharma', 'Shrestha', 'Thapa']
+
+# Set up in every worker process by InitWorker
+_bank = None
+_options = None
+
+
+def RandomUUID(rng):
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def LoadQuestionBank():
+    """
+    Load what is needed to answer a paper of every programme
+
+    Returns:
+        dict: {programme ID: [(questions to select, [(question ID, answer, options), ...]), ...]}
+    """
+
+    bank = {}
+    subjects = {}
+
+    for subject in Subject.objects.all():
+        subjects[subject.ID] = (subject.ProgrammeID_id, subject.TotalQuestionsToSelect, [])
+
+    questions = Questions.objects.values_list('SubjectID', 'ID', 'Answer', 'OptionOne', 'OptionTwo', 'OptionThree', 'OptionFour')
+
+    for subject_id, question_id, answer, *options in questions:
+        subjects[subject_id][2].append((question_id, answer, options))
+
+    for programme_id, size, subject_questions in subjects.values():
+        if subject_questions:
+            bank.setdefault(programme_id, []).append((size, subject_questions))
+
+    return bank
+
+
+def InitWorker(bank, options):
+    global _bank, _options
+
+    _bank = bank
+    _options = options
+
+
+def GenerateChunk(bounds):
+    """
+    Generate and insert the users of a range of indexes with their exams
+
+    The random generator is seeded with the seed and the first index of the
+    chunk, so the same data, dated relative to now, is produced whatever the
+    number of workers
+
+    Parameters:
+        bounds (tuple): First and last (excluded) index of the users of the chunk
+
+    Returns:
+        dict: The number of rows inserted per table
+    """
+
+    start, end = bounds
+    rng = random.Random(f"{_options['seed']}:{start}")
+    current_time = now()
+
+    users = []
+    extra_details = []
+    exams = []
+    sheets = []
+    standings = []
+    total_answers = 0
+
+    for index in range(start, end):
+        gender = rng.choice(['male', 'female'])
+        member_since = current_time - datetime.timedelta(seconds=rng.randint(0, 365 * 24 * 60 * 60))
+
+        user = CustomUser(
+                    id=RandomUUID(rng),
+                    email=f"load{_options['seed']}-{index}@example.com",
+                    password=_options['password'],
+                    FullName=f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+                    Gender=gender,
+                    DOB=datetime.date(rng.randint(1990, 2006), rng.randint(1, 12), rng.randint(1, 28)),
+                    ProfileImage=f'pp-{gender}.jpg',
+                    MemberSince=member_since,
+                )
+
+        users.append(user)
+
+        # Every user answers correctly with their own probability
+        skill = rng.uniform(0.2, 0.9)
+        total_exams = rng.randint(0, 2 * _options['exams_per_user'])
+        taken_at = sorted(rng.uniform(0, (current_time - member_since).total_seconds()) for _ in range(total_exams))
+
+        tests_taken = Counter()
+        total_correct = Counter()
+
+        for seconds in taken_at:
+            programme_id = rng.choice(list(_bank))
+            created_at = member_since + datetime.timedelta(seconds=seconds)
+
+            exam = Exams(
+                        ID=RandomUUID(rng),
+                        UserID=user,
+                        ProgrammeID_id=programme_id,
+                        Slug=slugify(f'result-{RandomUUID(rng).hex}'),
+                        Date=created_at.date(),
+                        CreatedAt=created_at,
+                    )
+
+            answers = []
+
+            for size, questions in _bank[programme_id]:
+                for question_id, answer, options in rng.sample(questions, min(size, len(questions))):
+                    roll = rng.random()
+
+                    if roll < 0.05:
+                        option = SKIPPED
+                        user_answer = '-'
+
+                    elif roll < skill:
+                        option = options.index(answer) + 1 if answer in options else UNKNOWN
+                        user_answer = answer
+                        exam.CorrectCounter += 1
+
+                    else:
+                        option = rng.randrange(len(options)) + 1
+                        user_answer = options[option - 1]
+                        exam.CorrectCounter += user_answer == answer
+
+                    exam.TotalQuestions += 1
+                    answers.append((question_id, option, user_answer))
+
+            paper, answers, user_answers = PackAnswers(answers)
+            sheets.append(ResultSheet(ResultID=exam, Paper=paper, Answers=answers, UserAnswers=user_answers))
+            total_answers += len(answers)
+
+            exams.append(exam)
+            tests_taken[programme_id] += 1
+            total_correct[programme_id] += exam.CorrectCounter
+
+        extra_details.append(ResultsExtraDetails(ID=RandomUUID(rng), UserID=user, TestsTaken=total_exams))
+
+        for programme_id, count in tests_taken.items():
+            standings.append(
+                LeaderBoardStanding(
+                    ID=RandomUUID(rng),
+                    UserID=user,
+                    ProgrammeID_id=programme_id,
+                    TestsTaken=count,
+                    TotalCorrect=total_correct[programme_id],
+                    AverageScore=total_correct[programme_id] / count,
+                )
+            )
+
+    batch_size = _options['batch_size']
+
+    try:
+        with transaction.atomic():
+            CustomUser.objects.bulk_create(users, batch_size=batch_size)
+            ResultsExtraDetails.objects.bulk_create(extra_details, batch_size=batch_size)
+            Exams.objects.bulk_create(exams, batch_size=batch_size)
+            ResultSheet.objects.bulk_create(sheets, batch_size=batch_size)
+            LeaderBoardStanding.objects.bulk_create(standings, batch_size=batch_size)
+
+    finally:
+        connections.close_all()
+
+    return {
+        'users': len(users),
+        'exams': len(exams),
+        'answers': total_answers,
+    }
+
+
+class GenerateLoad:
+    def __init__(self, Users, ExamsPerUser, Seed=0, ChunkSize=200, Workers=1, BatchSize=500, Password='root'):
+        self.Users = Users
+        self.ChunkSize = ChunkSize
+        self.Workers = Workers
+
+        self.Bank = LoadQuestionBank()
+
+        if not self.Bank:
+            raise CommandError('At least one programme with questions is required, run PopulateQuestions first')
+
+        if CustomUser.objects.filter(email__startswith=f'load{Seed}-').exists():
+            raise CommandError(f'Users generated with seed {Seed} already exist, use another --seed')
+
+        self.Options = {
+            'seed': Seed,
+            'exams_per_user': ExamsPerUser,
+            'batch_size': BatchSize,
+            # Hashing once keeps the generation fast, every user gets the same password
+            'password': make_password(Password),
+        }
+
+    def Action(self, progress=None):
+        start = time.perf_counter()
+        chunks = [(index, min(index + self.ChunkSize, self.Users)) for index in range(0, self.Users, self.ChunkSize)]
+        totals = Counter()
+
+        if self.Workers > 1:
+            # Worker processes must open their own connections
+            connections.close_all()
+
+            with ProcessPoolExecutor(max_workers=self.Workers, initializer=InitWorker, initargs=(self.Bank, self.Options)) as executor:
+                results = executor.map(GenerateChunk, chunks)
+
+                for counts in results:
+                    totals.update(counts)
+
+                    if progress:
+                        progress(totals)
+
+        else:
+            InitWorker(self.Bank, self.Options)
+
+            for chunk in chunks:
+                totals.update(GenerateChunk(chunk))
+
+                if progress:
+                    progress(totals)
+
+        # The exams are dated in the past, behind the analytics watermark, so the next refresh has to recount
+        AnalyticsWatermark.objects.all().delete()
+
+        elapsed = time.perf_counter() - start
+
+        return {
+            **totals,
+            'seconds': elapsed,
+            'answers_per_second': totals['answers'] / elapsed if elapsed else 0.0,
+        }
+
+
+class Command(BaseCommand):
+    help = 'Generate users with exams and answers offline for capacity testing, without any prompt'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help='Number of users generated')
+        parser.add_argument('--exams-per-user', type=int, default=10, help='Average number of exams per user')
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the random generator, also part of the generated emails')
+        parser.add_argument('--chunk-size', type=int, default=200, help='Number of users inserted per transaction')
+        parser.add_argument('--batch-size', type=int, default=500, help='Number of rows inserted per query')
+        parser.add_argument('--workers', type=int, default=1, help='Number of processes generating chunks, SQLite still inserts them one at a time')
+        parser.add_argument('--password', default='root', help='Password of every generated user')
+
+    def handle(self, *args, **options):
+        for option in ['users', 'chunk_size', 'batch_size', 'workers']:
+            if options[option] < 1:
+                raise CommandError(f"--{option.replace('_', '-')} must be a positive number")
+
+        if options['exams_per_user'] < 0:
+            raise CommandError('--exams-per-user cannot be negative')
+
+        generator = GenerateLoad(
+                        options['users'], options['exams_per_user'], options['seed'],
+                        options['chunk_size'], options['workers'], options['batch_size'], options['password']
+                    )
+
+        def progress(totals):
+            self.stdout.write(f"Generated {totals['users']}/{options['users']} users ...")
+
+        stats = generator.Action(progress)
+
+        self.stdout.write(
+            f"Inserted {stats['users']} users, {stats['exams']} exams and {stats['answers']} answers "
+            f"in {stats['seconds']:.2f}s ({stats['answers_per_second']:.0f} answers/sec)"
+        )
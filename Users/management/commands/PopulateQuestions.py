@@ -1,64 +1,224 @@
 import json
+import time
 from pathlib import Path
-from django.core.management.base import BaseCommand
-from Users.models import Programme, Subject, Questions
+from django.db import transaction
+from django.core.management.base import BaseCommand, CommandError
+from Users.models import Programme, Subject, Questions, QuestionSignature
+from Users.catalog import BumpCatalogVersion
+from Users.question_pool import InvalidateQuestionPool
+from Users.question_totals import SyncQuestionTotals
+from Users.near_duplicates import ComputeSignature, LoadNearDuplicateIndex
+
+
+def IterJSONArray(path, chunk_size=64 * 1024):
+    """
+    Yield the objects of a JSON array file one at a time
+
+    The file is read in chunks, so only the records being decoded are held
+    in memory
+
+    Parameters:
+        path (Path): Path of a file containing a JSON array of objects
+        chunk_size (int): Optional. Number of characters read at once
+
+    Yields:
+        dict: Each object of the array
+    """
+
+    decoder = json.JSONDecoder()
+
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = ''
+        position = 0
+        started = False
+        is_eof = False
+
+        while True:
+            while position < len(buffer) and (buffer[position].isspace() or (started and buffer[position] == ',')):
+                position += 1
+
+            if position == len(buffer):
+                if is_eof:
+                    raise CommandError(f'{path} ended before the end of the JSON array')
+
+                buffer = f.read(chunk_size)
+                position = 0
+                is_eof = not buffer
+
+                continue
+
+            if not started:
+                if buffer[position] != '[':
+                    raise CommandError(f'{path} does not contain a JSON array')
+
+                started = True
+                position += 1
+
+                continue
+
+            if buffer[position] == ']':
+                return
+
+            try:
+                record, end = decoder.raw_decode(buffer, position)
+
+            except json.JSONDecodeError:
+                if is_eof:
+                    raise
+
+                # The record continues in the next chunk
+                chunk = f.read(chunk_size)
+                is_eof = not chunk
+                buffer = buffer[position:] + chunk
+                position = 0
+
+                continue
+
+            yield record
+
+            position = end
 
 
 class PopulateQuestions:
-    def __init__(self):
+    def __init__(self, JsonFile=None, ChunkSize=500, SkipNearDuplicates=False):
         self.BASE_DIR = Path(__file__).resolve().parent.parent.parent.parent
-        self.JSON_FILE = self.BASE_DIR / 'static' / 'Questions.json'
+        self.JSON_FILE = Path(JsonFile) if JsonFile else self.BASE_DIR / 'static' / 'Questions.json'
+        self.ChunkSize = ChunkSize
+        self.SkipNearDuplicates = SkipNearDuplicates
+
+        self.Programmes = {programmeObj.Name: programmeObj for programmeObj in Programme.objects.all()}
+        self.Subjects = {(subjectObj.ProgrammeID_id, subjectObj.Name): subjectObj for subjectObj in Subject.objects.all()}
+
+        # Questions already stored, a question is a duplicate when its subject, title and answer match
+        self.Seen = set(Questions.objects.values_list('SubjectID', 'Title', 'Answer'))
 
-        with open(self.JSON_FILE, 'r') as f:
-            self.Contents = json.load(f)
+        # Signatures of the stored and imported questions, a question is a near-duplicate when it is similar to one of its subject
+        self.Index = LoadNearDuplicateIndex()
+
+    def GetProgramme(self, programme):
+        programmeObj = self.Programmes.get(programme)
+
+        if programmeObj is None:
+            programmeObj = Programme(Name=programme)
+            programmeObj.save()
+
+            self.Programmes[programme] = programmeObj
+
+        return programmeObj
+
+    def GetSubject(self, programmeObj, subject, TotalQuestionsToSelect):
+        subjectObj = self.Subjects.get((programmeObj.ID, subject))
+
+        if subjectObj is None:
+            subjectObj = Subject(ProgrammeID=programmeObj, Name=subject)
+            subjectObj.save()
+
+            self.Subjects[(programmeObj.ID, subject)] = subjectObj
+
+        if subjectObj.TotalQuestionsToSelect == 1:
+            subjectObj.TotalQuestionsToSelect = TotalQuestionsToSelect
+            subjectObj.save()
+
+        return subjectObj
+
+    def Flush(self, batch, signatures):
+        with transaction.atomic():
+            Questions.objects.bulk_create(batch)
+            QuestionSignature.objects.bulk_create(signatures)
 
     def Action(self):
-        for content in self.Contents:
+        start = time.perf_counter()
+
+        batch = []
+        signatures = []
+        touched_subjects = set()
+        read = inserted = duplicates = near_duplicates = 0
+
+        for content in IterJSONArray(self.JSON_FILE):
+            read += 1
+
             answer = content['answer']
             choices = content['choices']
-            subject = content['subject']
             question = content['question']
-            programme = content['programme']
-            TotalQuestionsToSelect = content['TotalQuestionsToSelect']
 
-            programmeObj = Programme.objects.filter(Name=programme)
+            programmeObj = self.GetProgramme(content['programme'])
+            subjectObj = self.GetSubject(programmeObj, content['subject'], content['TotalQuestionsToSelect'])
+
+            key = (subjectObj.ID, question, answer)
+
+            if key in self.Seen:
+                duplicates += 1
+                continue
+
+            self.Seen.add(key)
+            signature = ComputeSignature(question, choices)
+
+            if self.Index.Query(signature, subjectObj.ID):
+                near_duplicates += 1
 
-            if programmeObj:
-                programmeObj = programmeObj.first()
+                if self.SkipNearDuplicates:
+                    continue
 
-            else:
-                programmeObj = Programme(Name=programme)
-                programmeObj.save()
+            touched_subjects.add(subjectObj.ID)
 
-            subjectObj = Subject.objects.filter(ProgrammeID=programmeObj, Name=subject)
+            questionObj = Questions(
+                            SubjectID=subjectObj, Title=question, Answer=answer,
+                            OptionOne=choices[0], OptionTwo=choices[1],
+                            OptionThree=choices[2], OptionFour=choices[3]
+                        )
 
-            if subjectObj:
-                subjectObj = subjectObj.first()
+            batch.append(questionObj)
+            signatures.append(QuestionSignature(QuestionID=questionObj, Signature=signature))
+            self.Index.Add(questionObj.ID, subjectObj.ID, signature)
 
-            else:
-                subjectObj = Subject(ProgrammeID=programmeObj, Name=subject)
-                subjectObj.save()
+            if len(batch) >= self.ChunkSize:
+                self.Flush(batch, signatures)
+                inserted += len(batch)
+                batch = []
+                signatures = []
 
-            if subjectObj.TotalQuestionsToSelect == 1:
-                subjectObj.TotalQuestionsToSelect = TotalQuestionsToSelect
-                subjectObj.save()
+        if batch:
+            self.Flush(batch, signatures)
+            inserted += len(batch)
 
-            if not Questions.objects.filter(SubjectID=subjectObj, Title=question, Answer=answer):
-                questionObj = Questions(
-                                    SubjectID=subjectObj, Title=question, Answer=answer,
-                                    OptionOne=choices[0], OptionTwo=choices[1],
-                                    OptionThree=choices[2], OptionFour=choices[3]
-                                )
+        # Bulk inserts send no signals, update what the receivers would have
+        if touched_subjects:
+            SyncQuestionTotals(touched_subjects)
 
-                questionObj.save()
+            for subject_id in touched_subjects:
+                InvalidateQuestionPool(subject_id)
+
+            BumpCatalogVersion()
+
+        elapsed = time.perf_counter() - start
+
+        return {
+            'read': read,
+            'inserted': inserted,
+            'duplicates': duplicates,
+            'near_duplicates': near_duplicates,
+            'seconds': elapsed,
+            'rows_per_second': read / elapsed if elapsed else 0.0,
+        }
 
 
 class Command(BaseCommand):
-    args = '<foo bar ...>'
-    help = 'our help string comes here'
+    help = 'Import questions from a JSON file, skipping questions that are already stored and reporting near-duplicates'
 
-    def _create_tags(self):
-        PopulateQuestions().Action()
+    def add_arguments(self, parser):
+        parser.add_argument('--file', help='JSON file to import, static/Questions.json by default')
+        parser.add_argument('--chunk-size', type=int, default=500, help='Number of questions inserted per query')
+        parser.add_argument('--skip-near-duplicates', action='store_true', help='Skip the questions similar to a question of their subject instead of importing them')
 
     def handle(self, *args, **options):
-        self._create_tags()
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be a positive number')
+
+        stats = PopulateQuestions(options['file'], options['chunk_size'], options['skip_near_duplicates']).Action()
+        action = 'skipped' if options['skip_near_duplicates'] else 'found'
+
+        self.stdout.write(
+            f"Read {stats['read']} questions, inserted {stats['inserted']}, "
+            f"skipped {stats['duplicates']} duplicates, {action} {stats['near_duplicates']} near-duplicates in {stats['seconds']:.2f}s "
+            f"({stats['rows_per_second']:.0f} rows/sec)"
+        )
@@ -1,7 +1,8 @@
 import random
-import requests
+from django.db import transaction
 from django.core.management.base import BaseCommand
 from Users.models import *
+from Users.results import CountExam, PackAnswers, GetOption
 
 
 class PopulateResults:
@@ -14,9 +15,8 @@ class PopulateResults:
 
     def GetSubjects(self, programme):
         SubjectsID = []
-        ProgrammeObj = Programme.objects.filter(Name=programme).first()
 
-        for id in Subject.objects.filter(ProgrammeID=ProgrammeObj):
+        for id in Subject.objects.filter(ProgrammeID=programme):
             SubjectsID.append(id)
 
         return SubjectsID
@@ -34,57 +34,47 @@ class PopulateResults:
             correct_counter = 0
 
             if self.Programme == 'Random':
-                programme = programmes[i].Name
+                programme = programmes[i]
                 allSubjects = self.GetSubjects(programme)
 
-            results = Exams(UserID=self.UsersObj, ProgrammeName=programme)
-            results.save()
-
-            for subject in allSubjects:
-                total_questions_per_subject = subject.TotalQuestionsToSelect
-                number_of_correct_answers_to_select = random.randint(1, total_questions_per_subject)
-
-                correct_counter += number_of_correct_answers_to_select
-
-                questions = list(Questions.objects.filter(SubjectID=subject.ID))
-                random.shuffle(questions)
+            with transaction.atomic():
+                results = Exams(UserID=self.UsersObj, ProgrammeID=programme)
+                results.save()
 
-                for num in range(total_questions_per_subject):
-                    question = questions[num]
-                    wrong_or_right = random.SystemRandom().choice([0, 1])
+                answers = []
 
-                    if number_of_correct_answers_to_select > 0 and wrong_or_right:
-                        user_answer = question.Answer
-                        number_of_correct_answers_to_select -= 1
+                for subject in allSubjects:
+                    total_questions_per_subject = subject.TotalQuestionsToSelect
+                    number_of_correct_answers_to_select = random.randint(1, total_questions_per_subject)
 
-                    else:
-                        choices = [question.OptionOne, question.OptionTwo, question.OptionThree, question.OptionFour]
-                        choices = [choice for choice in choices if choice != question.Answer]
-                        user_answer = random.choice(choices)
+                    correct_counter += number_of_correct_answers_to_select
 
-                    result_details = ResultDetails(
-                                        ResultID = results,
-                                        QuestionID = question,
-                                        UserAnswer = user_answer
-                                    )
+                    questions = list(Questions.objects.filter(SubjectID=subject.ID))
+                    random.shuffle(questions)
 
-                    result_details.save()
+                    for num in range(total_questions_per_subject):
+                        question = questions[num]
+                        wrong_or_right = random.SystemRandom().choice([0, 1])
 
-                results.CorrectCounter = correct_counter
-                results.save()
+                        if number_of_correct_answers_to_select > 0 and wrong_or_right:
+                            user_answer = question.Answer
+                            number_of_correct_answers_to_select -= 1
 
-            resultExtraDetails = ResultsExtraDetails.objects.get(UserID=self.UsersObj)
+                        else:
+                            choices = [question.OptionOne, question.OptionTwo, question.OptionThree, question.OptionFour]
+                            choices = [choice for choice in choices if choice != question.Answer]
+                            user_answer = random.choice(choices)
 
-            data = requests.get(f'http://127.0.0.1:8000/api/users_exams_each_programmes/{self.UsersObj.id}')
+                        answers.append((question.ID, GetOption(question, user_answer), user_answer))
 
-            if data.status_code == 200:
-                data = data.json()[0]
+                    results.CorrectCounter = correct_counter
+                    results.TotalQuestions += total_questions_per_subject
+                    results.save()
 
-                data['TestsTaken'] += 1
-                data[programme.upper()] += 1
+                paper, answers, user_answers = PackAnswers(answers)
+                ResultSheet.objects.create(ResultID=results, Paper=paper, Answers=answers, UserAnswers=user_answers)
 
-                data.pop('UserID')
-                resultExtraDetails.update(commit=True, **data)
+                CountExam(self.UsersObj, programme, correct_counter)
 
 
 class Command(BaseCommand):
@@ -107,7 +97,7 @@ class Command(BaseCommand):
             if email.lower() == 'all':
                 return email.lower()
 
-            if CustomUser.objects.filter(email__iexact=email):
+            if CustomUser.objects.filter(email__lower=email.lower()):
                 return email
 
             else:
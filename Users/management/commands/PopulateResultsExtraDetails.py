@@ -1,31 +1,32 @@
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.core.management.base import BaseCommand
 from Users.models import *
+from Users.results import RebuildStandings
 
 
 class PopulateResultsExtraDetails:
     def Action(self):
-        # Add required fields dynamically in ResultsExtraDetails Table
-        fields = [programme.Name for programme in Programme.objects.all()]
-
-        users = CustomUser.objects.filter(is_superuser=False)
-
-        for RED in ResultsExtraDetails.objects.all():
-            RED.delete()
-
-        for user in users:
-            arguments = dict()
-            exams = Exams.objects.filter(UserID=user)
-
-            for field in fields:
-                arguments.update({
-                    field.upper(): exams.filter(ProgrammeName=field).count()
-                })
-
-            arguments['UserID'] = user
-            arguments['TestsTaken'] = exams.count()
-
-            resultExtraDetails = ResultsExtraDetails(**arguments)
-            resultExtraDetails.save()
+        tests_taken = (
+            Exams.objects
+            .filter(UserID=OuterRef('pk'))
+            .values('UserID')
+            .annotate(total=Count('ID'))
+            .values('total')
+        )
+
+        users = CustomUser.objects.filter(is_superuser=False).annotate(tests_taken=Coalesce(Subquery(tests_taken), 0))
+
+        with transaction.atomic():
+            ResultsExtraDetails.objects.all().delete()
+            ResultsExtraDetails.objects.bulk_create(
+                [ResultsExtraDetails(UserID=user, TestsTaken=user.tests_taken) for user in users],
+                batch_size=1000
+            )
+
+        # The number of exams taken in each programme is kept in the standings
+        RebuildStandings()
 
 
 class Command(BaseCommand):
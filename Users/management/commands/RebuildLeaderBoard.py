@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from Users.results import RebuildStandings
+
+
+class Command(BaseCommand):
+    help = 'Recompute the leaderboard standings of every user from the stored exams'
+
+    def handle(self, *args, **options):
+        total_standings = RebuildStandings()
+
+        self.stdout.write(f'Rebuilt {total_standings} leaderboard standings')
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+from Users.full_text import IsFullTextAvailable, GetMissingTriggers, RebuildSearchIndexes
+
+
+class Command(BaseCommand):
+    help = 'Recreate the missing search triggers and reindex the questions, reports and feedbacks searched by full-text search'
+
+    def handle(self, *args, **options):
+        if not IsFullTextAvailable():
+            raise CommandError('Full-text search needs SQLite with the FTS5 tables of migration 0037')
+
+        missing = GetMissingTriggers()
+
+        for table, rows in RebuildSearchIndexes().items():
+            self.stdout.write(f'Indexed {rows} rows in {table}')
+
+        if missing:
+            self.stdout.write(f"Recreated the missing triggers: {', '.join(missing)}")
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from Users.analytics import RefreshAnalytics
+
+
+class Command(BaseCommand):
+    help = 'Add the answers of the exams stored since the last refresh to the per-question and per-subject statistics'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true', help='Recount every stored answer instead')
+
+    def handle(self, *args, **options):
+        stats = RefreshAnalytics(options['rebuild'])
+        mode = 'Rebuilt' if stats['rebuild'] else 'Updated'
+
+        self.stdout.write(
+            f"{mode} the statistics of {stats['questions']} questions and {stats['subjects']} subjects "
+            f"from {stats['answers']} answers of {stats['exams']} exams in {stats['seconds']:.2f}s"
+        )
@@ -0,0 +1,121 @@
+import uuid
+import random
+from concurrent.futures import ThreadPoolExecutor
+from django.db import connections
+from django.db.models import Sum
+from django.test import Client
+from django.core.management.base import BaseCommand, CommandError
+from Users.models import *
+from Users.exam_store import GetExamSessionStore
+
+
+class StressResultSubmission:
+    def __init__(self, Submissions, Workers, PaperSize):
+        self.Submissions = Submissions
+        self.Workers = Workers
+        self.PaperSize = PaperSize
+        self.Store = GetExamSessionStore()
+
+        self.ProgrammeObj = Programme.objects.filter(subject__questions__isnull=False).first()
+
+        if self.ProgrammeObj is None:
+            raise CommandError('At least one programme with questions is required')
+
+        self.QuestionIDs = list(Questions.objects.filter(SubjectID__ProgrammeID=self.ProgrammeObj).values_list('ID', flat=True))
+
+    def CreateUser(self):
+        # A new user starts every counter from zero and takes its exams along when deleted
+        user = CustomUser.objects.create_user(f'stress-{uuid.uuid4().hex}@example.com', FullName='Stress Test')
+        ResultsExtraDetails.objects.create(UserID=user)
+
+        return user
+
+    def PrepareSubmission(self, user):
+        question_ids = random.sample(self.QuestionIDs, min(self.PaperSize, len(self.QuestionIDs)))
+
+        attempt_key = self.Store.Create(
+            {
+                'UserID': str(user.id),
+                'Programme': self.ProgrammeObj.Name,
+                'Questions': [question_id.hex for question_id in question_ids],
+                'ChoiceOrders': ['0123'] * len(question_ids),
+            }
+        )
+
+        data = {'attempt': attempt_key}
+
+        for index in range(len(question_ids)):
+            data[f'choices {index + 1}'] = str(random.randint(1, 4))
+
+        client = Client(HTTP_HOST='localhost')
+        client.force_login(user)
+
+        return client, data
+
+    def Submit(self, submission):
+        client, data = submission
+
+        try:
+            response = client.post('/result/', data)
+
+            return response.status_code == 302 and '/detailed-result/' in response['Location']
+
+        except Exception:
+            return False
+
+        finally:
+            # Every worker thread opens its own connection
+            connections.close_all()
+
+    def Action(self, Keep=False):
+        user = self.CreateUser()
+
+        try:
+            submissions = [self.PrepareSubmission(user) for _ in range(self.Submissions)]
+
+            with ThreadPoolExecutor(max_workers=self.Workers) as executor:
+                succeeded = sum(executor.map(self.Submit, submissions))
+
+            exams = Exams.objects.filter(UserID=user)
+            standing = LeaderBoardStanding.objects.filter(UserID=user, ProgrammeID=self.ProgrammeObj).first()
+
+            # (name, counted, expected)
+            return [
+                ('successful submissions', succeeded, self.Submissions),
+                ('stored exams', exams.count(), self.Submissions),
+                ('ResultsExtraDetails.TestsTaken', ResultsExtraDetails.objects.get(UserID=user).TestsTaken, self.Submissions),
+                ('LeaderBoardStanding.TestsTaken', standing.TestsTaken if standing else 0, self.Submissions),
+                ('LeaderBoardStanding.TotalCorrect', standing.TotalCorrect if standing else 0, exams.aggregate(total=Sum('CorrectCounter'))['total'] or 0),
+            ]
+
+        finally:
+            if not Keep:
+                user.delete()
+
+
+class Command(BaseCommand):
+    help = 'Submit exams of one user in parallel and check that no counter increment is lost'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--submissions', type=int, default=50, help='Number of exams submitted')
+        parser.add_argument('--workers', type=int, default=10, help='Number of exams submitted at the same time')
+        parser.add_argument('--paper-size', type=int, default=10, help='Number of questions per exam')
+        parser.add_argument('--keep', action='store_true', help='Keep the stress test user and its exams')
+
+    def handle(self, *args, **options):
+        if min(options['submissions'], options['workers'], options['paper_size']) < 1:
+            raise CommandError('--submissions, --workers and --paper-size must be positive numbers')
+
+        stress = StressResultSubmission(options['submissions'], options['workers'], options['paper_size'])
+        checks = stress.Action(options['keep'])
+
+        self.stdout.write(f"{'Counter':<36}{'Counted':>9}{'Expected':>10}  Result")
+
+        for name, counted, expected in checks:
+            status = 'OK' if counted == expected else 'FAIL'
+            self.stdout.write(f"{name:<36}{counted:>9}{expected:>10}  {status}")
+
+        failed = [name for name, counted, expected in checks if counted != expected]
+
+        if failed:
+            raise CommandError(f"Lost updates in {', '.join(failed)}")
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:38
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import Upper
+
+
+def populate_standings(apps, schema_editor):
+    Exams = apps.get_model('Users', 'Exams')
+    LeaderBoardStanding = apps.get_model('Users', 'LeaderBoardStanding')
+
+    grouped_exams = (
+        Exams.objects
+        .values('UserID', programme=Upper('ProgrammeName'))
+        .annotate(tests_taken=Count('ID'), total_correct=Sum('CorrectCounter'))
+    )
+
+    LeaderBoardStanding.objects.bulk_create(
+        [
+            LeaderBoardStanding(
+                UserID_id=row['UserID'],
+                ProgrammeName=row['programme'],
+                TestsTaken=row['tests_taken'],
+                TotalCorrect=row['total_correct'],
+                AverageScore=row['total_correct'] / row['tests_taken'],
+            )
+            for row in grouped_exams
+        ],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Users', '0029_programme_totalquestions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderBoardStanding',
+            fields=[
+                ('ID', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('ProgrammeName', models.CharField(max_length=10)),
+                ('TestsTaken', models.PositiveIntegerField(default=0)),
+                ('TotalCorrect', models.PositiveIntegerField(default=0)),
+                ('AverageScore', models.FloatField(default=0)),
+                ('UserID', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'LeaderBoardStandings',
+                'indexes': [models.Index(fields=['ProgrammeName', '-AverageScore'], name='standing_programme_score_idx')],
+                'constraints': [models.UniqueConstraint(fields=('UserID', 'ProgrammeName'), name='unique_user_programme_standing')],
+            },
+        ),
+        migrations.RunPython(populate_standings, migrations.RunPython.noop),
+    ]
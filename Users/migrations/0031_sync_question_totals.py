@@ -0,0 +1,40 @@
+from django.db import migrations
+from django.db.models import Count, Sum, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def sync_question_totals(apps, schema_editor):
+    Subject = apps.get_model('Users', 'Subject')
+    Programme = apps.get_model('Users', 'Programme')
+    Questions = apps.get_model('Users', 'Questions')
+
+    question_counts = (
+        Questions.objects
+        .filter(SubjectID=OuterRef('pk'))
+        .values('SubjectID')
+        .annotate(total=Count('ID'))
+        .values('total')
+    )
+
+    Subject.objects.update(TotalQuestions=Coalesce(Subquery(question_counts), 0))
+
+    subject_totals = (
+        Subject.objects
+        .filter(ProgrammeID=OuterRef('pk'))
+        .values('ProgrammeID')
+        .annotate(total=Sum('TotalQuestions'))
+        .values('total')
+    )
+
+    Programme.objects.update(TotalQuestions=Coalesce(Subquery(subject_totals), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Users', '0030_leaderboardstanding'),
+    ]
+
+    operations = [
+        migrations.RunPython(sync_question_totals, migrations.RunPython.noop),
+    ]
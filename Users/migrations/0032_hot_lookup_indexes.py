@@ -0,0 +1,71 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:50
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Users', '0031_sync_question_totals'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(django.db.models.functions.text.Lower('email'), name='user_email_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['MemberSince'], name='user_member_since_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(condition=models.Q(('is_superuser', False)), fields=['MemberSince'], name='user_since_not_admin_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='exams',
+            index=models.Index(models.F('UserID'), django.db.models.functions.text.Lower('ProgrammeName'), models.F('Date'), name='exams_user_programme_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='exams',
+            index=models.Index(fields=['Date'], name='exams_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['Date'], name='feedback_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['IsMarked', 'Date'], name='feedback_marked_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(django.db.models.functions.text.Lower('Email'), name='feedback_email_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='programme',
+            index=models.Index(django.db.models.functions.text.Lower('Name'), name='programme_name_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='questions',
+            index=models.Index(fields=['SubjectID', 'Title'], name='question_subject_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='questions',
+            index=models.Index(django.db.models.functions.text.Lower('Title'), name='question_title_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reportquestion',
+            index=models.Index(fields=['Date'], name='report_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reportquestion',
+            index=models.Index(fields=['IsMarked', 'Date'], name='report_marked_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subject',
+            index=models.Index(models.F('ProgrammeID'), django.db.models.functions.text.Lower('Name'), name='subject_programme_name_idx'),
+        ),
+    ]
@@ -0,0 +1,190 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum, OuterRef, Subquery, Value
+from django.db.models.functions import Lower, Upper, Coalesce
+
+
+# Columns of ResultsExtraDetails counting the exams taken in each programme before this migration
+PROGRAMME_COUNTERS = ['BCA', 'BIM', 'BIT', 'BSCSIT']
+
+
+def link_exams_to_programmes(apps, schema_editor):
+    Exams = apps.get_model('Users', 'Exams')
+    Programme = apps.get_model('Users', 'Programme')
+
+    programmes = {programme.lower_name: programme for programme in Programme.objects.annotate(lower_name=Lower('Name'))}
+
+    for name in Exams.objects.values_list('ProgrammeName', flat=True).distinct():
+        programme = programmes.get(name.lower())
+
+        # Exams of a programme that was removed keep their programme
+        if programme is None:
+            programme = Programme.objects.create(Name=name)
+            programmes[name.lower()] = programme
+
+        Exams.objects.filter(ProgrammeName=name).update(ProgrammeID=programme)
+
+
+def unlink_exams_from_programmes(apps, schema_editor):
+    Exams = apps.get_model('Users', 'Exams')
+    Programme = apps.get_model('Users', 'Programme')
+
+    for programme in Programme.objects.all():
+        Exams.objects.filter(ProgrammeID=programme).update(ProgrammeName=programme.Name)
+
+
+def rebuild_standings(apps, schema_editor):
+    Exams = apps.get_model('Users', 'Exams')
+    LeaderBoardStanding = apps.get_model('Users', 'LeaderBoardStanding')
+
+    grouped_exams = (
+        Exams.objects
+        .values('UserID', 'ProgrammeID')
+        .annotate(tests_taken=Count('ID'), total_correct=Sum('CorrectCounter'))
+    )
+
+    LeaderBoardStanding.objects.bulk_create(
+        [
+            LeaderBoardStanding(
+                UserID_id=row['UserID'],
+                ProgrammeID_id=row['ProgrammeID'],
+                TestsTaken=row['tests_taken'],
+                TotalCorrect=row['total_correct'],
+                AverageScore=row['total_correct'] / row['tests_taken'],
+            )
+            for row in grouped_exams
+        ],
+        batch_size=1000
+    )
+
+
+def clear_standings(apps, schema_editor):
+    apps.get_model('Users', 'LeaderBoardStanding').objects.all().delete()
+
+
+def rebuild_named_standings(apps, schema_editor):
+    # Standings keyed by the upper-cased programme name, as created by 0030
+    Exams = apps.get_model('Users', 'Exams')
+    LeaderBoardStanding = apps.get_model('Users', 'LeaderBoardStanding')
+
+    grouped_exams = (
+        Exams.objects
+        .values('UserID', programme=Upper('ProgrammeID__Name'))
+        .annotate(tests_taken=Count('ID'), total_correct=Sum('CorrectCounter'))
+    )
+
+    LeaderBoardStanding.objects.bulk_create(
+        [
+            LeaderBoardStanding(
+                UserID_id=row['UserID'],
+                ProgrammeName=row['programme'],
+                TestsTaken=row['tests_taken'],
+                TotalCorrect=row['total_correct'],
+                AverageScore=row['total_correct'] / row['tests_taken'],
+            )
+            for row in grouped_exams
+        ],
+        batch_size=1000
+    )
+
+
+def restore_programme_counters(apps, schema_editor):
+    LeaderBoardStanding = apps.get_model('Users', 'LeaderBoardStanding')
+    ResultsExtraDetails = apps.get_model('Users', 'ResultsExtraDetails')
+
+    for field in PROGRAMME_COUNTERS:
+        tests_taken = LeaderBoardStanding.objects.filter(UserID=OuterRef('UserID'), ProgrammeID__Name__iexact=field).values('TestsTaken')[:1]
+        ResultsExtraDetails.objects.update(**{field: Coalesce(Subquery(tests_taken), Value(0))})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Users', '0032_hot_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='exams',
+            name='exams_user_programme_date_idx',
+        ),
+        migrations.AddField(
+            model_name='exams',
+            name='ProgrammeID',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='Users.programme'),
+        ),
+        migrations.RunPython(link_exams_to_programmes, unlink_exams_from_programmes),
+        # Without a default the column could not be added back when the migration is reversed
+        migrations.AlterField(
+            model_name='exams',
+            name='ProgrammeName',
+            field=models.CharField(default='', max_length=10),
+        ),
+        migrations.RemoveField(
+            model_name='exams',
+            name='ProgrammeName',
+        ),
+        migrations.AlterField(
+            model_name='exams',
+            name='ProgrammeID',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='Users.programme'),
+        ),
+        migrations.AddIndex(
+            model_name='exams',
+            index=models.Index(fields=['UserID', 'ProgrammeID', 'Date'], name='exams_user_programme_date_idx'),
+        ),
+        migrations.RunPython(clear_standings, rebuild_named_standings),
+        migrations.RemoveConstraint(
+            model_name='leaderboardstanding',
+            name='unique_user_programme_standing',
+        ),
+        migrations.RemoveIndex(
+            model_name='leaderboardstanding',
+            name='standing_programme_score_idx',
+        ),
+        migrations.AlterField(
+            model_name='leaderboardstanding',
+            name='ProgrammeName',
+            field=models.CharField(default='', max_length=10),
+        ),
+        migrations.RemoveField(
+            model_name='leaderboardstanding',
+            name='ProgrammeName',
+        ),
+        migrations.AddField(
+            model_name='leaderboardstanding',
+            name='ProgrammeID',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='Users.programme'),
+        ),
+        migrations.AlterField(
+            model_name='leaderboardstanding',
+            name='ProgrammeID',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='Users.programme'),
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardstanding',
+            constraint=models.UniqueConstraint(fields=('UserID', 'ProgrammeID'), name='unique_user_programme_standing'),
+        ),
+        migrations.AddIndex(
+            model_name='leaderboardstanding',
+            index=models.Index(fields=['ProgrammeID', '-AverageScore'], name='standing_programme_score_idx'),
+        ),
+        migrations.RunPython(rebuild_standings, clear_standings),
+        migrations.RunPython(migrations.RunPython.noop, restore_programme_counters),
+        migrations.RemoveField(
+            model_name='resultsextradetails',
+            name='BCA',
+        ),
+        migrations.RemoveField(
+            model_name='resultsextradetails',
+            name='BIM',
+        ),
+        migrations.RemoveField(
+            model_name='resultsextradetails',
+            name='BIT',
+        ),
+        migrations.RemoveField(
+            model_name='resultsextradetails',
+            name='BSCSIT',
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:55
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_paper_sizes(apps, schema_editor):
+    Exams = apps.get_model('Users', 'Exams')
+    ResultDetails = apps.get_model('Users', 'ResultDetails')
+
+    paper_sizes = (
+        ResultDetails.objects
+        .filter(ResultID=OuterRef('pk'))
+        .values('ResultID')
+        .annotate(total=Count('ID'))
+        .values('total')
+    )
+
+    Exams.objects.update(TotalQuestions=Coalesce(Subquery(paper_sizes), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Users', '0033_programme_foreign_keys'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exams',
+            name='TotalQuestions',
+            field=models.SmallIntegerField(default=0),
+        ),
+        migrations.RunPython(count_paper_sizes, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='exams',
+            index=models.Index(fields=['UserID', 'Date'], name='exams_user_date_idx'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:57
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Users', '0034_exam_paper_size'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubjectStatistics',
+            fields=[
+                ('ID', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('TimesAnswered', models.PositiveIntegerField(default=0)),
+                ('TimesCorrect', models.PositiveIntegerField(default=0)),
+                ('TimesSkipped', models.PositiveIntegerField(default=0)),
+                ('Accuracy', models.FloatField(default=0)),
+                ('UpdatedAt', models.DateTimeField(default=django.utils.timezone.now)),
+                ('SubjectID', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='Users.subject')),
+            ],
+            options={
+                'verbose_name_plural': 'SubjectStatistics',
+            },
+        ),
+        migrations.CreateModel(
+            name='QuestionStatistics',
+            fields=[
+                ('ID', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('TimesAnswered', models.PositiveIntegerField(default=0)),
+                ('TimesCorrect', models.PositiveIntegerField(default=0)),
+                ('TimesSkipped', models.PositiveIntegerField(default=0)),
+                ('OptionOneChosen', models.PositiveIntegerField(default=0)),
+                ('OptionTwoChosen', models.PositiveIntegerField(default=0)),
+                ('OptionThreeChosen', models.PositiveIntegerField(default=0)),
+                ('OptionFourChosen', models.PositiveIntegerField(default=0)),
+                ('Difficulty', models.FloatField(default=0)),
+                ('UpdatedAt', models.DateTimeField(default=django.utils.timezone.now)),
+                ('QuestionID', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='Users.questions')),
+                ('SubjectID', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='Users.subject')),
+            ],
+            options={
+                'verbose_name_plural': 'QuestionStatistics',
+                'indexes': [models.Index(fields=['SubjectID', '-Difficulty'], name='question_stats_difficulty_idx')],
+            },
+        ),
+    ]
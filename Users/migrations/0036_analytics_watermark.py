@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:58
+
+import datetime
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+def date_existing_exams(apps, schema_editor):
+    Exams = apps.get_model('Users', 'Exams')
+
+    # Only the day of the exams stored so far is known
+    for date in Exams.objects.values_list('Date', flat=True).distinct():
+        created_at = datetime.datetime.combine(date, datetime.time.min, tzinfo=datetime.timezone.utc)
+        Exams.objects.filter(Date=date).update(CreatedAt=created_at)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Users', '0035_answer_statistics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalyticsWatermark',
+            fields=[
+                ('ID', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('LastExamCreatedAt', models.DateTimeField(blank=True, null=True)),
+                ('LastExamID', models.UUIDField(blank=True, null=True)),
+                ('UpdatedAt', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name_plural': 'AnalyticsWatermark',
+            },
+        ),
+        migrations.AddField(
+            model_name='exams',
+            name='CreatedAt',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+        migrations.RunPython(date_existing_exams, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='exams',
+            index=models.Index(fields=['CreatedAt', 'ID'], name='exams_created_idx'),
+        ),
+    ]
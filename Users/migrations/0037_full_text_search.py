@@ -0,0 +1,76 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:14
+
+from django.db import migrations
+
+
+# FTS5 table, model table and indexed columns
+SEARCH_INDEXES = [
+    ('questions_fts', 'Users_questions', ['Title', 'OptionOne', 'OptionTwo', 'OptionThree', 'OptionFour']),
+    ('reports_fts', 'Users_reportquestion', ['Issue']),
+    ('feedbacks_fts', 'Users_feedback', ['Message']),
+]
+
+
+def create_search_indexes(apps, schema_editor):
+    # Other databases fall back to substring matching, see Users/full_text.py
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+
+    for table, content, columns in SEARCH_INDEXES:
+        names = ', '.join(f'"{column}"' for column in columns)
+        content_values = ', '.join(f'"{content}"."{column}"' for column in columns)
+        new_values = ', '.join(f'new."{column}"' for column in columns)
+        row_id = f'(SELECT "SearchRowID" FROM {table}_rows WHERE "ID" = %s."ID")'
+
+        # The implicit rowid of a model table may change on VACUUM or when a migration remakes
+        # the table, so every row gets an INTEGER PRIMARY KEY of its own, used as the FTS5 rowid.
+        # The FTS5 table keeps its own copy of the text, nothing in the database refers to the
+        # model tables, which later migrations are free to remake
+        schema_editor.execute(f'CREATE TABLE {table}_rows ("SearchRowID" integer NOT NULL PRIMARY KEY, "ID" char(32) NOT NULL UNIQUE)')
+        schema_editor.execute(f"CREATE VIRTUAL TABLE {table} USING fts5({names}, tokenize='unicode61 remove_diacritics 2')")
+
+        # Triggers rather than signals, so that bulk_create() and update() are indexed too
+        schema_editor.execute(
+            f'CREATE TRIGGER {table}_insert AFTER INSERT ON "{content}" BEGIN '
+            f'INSERT OR IGNORE INTO {table}_rows("ID") VALUES (new."ID"); '
+            f'INSERT INTO {table}(rowid, {names}) VALUES ({row_id % "new"}, {new_values}); END'
+        )
+        schema_editor.execute(
+            f'CREATE TRIGGER {table}_delete AFTER DELETE ON "{content}" BEGIN '
+            f'DELETE FROM {table} WHERE rowid = {row_id % "old"}; '
+            f'DELETE FROM {table}_rows WHERE "ID" = old."ID"; END'
+        )
+        schema_editor.execute(
+            f'CREATE TRIGGER {table}_update AFTER UPDATE OF {names} ON "{content}" BEGIN '
+            f'DELETE FROM {table} WHERE rowid = {row_id % "old"}; '
+            f'INSERT INTO {table}(rowid, {names}) VALUES ({row_id % "new"}, {new_values}); END'
+        )
+
+        schema_editor.execute(f'INSERT INTO {table}_rows("ID") SELECT "ID" FROM "{content}"')
+        schema_editor.execute(
+            f'INSERT INTO {table}(rowid, {names}) SELECT {table}_rows."SearchRowID", {content_values} '
+            f'FROM {table}_rows JOIN "{content}" ON "{content}"."ID" = {table}_rows."ID"'
+        )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+
+    for table, _, _ in SEARCH_INDEXES:
+        for trigger in ['insert', 'delete', 'update']:
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {table}_{trigger}')
+
+        schema_editor.execute(f'DROP TABLE IF EXISTS {table}')
+        schema_editor.execute(f'DROP TABLE IF EXISTS {table}_rows')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Users', '0036_analytics_watermark'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Users', '0037_full_text_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionSignature',
+            fields=[
+                ('QuestionID', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='Users.questions')),
+                ('Signature', models.BinaryField()),
+            ],
+            options={
+                'verbose_name_plural': 'QuestionSignatures',
+            },
+        ),
+    ]
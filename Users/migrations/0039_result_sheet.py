@@ -0,0 +1,115 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:22
+
+import uuid
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models.expressions import RawSQL
+
+
+OPTIONS = ['OptionOne', 'OptionTwo', 'OptionThree', 'OptionFour']
+
+ANSWER_SEPARATOR = '\x1f'
+
+
+def make_sheet(ResultSheet, result_id, paper, answers, unknown_answers):
+    return ResultSheet(ResultID_id=result_id, Paper=bytes(paper), Answers=bytes(answers), UserAnswers=ANSWER_SEPARATOR.join(unknown_answers))
+
+
+def pack_result_details(apps, schema_editor):
+    ResultDetails = apps.get_model('Users', 'ResultDetails')
+    ResultSheet = apps.get_model('Users', 'ResultSheet')
+
+    # The paper order was never stored, the rows of an exam were inserted answered questions first, then
+    # skipped ones. SQLite numbers rows in insertion order, other databases read them in a stable order
+    if schema_editor.connection.vendor == 'sqlite':
+        inserted = RawSQL(f'"{ResultDetails._meta.db_table}".rowid', [])
+
+    else:
+        inserted = 'pk'
+
+    details = (
+        ResultDetails.objects
+        .order_by('ResultID', inserted)
+        .values_list('ResultID', 'QuestionID', 'UserAnswer', *[f'QuestionID__{option}' for option in OPTIONS])
+    )
+
+    sheets = {}
+
+    for result_id, question_id, user_answer, *options in details.iterator(chunk_size=10000):
+        paper, answers, unknown_answers = sheets.setdefault(result_id, (bytearray(), bytearray(), []))
+        paper += question_id.bytes
+
+        if user_answer == '-':
+            answers.append(0)
+
+        elif user_answer in options:
+            answers.append(options.index(user_answer) + 1)
+
+        else:
+            # Answers matching no option, i.e. options edited since, are kept as unknown along with their text
+            answers.append(255)
+            unknown_answers.append(user_answer)
+
+        if len(sheets) > 1000:
+            last_id = result_id
+            ResultSheet.objects.bulk_create([make_sheet(ResultSheet, key, *sheet) for key, sheet in sheets.items() if key != last_id])
+            sheets = {last_id: sheets[last_id]}
+
+    ResultSheet.objects.bulk_create([make_sheet(ResultSheet, key, *sheet) for key, sheet in sheets.items()])
+
+
+def unpack_result_sheets(apps, schema_editor):
+    ResultDetails = apps.get_model('Users', 'ResultDetails')
+    ResultSheet = apps.get_model('Users', 'ResultSheet')
+    Questions = apps.get_model('Users', 'Questions')
+
+    questions = {question['ID']: question for question in Questions.objects.values('ID', *OPTIONS)}
+
+    # Only the exams stored since the sheets were introduced lack their rows
+    for sheet in ResultSheet.objects.filter(ResultID__resultdetails__isnull=True).iterator(chunk_size=1000):
+        paper = bytes(sheet.Paper)
+        unknown_answers = iter(sheet.UserAnswers.split(ANSWER_SEPARATOR))
+        details = []
+
+        for index, option in enumerate(bytes(sheet.Answers)):
+            question = questions.get(uuid.UUID(bytes=paper[index * 16:(index + 1) * 16]))
+            unknown_answer = next(unknown_answers, '') if option == 255 else None
+
+            if question is None:
+                continue
+
+            if option == 0:
+                user_answer = '-'
+
+            elif option == 255:
+                user_answer = unknown_answer
+
+            else:
+                user_answer = question[OPTIONS[option - 1]]
+
+            details.append(ResultDetails(ResultID_id=sheet.ResultID_id, QuestionID_id=question['ID'], UserAnswer=user_answer))
+
+        ResultDetails.objects.bulk_create(details)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Users', '0038_question_signature'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResultSheet',
+            fields=[
+                ('ResultID', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='Users.exams')),
+                ('Paper', models.BinaryField()),
+                ('Answers', models.BinaryField()),
+                ('UserAnswers', models.TextField(blank=True)),
+            ],
+            options={
+                'verbose_name_plural': 'ResultSheets',
+            },
+        ),
+        migrations.RunPython(pack_result_details, unpack_result_sheets),
+    ]
@@ -2,6 +2,7 @@ import uuid
 import datetime
 from django.db import models
 from django.dispatch import receiver
+from django.db.models.functions import Lower
 from django.utils.text import slugify
 from django.utils.timezone import now
 from django.db.models.signals import pre_save
@@ -9,6 +10,13 @@ from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.utils.translation import gettext_lazy as _
 
 
+# Case-insensitive lookups are written as <field>__lower=value.lower(), which
+# compiles to LOWER(<field>) = %s and can use the Lower() indexes below,
+# while __iexact compiles to a LIKE that no index serves
+models.CharField.register_lookup(Lower)
+models.TextField.register_lookup(Lower)
+
+
 def GenerateRandomURL(prefix):
     """
     Generate a random URL by appending a UUID to the given prefix.
@@ -97,6 +105,13 @@ class CustomUser(AbstractUser):
     Custom user model representing an individual user.
     """
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(Lower('email'), name='user_email_lower_idx'),
+            models.Index(fields=['MemberSince'], name='user_member_since_idx'),
+            models.Index(fields=['MemberSince'], condition=models.Q(is_superuser=False), name='user_since_not_admin_idx'),
+        ]
+
     username = None
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -147,6 +162,13 @@ class Exams(models.Model):
     class Meta:
         verbose_name_plural = "Exams"
 
+        indexes = [
+            models.Index(fields=['UserID', 'ProgrammeID', 'Date'], name='exams_user_programme_date_idx'),
+            models.Index(fields=['Date'], name='exams_date_idx'),
+            models.Index(fields=['UserID', 'Date'], name='exams_user_date_idx'),
+            models.Index(fields=['CreatedAt', 'ID'], name='exams_created_idx'),
+        ]
+
     UserID = models.ForeignKey(
             "CustomUser",
             on_delete = models.CASCADE
@@ -158,13 +180,18 @@ class Exams(models.Model):
             editable=False
         )
 
-    ProgrammeName = models.CharField(
+    ProgrammeID = models.ForeignKey(
+            "Programme",
+            on_delete = models.CASCADE
+        )
+
+    CorrectCounter = models.SmallIntegerField(
                         null = False,
                         blank = False,
-                        max_length = 10
+                        default = 0
                     )
 
-    CorrectCounter = models.SmallIntegerField(
+    TotalQuestions = models.SmallIntegerField(
                         null = False,
                         blank = False,
                         default = 0
@@ -183,6 +210,13 @@ class Exams(models.Model):
                 default=datetime.date.today
             )
 
+    CreatedAt = models.DateTimeField(
+                    null=False,
+                    blank=False,
+                    editable=False,
+                    default=now
+                )
+
     def save(self, *args, **kwargs):
         self.Slug = GenerateRandomURL('Result')
 
@@ -223,6 +257,44 @@ class ResultDetails(models.Model):
                 )
 
 
+class ResultSheet(models.Model):
+    """
+    Model representing the paper and the answers of an exam in compact form.
+
+    Paper holds the 16 byte IDs of the questions in the order they were
+    asked and Answers one byte per question: the chosen option from 1 for
+    OptionOne to 4 for OptionFour, 0 when skipped and 255 for a backfilled
+    answer matching none of the options of its question. UserAnswers only
+    keeps the text of these unknown answers, the others are read from the
+    options of their question. One row replaces the ResultDetails rows of
+    an exam, see Users/results.py.
+    """
+
+    class Meta:
+        verbose_name_plural = "ResultSheets"
+
+    ResultID = models.OneToOneField(
+            "Exams",
+            primary_key=True,
+            on_delete = models.CASCADE
+        )
+
+    Paper = models.BinaryField(
+                null = False,
+                blank = False
+            )
+
+    Answers = models.BinaryField(
+                null = False,
+                blank = False
+            )
+
+    UserAnswers = models.TextField(
+                    null = False,
+                    blank = True
+                )
+
+
 class ResultsExtraDetails(models.Model):
     class Meta:
         verbose_name_plural = "ResultsExtraDetails"
@@ -243,34 +315,63 @@ class ResultsExtraDetails(models.Model):
                     blank = False,
                     default=0
             )
-    BCA = models.PositiveIntegerField(
-                    null = False,
-                    blank = False,
-                    default=0
-            )
-    BIT = models.PositiveIntegerField(
+
+
+class LeaderBoardStanding(models.Model):
+    """
+    Model representing the exam counters of a user in a programme.
+
+    There is one row per (user, programme) pair, incremented in the database
+    whenever an exam is stored. The leaderboard reads the top ranks straight
+    from the (ProgrammeID, AverageScore) index and the number of exams a user
+    took in each programme is read from the rows of that user.
+    """
+
+    class Meta:
+        verbose_name_plural = "LeaderBoardStandings"
+
+        constraints = [
+            models.UniqueConstraint(fields=['UserID', 'ProgrammeID'], name='unique_user_programme_standing'),
+        ]
+
+        indexes = [
+            models.Index(fields=['ProgrammeID', '-AverageScore'], name='standing_programme_score_idx'),
+        ]
+
+    ID = models.UUIDField(
+            primary_key=True,
+            default=uuid.uuid4,
+            editable=False
+        )
+
+    UserID = models.ForeignKey(
+            "CustomUser",
+            on_delete = models.CASCADE
+        )
+
+    ProgrammeID = models.ForeignKey(
+            "Programme",
+            on_delete = models.CASCADE
+        )
+
+    TestsTaken = models.PositiveIntegerField(
                     null = False,
                     blank = False,
                     default=0
             )
-    BIM = models.PositiveIntegerField(
+
+    TotalCorrect = models.PositiveIntegerField(
                     null = False,
                     blank = False,
                     default=0
             )
-    BSCSIT = models.PositiveIntegerField(
+
+    AverageScore = models.FloatField(
                     null = False,
                     blank = False,
                     default=0
             )
 
-    def update(self, commit=False, **kwargs):
-        for key, value in kwargs.items():
-            setattr(self, key, value)
-
-        if commit:
-            self.save()
-
 
 class Programme(models.Model):
     """
@@ -280,6 +381,10 @@ class Programme(models.Model):
     class Meta:
         verbose_name_plural = "Programme"
 
+        indexes = [
+            models.Index(Lower('Name'), name='programme_name_lower_idx'),
+        ]
+
     ID = models.UUIDField(
             primary_key=True,
             default=uuid.uuid4,
@@ -310,6 +415,10 @@ class Subject(models.Model):
     class Meta:
         verbose_name_plural = "Subject"
 
+        indexes = [
+            models.Index(models.F('ProgrammeID'), Lower('Name'), name='subject_programme_name_idx'),
+        ]
+
     ProgrammeID = models.ForeignKey(
             "Programme",
             on_delete = models.CASCADE
@@ -351,6 +460,11 @@ class Questions(models.Model):
     class Meta:
         verbose_name_plural = "Questions"
 
+        indexes = [
+            models.Index(fields=['SubjectID', 'Title'], name='question_subject_title_idx'),
+            models.Index(Lower('Title'), name='question_title_lower_idx'),
+        ]
+
     SubjectID = models.ForeignKey(
             'Subject',
             on_delete = models.CASCADE
@@ -401,6 +515,206 @@ class Questions(models.Model):
         return str(self.ID)
 
 
+class QuestionStatistics(models.Model):
+    """
+    Model representing the answer statistics of a question.
+
+    Rows are summaries of the answers stored in ResultSheet, computed by
+    Users/analytics.py, so the difficulty of a question and the popularity
+    of each of its options are read without going through every answer.
+    """
+
+    class Meta:
+        verbose_name_plural = "QuestionStatistics"
+
+        indexes = [
+            models.Index(fields=['SubjectID', '-Difficulty'], name='question_stats_difficulty_idx'),
+        ]
+
+    ID = models.UUIDField(
+            primary_key=True,
+            default=uuid.uuid4,
+            editable=False
+        )
+
+    QuestionID = models.OneToOneField(
+                    "Questions",
+                    on_delete = models.CASCADE
+                )
+
+    SubjectID = models.ForeignKey(
+                    "Subject",
+                    on_delete = models.CASCADE
+                )
+
+    TimesAnswered = models.PositiveIntegerField(
+                        null = False,
+                        blank = False,
+                        default=0
+                    )
+
+    TimesCorrect = models.PositiveIntegerField(
+                        null = False,
+                        blank = False,
+                        default=0
+                    )
+
+    TimesSkipped = models.PositiveIntegerField(
+                        null = False,
+                        blank = False,
+                        default=0
+                    )
+
+    OptionOneChosen = models.PositiveIntegerField(
+                        null = False,
+                        blank = False,
+                        default=0
+                    )
+
+    OptionTwoChosen = models.PositiveIntegerField(
+                        null = False,
+                        blank = False,
+                        default=0
+                    )
+
+    OptionThreeChosen = models.PositiveIntegerField(
+                        null = False,
+                        blank = False,
+                        default=0
+                    )
+
+    OptionFourChosen = models.PositiveIntegerField(
+                        null = False,
+                        blank = False,
+                        default=0
+                    )
+
+    # Share of the answers that were wrong or skipped
+    Difficulty = models.FloatField(
+                    null = False,
+                    blank = False,
+                    default=0
+                )
+
+    UpdatedAt = models.DateTimeField(
+                    null=False,
+                    blank=False,
+                    default=now
+                )
+
+
+class SubjectStatistics(models.Model):
+    """
+    Model representing the answer statistics of a subject.
+
+    Rows are summaries of QuestionStatistics computed by Users/analytics.py.
+    """
+
+    class Meta:
+        verbose_name_plural = "SubjectStatistics"
+
+    ID = models.UUIDField(
+            primary_key=True,
+            default=uuid.uuid4,
+            editable=False
+        )
+
+    SubjectID = models.OneToOneField(
+                    "Subject",
+                    on_delete = models.CASCADE
+                )
+
+    TimesAnswered = models.PositiveIntegerField(
+                        null = False,
+                        blank = False,
+                        default=0
+                    )
+
+    TimesCorrect = models.PositiveIntegerField(
+                        null = False,
+                        blank = False,
+                        default=0
+                    )
+
+    TimesSkipped = models.PositiveIntegerField(
+                        null = False,
+                        blank = False,
+                        default=0
+                    )
+
+    # Share of the answers that were correct
+    Accuracy = models.FloatField(
+                    null = False,
+                    blank = False,
+                    default=0
+                )
+
+    UpdatedAt = models.DateTimeField(
+                    null=False,
+                    blank=False,
+                    default=now
+                )
+
+
+class AnalyticsWatermark(models.Model):
+    """
+    Model representing how far the answer statistics have been computed.
+
+    The single row holds the (CreatedAt, ID) of the last exam whose answers
+    are included in QuestionStatistics, so a refresh only reads the answers
+    of the exams stored after it.
+    """
+
+    class Meta:
+        verbose_name_plural = "AnalyticsWatermark"
+
+    ID = models.UUIDField(
+            primary_key=True,
+            default=uuid.uuid4,
+            editable=False
+        )
+
+    LastExamCreatedAt = models.DateTimeField(
+                            null=True,
+                            blank=True
+                        )
+
+    LastExamID = models.UUIDField(
+                    null=True,
+                    blank=True
+                )
+
+    UpdatedAt = models.DateTimeField(
+                    null=False,
+                    blank=False,
+                    default=now
+                )
+
+
+class QuestionSignature(models.Model):
+    """
+    Model representing the MinHash signature of a question.
+
+    Signatures are computed by Users/near_duplicates.py from the normalized
+    title and options of a question, once per question and again when it is
+    edited, so the near-duplicate index is loaded without rehashing the bank.
+    """
+
+    class Meta:
+        verbose_name_plural = "QuestionSignatures"
+
+    QuestionID = models.OneToOneField(
+            "Questions",
+            primary_key=True,
+            on_delete = models.CASCADE
+        )
+
+    Signature = models.BinaryField(
+                    null = False,
+                    blank = False
+                )
+
+
 class ReportQuestion(models.Model):
     """
     Model representing information about ReportQuestion.
@@ -409,6 +723,11 @@ class ReportQuestion(models.Model):
     class Meta:
         verbose_name_plural = 'ReportQuestion'
 
+        indexes = [
+            models.Index(fields=['Date'], name='report_date_idx'),
+            models.Index(fields=['IsMarked', 'Date'], name='report_marked_date_idx'),
+        ]
+
     UserID = models.ForeignKey(
             "CustomUser",
             on_delete = models.CASCADE
@@ -452,6 +771,12 @@ class FeedBack(models.Model):
     class Meta:
         verbose_name_plural = "FeedBack"
 
+        indexes = [
+            models.Index(fields=['Date'], name='feedback_date_idx'),
+            models.Index(fields=['IsMarked', 'Date'], name='feedback_marked_date_idx'),
+            models.Index(Lower('Email'), name='feedback_email_lower_idx'),
+        ]
+
     ID = models.UUIDField(
             primary_key=True,
             default=uuid.uuid4,
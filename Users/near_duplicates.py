@@ -0,0 +1,333 @@
+import re
+import struct
+import hashlib
+import threading
+import unicodedata
+from collections import defaultdict
+from django.conf import settings
+from django.core.cache import caches
+from django.dispatch import receiver
+from django.db.models.signals import post_save
+from .models import *
+from .catalog import GetCatalogConfig, GetCatalogVersion
+
+
+DEFAULT_NEAR_DUPLICATES = {
+    'THRESHOLD': 0.7,
+}
+
+# Changing any of these makes the stored signatures incomparable, run FindDuplicateQuestions --rebuild
+NUM_PERMUTATIONS = 64
+BANDS = 16
+SHINGLE_SIZE = 4
+
+ROWS = NUM_PERMUTATIONS // BANDS
+BAND_SIZE = ROWS * 8
+SIGNATURE_FORMAT = struct.Struct(f'<{NUM_PERMUTATIONS}Q')
+
+TEXT_FIELDS = {'Title', 'OptionOne', 'OptionTwo', 'OptionThree', 'OptionFour'}
+
+_index = None
+_index_version = None
+_lock = threading.Lock()
+
+
+def GetNearDuplicatesConfig():
+    return {**DEFAULT_NEAR_DUPLICATES, **getattr(settings, 'NEAR_DUPLICATES', {})}
+
+
+def Normalize(text):
+    """
+    Lowercase a text, drop its accents and punctuation and collapse its whitespace
+    """
+
+    text = unicodedata.normalize('NFKD', text or '').encode('ascii', 'ignore').decode()
+
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', text.lower()).split())
+
+
+def GetShingles(title, options):
+    """
+    Return the features compared between questions
+
+    The title contributes its overlapping character shingles, so a reworded
+    or retyped title still shares most of them. Each option is a feature,
+    whatever its position, so reordered options still match. Options weigh
+    as much as the title together, so questions built on the same template
+    with other options, e.g. "Choose the odd one out", are not duplicates
+
+    Parameters:
+        title (str): Title of the question
+        options (List): The four options of the question
+
+    Returns:
+        set: The features of the question
+    """
+
+    title = Normalize(title)
+    shingles = {title[index:index + SHINGLE_SIZE] for index in range(max(1, len(title) - SHINGLE_SIZE + 1))}
+    weight = max(1, len(shingles) // len(options))
+
+    for option in {Normalize(option) for option in options}:
+        shingles.update(f'|{copy}|{option}' for copy in range(weight))
+
+    return shingles
+
+
+def ComputeSignature(title, options):
+    """
+    Compute the MinHash signature of a question
+
+    Two signatures agree on a fraction of their values close to the Jaccard
+    similarity of the features of the questions. A single SHAKE digest per
+    feature gives its value under every hash function at once
+
+    Parameters:
+        title (str): Title of the question
+        options (List): The four options of the question
+
+    Returns:
+        bytes: The packed signature
+    """
+
+    values = [SIGNATURE_FORMAT.unpack(hashlib.shake_128(shingle.encode()).digest(SIGNATURE_FORMAT.size)) for shingle in GetShingles(title, options)]
+
+    return SIGNATURE_FORMAT.pack(*map(min, zip(*values)))
+
+
+def GetQuestionSignature(question):
+    return ComputeSignature(question.Title, [question.OptionOne, question.OptionTwo, question.OptionThree, question.OptionFour])
+
+
+def EstimateSimilarity(signature, other):
+    """
+    Estimate the Jaccard similarity of two questions from their signatures
+
+    Returns:
+        float: The fraction of equal signature values, between 0 and 1
+    """
+
+    return sum(a == b for a, b in zip(SIGNATURE_FORMAT.unpack(signature), SIGNATURE_FORMAT.unpack(other))) / NUM_PERMUTATIONS
+
+
+def GetBandKeys(signature):
+    """
+    Split a signature into the keys of its LSH buckets
+
+    Questions sharing at least one bucket are compared. With 16 bands of 4
+    values, questions 70% similar share one with a 99% probability and
+    questions 30% similar with a 12% probability
+    """
+
+    return [(band, signature[band * BAND_SIZE:(band + 1) * BAND_SIZE]) for band in range(BANDS)]
+
+
+class NearDuplicateIndex:
+    """
+    Locality-sensitive hashing index over question signatures, held in memory
+    """
+
+    def __init__(self):
+        self.signatures = {}
+        self.buckets = defaultdict(set)
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def Add(self, question_id, subject_id, signature):
+        self.Remove(question_id)
+        self.signatures[question_id] = (subject_id, signature)
+
+        for key in GetBandKeys(signature):
+            self.buckets[key].add(question_id)
+
+    def Remove(self, question_id):
+        stored = self.signatures.pop(question_id, None)
+
+        if stored is None:
+            return
+
+        for key in GetBandKeys(stored[1]):
+            bucket = self.buckets[key]
+            bucket.discard(question_id)
+
+            if not bucket:
+                del self.buckets[key]
+
+    def Query(self, signature, subject_id=None, threshold=None, exclude=None):
+        """
+        Find the indexed questions similar to a signature
+
+        Parameters:
+            signature (bytes): Signature of the question being checked
+            subject_id: Optional. Only return questions of this subject
+            threshold (float): Optional. Lowest estimated similarity returned, THRESHOLD by default
+            exclude: Optional. ID of the question being checked, when indexed
+
+        Returns:
+            List: (question ID, similarity) tuples, most similar first
+        """
+
+        threshold = GetNearDuplicatesConfig()['THRESHOLD'] if threshold is None else threshold
+        candidates = set()
+
+        for key in GetBandKeys(signature):
+            candidates.update(self.buckets.get(key, ()))
+
+        candidates.discard(exclude)
+        matches = []
+
+        for question_id in candidates:
+            candidate_subject_id, candidate_signature = self.signatures[question_id]
+
+            if subject_id is not None and candidate_subject_id != subject_id:
+                continue
+
+            similarity = EstimateSimilarity(signature, candidate_signature)
+
+            if similarity >= threshold:
+                matches.append((question_id, similarity))
+
+        return sorted(matches, key=lambda match: -match[1])
+
+    def Clusters(self, threshold=None, same_subject=True):
+        """
+        Group the indexed questions that are near-duplicates of each other
+
+        Two questions are in the same cluster when a chain of questions, each
+        similar enough to the next, links them
+
+        Parameters:
+            threshold (float): Optional. Lowest estimated similarity, THRESHOLD by default
+            same_subject (bool): Optional. Only group questions of the same subject
+
+        Returns:
+            List: The question IDs of each cluster of at least two questions, largest first
+        """
+
+        parents = {}
+
+        def Find(question_id):
+            while parents.get(question_id, question_id) != question_id:
+                question_id = parents[question_id]
+
+            return question_id
+
+        for question_id, (subject_id, signature) in self.signatures.items():
+            for match_id, _ in self.Query(signature, subject_id if same_subject else None, threshold, question_id):
+                root, match_root = Find(question_id), Find(match_id)
+
+                if root != match_root:
+                    parents[max(root, match_root)] = min(root, match_root)
+
+        clusters = defaultdict(list)
+
+        for question_id in parents:
+            clusters[Find(question_id)].append(question_id)
+
+        for root in clusters:
+            if root not in clusters[root]:
+                clusters[root].append(root)
+
+        return sorted(clusters.values(), key=len, reverse=True)
+
+
+def StoreMissingSignatures(rebuild=False):
+    """
+    Compute and store the signature of every question that has none
+
+    Parameters:
+        rebuild (bool): Optional. Recompute the signatures of every question instead
+
+    Returns:
+        int: The number of signatures computed
+    """
+
+    questions = Questions.objects.only('ID', 'Title', 'OptionOne', 'OptionTwo', 'OptionThree', 'OptionFour')
+
+    if rebuild:
+        QuestionSignature.objects.all().delete()
+
+    else:
+        questions = questions.filter(questionsignature__isnull=True)
+
+    signatures = [QuestionSignature(QuestionID_id=question.ID, Signature=GetQuestionSignature(question)) for question in questions.iterator()]
+    QuestionSignature.objects.bulk_create(signatures, batch_size=500)
+
+    return len(signatures)
+
+
+def LoadNearDuplicateIndex():
+    """
+    Build an index over the signatures of every stored question
+
+    Returns:
+        NearDuplicateIndex: A new index, owned by the caller
+    """
+
+    StoreMissingSignatures()
+    index = NearDuplicateIndex()
+
+    for question_id, subject_id, signature in QuestionSignature.objects.values_list('QuestionID', 'QuestionID__SubjectID', 'Signature'):
+        index.Add(question_id, subject_id, bytes(signature))
+
+    return index
+
+
+def GetNearDuplicateIndex():
+    """
+    Return the index shared by the callers of the process
+
+    It is reloaded from the stored signatures whenever the catalog version
+    changes, i.e. after questions were added, edited or deleted by any process
+
+    Returns:
+        NearDuplicateIndex: The index, which must not be modified
+    """
+
+    global _index, _index_version
+
+    version = GetCatalogVersion(caches[GetCatalogConfig()['CACHE']])
+
+    with _lock:
+        if _index is None or _index_version != version:
+            _index = LoadNearDuplicateIndex()
+            _index_version = version
+
+        return _index
+
+
+def FindNearDuplicates(subject_id, title, options, exclude=None):
+    """
+    Find the stored questions of a subject similar to a question
+
+    Parameters:
+        subject_id: ID of the subject of the question
+        title (str): Title of the question
+        options (List): The four options of the question
+        exclude: Optional. ID of the question being checked, when stored
+
+    Returns:
+        List: (Questions, similarity) tuples, most similar first
+    """
+
+    matches = GetNearDuplicateIndex().Query(ComputeSignature(title, options), subject_id, exclude=exclude)
+
+    if not matches:
+        return []
+
+    questions = Questions.objects.in_bulk([question_id for question_id, _ in matches])
+
+    return [(questions[question_id], similarity) for question_id, similarity in matches if question_id in questions]
+
+
+@receiver(post_save, sender=Questions)
+def store_question_signature(sender, instance, update_fields=None, **kwargs):
+    """
+    Signal receiver storing the signature of an added or edited question
+    """
+
+    if update_fields is not None and not TEXT_FIELDS.intersection(update_fields):
+        return
+
+    QuestionSignature.objects.update_or_create(QuestionID_id=instance.ID, defaults={'Signature': GetQuestionSignature(instance)})
@@ -0,0 +1,217 @@
+import threading
+from collections import deque, Counter
+from concurrent.futures import ThreadPoolExecutor
+from django.db import connections, transaction
+from django.conf import settings
+from django.dispatch import receiver
+from django.db.models.signals import post_save, post_delete
+from .models import *
+from .question_pool import SampleQuestions
+
+
+DEFAULT_PAPER_BUFFER = {
+    'ENABLED': True,
+    'DEPTH': 20,
+    'WORKERS': 2,
+}
+
+
+def BuildPaper(program):
+    """
+    Assemble a randomized model test paper of a programme
+
+    Parameters:
+        program (str): Name of the programme
+
+    Returns:
+        List: The details of each question of the paper
+    """
+
+    programme = Programme.objects.filter(Name=program)[0]
+
+    sizes = {subject.ID: subject.TotalQuestionsToSelect for subject in Subject.objects.filter(ProgrammeID=programme)}
+    question_ids = SampleQuestions(sizes)
+    questions = Questions.objects.in_bulk(question_ids)
+
+    model_test_values = []
+
+    # A pool cached by another process may still hold a deleted question
+    for question_id in question_ids:
+        if question_id not in questions:
+            continue
+
+        question = questions[question_id]
+        choices = [question.OptionOne, question.OptionTwo, question.OptionThree, question.OptionFour]
+        details = {
+            'id': question.ID,
+            'title': question.Title,
+            'choices': choices,
+            'answer': question.Answer,
+            'checked': False,
+            'program': program
+        }
+
+        model_test_values.append(details)
+
+    return model_test_values
+
+
+class PaperBuffer:
+    """
+    Bounded buffer of ready-made papers per programme
+
+    Taking a paper schedules a background refill of its programme, so that
+    many students starting a test at once are served from memory instead of
+    each assembling a paper. The buffers live in the current process only
+    """
+
+    def __init__(self, DEPTH=20, WORKERS=2, **options):
+        self.depth = DEPTH
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix='paper-buffer')
+
+        self.papers = {}
+        self.refilling = set()
+        self.generation = 0
+
+        self.hits = Counter()
+        self.misses = Counter()
+
+    def Pop(self, program):
+        """
+        Take a ready-made paper of a programme
+
+        Parameters:
+            program (str): Name of the programme
+
+        Returns:
+            List: The paper or None if the buffer of the programme is empty
+        """
+
+        with self.lock:
+            papers = self.papers.get(program)
+            paper = papers.popleft() if papers else None
+
+            if paper is None:
+                self.misses[program] += 1
+
+            else:
+                self.hits[program] += 1
+
+        self.ScheduleRefill(program)
+
+        return paper
+
+    def ScheduleRefill(self, program):
+        with self.lock:
+            if program in self.refilling or len(self.papers.get(program, ())) >= self.depth:
+                return
+
+            self.refilling.add(program)
+            generation = self.generation
+
+        self.executor.submit(self.Refill, program, generation)
+
+    def Refill(self, program, generation):
+        """
+        Fill the buffer of a programme up to its depth
+
+        Runs on a worker thread. Papers built before the buffers were
+        cleared are dropped
+        """
+
+        try:
+            while True:
+                with self.lock:
+                    if generation != self.generation or len(self.papers.get(program, ())) >= self.depth:
+                        return
+
+                paper = BuildPaper(program)
+
+                with self.lock:
+                    if generation != self.generation:
+                        return
+
+                    self.papers.setdefault(program, deque()).append(paper)
+
+        except IndexError:
+            # Unknown programme, nothing to buffer
+            return
+
+        finally:
+            with self.lock:
+                self.refilling.discard(program)
+
+            connections.close_all()
+
+    def Clear(self):
+        """
+        Drop every buffered paper, e.g. after the questions changed
+        """
+
+        with self.lock:
+            self.generation += 1
+            self.papers.clear()
+
+    def Stats(self):
+        """
+        Return the depth and the hit rate of the buffer of each programme
+
+        Returns:
+            dict: {'<programme>': {'depth': int, 'hits': int, 'misses': int, 'hit_rate': float}}
+        """
+
+        with self.lock:
+            programmes = set(self.papers) | set(self.hits) | set(self.misses)
+            stats = {}
+
+            for program in sorted(programmes):
+                requests = self.hits[program] + self.misses[program]
+
+                stats[program] = {
+                    'depth': len(self.papers.get(program, ())),
+                    'hits': self.hits[program],
+                    'misses': self.misses[program],
+                    'hit_rate': self.hits[program] / requests if requests else 0.0,
+                }
+
+            return stats
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def GetPaperBuffer():
+    """
+    Return the paper buffer configured by settings.PAPER_BUFFER or None when it is disabled
+    """
+
+    global _buffer
+
+    config = {**DEFAULT_PAPER_BUFFER, **getattr(settings, 'PAPER_BUFFER', {})}
+
+    if not config.pop('ENABLED'):
+        return None
+
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = PaperBuffer(**config)
+
+    return _buffer
+
+
+@receiver(post_save, sender=Questions)
+@receiver(post_delete, sender=Questions)
+@receiver(post_save, sender=Subject)
+def clear_paper_buffer(sender, instance, **kwargs):
+    """
+    Signal receiver dropping the buffered papers when questions or subjects change
+
+    The papers are dropped once the transaction commits, so that a refill running
+    in the meantime cannot buffer a paper of the old questions again
+    """
+
+    if _buffer is not None:
+        transaction.on_commit(_buffer.Clear)
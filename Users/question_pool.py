@@ -0,0 +1,114 @@
+import uuid
+import random
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.dispatch import receiver
+from django.db.models.signals import post_save, post_delete
+from .models import *
+
+
+DEFAULT_QUESTION_POOL = {
+    'CACHE': 'default',
+    'TIMEOUT': 60 * 60,
+}
+
+KEY_PREFIX = 'question-pool'
+ID_SIZE = 16
+
+
+def GetPoolConfig():
+    return {**DEFAULT_QUESTION_POOL, **getattr(settings, 'QUESTION_POOL', {})}
+
+
+def MakeKey(subject_id):
+    return f'{KEY_PREFIX}:{subject_id}'
+
+
+def GetQuestionPools(subject_ids):
+    """
+    Return the IDs of the questions of each subject
+
+    A pool is the 16 byte IDs of the questions of a subject joined into a
+    single bytes object. Pools missing from the cache are loaded in one query
+
+    Parameters:
+        subject_ids (list): IDs of the subjects
+
+    Returns:
+        dict: The pool of each subject ID
+    """
+
+    config = GetPoolConfig()
+    cache = caches[config['CACHE']]
+
+    keys = {MakeKey(subject_id): subject_id for subject_id in subject_ids}
+    cached = cache.get_many(list(keys))
+
+    pools = {keys[key]: pool for key, pool in cached.items()}
+    missing = [subject_id for subject_id in subject_ids if subject_id not in pools]
+
+    if missing:
+        loaded = {subject_id: [] for subject_id in missing}
+
+        for subject_id, question_id in Questions.objects.filter(SubjectID__in=missing).values_list('SubjectID', 'ID'):
+            loaded[subject_id].append(question_id.bytes)
+
+        loaded = {subject_id: b''.join(question_ids) for subject_id, question_ids in loaded.items()}
+        cache.set_many({MakeKey(subject_id): pool for subject_id, pool in loaded.items()}, config['TIMEOUT'])
+
+        pools.update(loaded)
+
+    return pools
+
+
+def SampleQuestions(sizes):
+    """
+    Pick random questions from the pools of the given subjects
+
+    Only the picked positions of a pool are decoded, the pool itself is
+    never shuffled or copied
+
+    Parameters:
+        sizes (dict): The number of questions to pick from each subject ID
+
+    Returns:
+        List: The IDs of the picked questions, grouped by subject in the given order
+    """
+
+    pools = GetQuestionPools(list(sizes))
+    question_ids = []
+
+    for subject_id, size in sizes.items():
+        pool = pools[subject_id]
+        total = len(pool) // ID_SIZE
+
+        for index in random.sample(range(total), min(size, total)):
+            question_ids.append(uuid.UUID(bytes=pool[index * ID_SIZE:(index + 1) * ID_SIZE]))
+
+    return question_ids
+
+
+def InvalidateQuestionPool(subject_id):
+    """
+    Drop the cached pool of a subject so that it is reloaded on next use
+
+    Parameters:
+        subject_id: ID of the subject whose questions changed
+    """
+
+    caches[GetPoolConfig()['CACHE']].delete(MakeKey(subject_id))
+
+
+@receiver(post_save, sender=Questions)
+@receiver(post_delete, sender=Questions)
+def invalidate_question_pool(sender, instance, **kwargs):
+    """
+    Signal receiver dropping the pool of the subject of an added, edited or deleted question
+
+    The pool is dropped once the transaction commits, so that a test started in
+    the meantime cannot cache it again without the change
+    """
+
+    subject_id = instance.SubjectID_id
+    transaction.on_commit(lambda: InvalidateQuestionPool(subject_id))
@@ -0,0 +1,66 @@
+from django.dispatch import receiver
+from django.db.models import F, Count, Sum, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_save, post_delete
+from .models import *
+
+
+def SyncQuestionTotals(subject_ids=None):
+    """
+    Recount Subject.TotalQuestions and Programme.TotalQuestions in the database
+
+    Used after questions are inserted in bulk, which sends no signals
+
+    Parameters:
+        subject_ids (list): Optional. If provided, only these subjects and their programmes are recounted
+    """
+
+    subjects = Subject.objects.all()
+
+    if subject_ids is not None:
+        subjects = subjects.filter(ID__in=subject_ids)
+
+    question_counts = (
+        Questions.objects
+        .filter(SubjectID=OuterRef('pk'))
+        .values('SubjectID')
+        .annotate(total=Count('ID'))
+        .values('total')
+    )
+
+    subjects.update(TotalQuestions=Coalesce(Subquery(question_counts), 0))
+
+    subject_totals = (
+        Subject.objects
+        .filter(ProgrammeID=OuterRef('pk'))
+        .values('ProgrammeID')
+        .annotate(total=Sum('TotalQuestions'))
+        .values('total')
+    )
+
+    programmes = Programme.objects.filter(ID__in=subjects.values('ProgrammeID'))
+    programmes.update(TotalQuestions=Coalesce(Subquery(subject_totals), 0))
+
+
+def ChangeQuestionTotals(subject_id, change):
+    Subject.objects.filter(ID=subject_id).update(TotalQuestions=F('TotalQuestions') + change)
+    Programme.objects.filter(subject__ID=subject_id).update(TotalQuestions=F('TotalQuestions') + change)
+
+
+@receiver(post_save, sender=Questions)
+def count_added_question(sender, instance, created, **kwargs):
+    """
+    Signal receiver counting a newly added question in its subject and programme
+    """
+
+    if created:
+        ChangeQuestionTotals(instance.SubjectID_id, 1)
+
+
+@receiver(post_delete, sender=Questions)
+def count_deleted_question(sender, instance, **kwargs):
+    """
+    Signal receiver removing a deleted question from the totals of its subject and programme
+    """
+
+    ChangeQuestionTotals(instance.SubjectID_id, -1)
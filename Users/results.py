@@ -0,0 +1,319 @@
+import uuid
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F, Count, Sum, FloatField
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast
+from .models import *
+
+
+# Answers byte of a skipped question, options are 1 to 4
+SKIPPED = 0
+
+# Answers byte of a backfilled answer matching none of the current options of its question
+UNKNOWN = 255
+
+ID_SIZE = 16
+
+# Values of the option inputs of a paper, 'choices <question number>' may hold nothing else
+SUBMITTED_OPTIONS = ['1', '2', '3', '4']
+
+# Separates the texts of the unknown answers in UserAnswers of a ResultSheet
+ANSWER_SEPARATOR = '\x1f'
+
+
+def ScorePaper(values, submitted):
+    """
+    Mark the answers submitted for a paper
+
+    Every question of the paper gets its 'UserAnswer' ('-' when it was not
+    answered), 'option' (its position among the options of the question,
+    see ResultSheet) and 'is_correct' keys filled in. A submitted value other
+    than '1' to '4' counts as not answered
+
+    Parameters:
+        values (list): The questions of the paper as returned by GetPaperValues
+        submitted (QueryDict): The submitted form containing 'choices <question number>' keys, numbered by the 'number' of each question
+
+    Returns:
+        int: The number of correctly answered questions
+    """
+
+    correct_counter = 0
+
+    for value in values:
+        option = submitted.get(f"choices {value['number']}")
+
+        if option not in SUBMITTED_OPTIONS:
+            value['UserAnswer'] = '-'
+            value['option'] = SKIPPED
+            value['is_correct'] = False
+
+            continue
+
+        value['UserAnswer'] = value['choices'][int(option) - 1]
+        value['option'] = value['option_order'][int(option) - 1] + 1
+        value['is_correct'] = value['UserAnswer'] == value['answer']
+
+        if value['is_correct']:
+            correct_counter += 1
+
+    return correct_counter
+
+
+def SaveResult(user, programme, values, correct_counter):
+    """
+    Store a scored paper in a single transaction
+
+    Inserts the Exams row and its ResultSheet, then increments the user's
+    counters in the database
+
+    Parameters:
+        user (CustomUser): The user who took the exam
+        programme (str): Name of the programme of the paper
+        values (list): The questions of the paper as marked by ScorePaper
+        correct_counter (int): The number of correctly answered questions
+
+    Returns:
+        Exams: The stored exam
+    """
+
+    with transaction.atomic():
+        programme = Programme.objects.get(Name=programme)
+
+        result = Exams(UserID=user, ProgrammeID=programme, CorrectCounter=correct_counter, TotalQuestions=len(values))
+        result.save()
+
+        paper, answers, user_answers = PackAnswers([(value['id'], value['option'], value['UserAnswer']) for value in values])
+        ResultSheet.objects.create(ResultID=result, Paper=paper, Answers=answers, UserAnswers=user_answers)
+
+        CountExam(user, programme, correct_counter)
+
+    return result
+
+
+def PackAnswers(answers):
+    """
+    Encode the answers of a paper as the Paper, Answers and UserAnswers of a ResultSheet
+
+    Only the text of the UNKNOWN answers is kept, any other answer is read
+    back from the options of its question
+
+    Parameters:
+        answers (List): (question ID, option, answer text) tuples in the order the questions were asked
+
+    Returns:
+        tuple: The Paper and Answers bytes and the UserAnswers text
+    """
+
+    paper = b''.join(uuid.UUID(str(question_id)).bytes for question_id, _, _ in answers)
+    unknown_answers = [user_answer for _, option, user_answer in answers if option == UNKNOWN]
+
+    return paper, bytes(option for _, option, _ in answers), ANSWER_SEPARATOR.join(unknown_answers)
+
+
+def UnpackAnswers(sheet):
+    """
+    Decode the answers of a ResultSheet
+
+    Parameters:
+        sheet (ResultSheet): The stored sheet of an exam
+
+    Returns:
+        List: (question ID, option, answer text) tuples in the order the questions were asked, the text being None unless the option is UNKNOWN
+    """
+
+    paper = bytes(sheet.Paper)
+    options = bytes(sheet.Answers)
+    question_ids = [uuid.UUID(bytes=paper[index:index + ID_SIZE]) for index in range(0, len(paper), ID_SIZE)]
+    unknown_answers = iter(sheet.UserAnswers.split(ANSWER_SEPARATOR) if UNKNOWN in options else [])
+
+    return [(question_id, option, next(unknown_answers, '') if option == UNKNOWN else None) for question_id, option in zip(question_ids, options)]
+
+
+def GetOption(question, user_answer):
+    """
+    Return the position of an answer among the options of a question
+
+    Returns:
+        int: 1 to 4, SKIPPED for '-' or UNKNOWN when no option matches
+    """
+
+    if user_answer == '-':
+        return SKIPPED
+
+    options = [question.OptionOne, question.OptionTwo, question.OptionThree, question.OptionFour]
+
+    return options.index(user_answer) + 1 if user_answer in options else UNKNOWN
+
+
+def GetUserAnswer(choices, option, unknown_answer=None):
+    """
+    Return the text of a stored answer
+
+    Parameters:
+        choices (List): The options of the question, from OptionOne to OptionFour
+        option (int): The stored option
+        unknown_answer (str): Optional. The text kept for an UNKNOWN option by UnpackAnswers
+
+    Returns:
+        str: The chosen option, '-' when skipped or the kept text when unknown
+    """
+
+    if option == SKIPPED:
+        return '-'
+
+    if option == UNKNOWN:
+        return unknown_answer or ''
+
+    return choices[option - 1]
+
+
+def CompactResultDetails(batch_size=1000, prune=False):
+    """
+    Store a ResultSheet for every exam only having ResultDetails rows
+
+    The rows of an exam are read in the order SQLite numbered them on
+    insert, other databases read them in primary key order. The paper order
+    itself was never stored: GetResult inserted the answered questions in
+    the order of the form, then the skipped ones
+
+    Parameters:
+        batch_size (int): Optional. Number of sheets inserted per query
+        prune (bool): Optional. Delete the ResultDetails rows of every exam having a sheet afterwards
+
+    Returns:
+        dict: {'exams': int, 'answers': int, 'unknown': int, 'pruned': int}
+    """
+
+    exams = Exams.objects.filter(resultsheet__isnull=True).values('ID')
+    inserted = RawSQL(f'"{ResultDetails._meta.db_table}".rowid', []) if connection.vendor == 'sqlite' else 'pk'
+    details = (
+        ResultDetails.objects
+        .filter(ResultID__in=exams)
+        .select_related('QuestionID')
+        .only('ResultID', 'UserAnswer', *[f'QuestionID__{field}' for field in ['OptionOne', 'OptionTwo', 'OptionThree', 'OptionFour']])
+        .order_by('ResultID', inserted)
+    )
+
+    sheets = []
+    current_id, current = None, []
+    stats = {'exams': 0, 'answers': 0, 'unknown': 0, 'pruned': 0}
+
+    def AddSheet():
+        paper, answers, user_answers = PackAnswers(current)
+        sheets.append(ResultSheet(ResultID_id=current_id, Paper=paper, Answers=answers, UserAnswers=user_answers))
+
+        stats['exams'] += 1
+        stats['answers'] += len(current)
+        stats['unknown'] += answers.count(UNKNOWN)
+
+    with transaction.atomic():
+        for detail in details.iterator(chunk_size=batch_size * 10):
+            if detail.ResultID_id != current_id:
+                if current:
+                    AddSheet()
+
+                current_id, current = detail.ResultID_id, []
+
+                if len(sheets) >= batch_size:
+                    ResultSheet.objects.bulk_create(sheets)
+                    sheets = []
+
+            current.append((detail.QuestionID_id, GetOption(detail.QuestionID, detail.UserAnswer), detail.UserAnswer))
+
+        if current:
+            AddSheet()
+
+        ResultSheet.objects.bulk_create(sheets)
+
+        if prune:
+            stats['pruned'], _ = ResultDetails.objects.filter(ResultID__resultsheet__isnull=False).delete()
+
+    return stats
+
+
+def CountExam(user, programme, correct_counter):
+    """
+    Add a stored exam to the counters of its user
+
+    Every counter is incremented by the database, so exams of the same user
+    stored at the same time never overwrite each other's increments. Call it
+    inside the transaction storing the exam
+
+    Parameters:
+        user (CustomUser): The user who took the exam
+        programme (Programme): The programme of the exam
+        correct_counter (int): The number of correctly answered questions
+    """
+
+    ResultsExtraDetails.objects.filter(UserID=user).update(TestsTaken=F('TestsTaken') + 1)
+    UpdateStanding(user, programme, correct_counter)
+
+
+def UpdateStanding(user, programme, correct_counter):
+    """
+    Fold a new exam into the user's counters of a programme
+
+    Parameters:
+        user (CustomUser): The user who took the exam
+        programme (Programme): The programme of the exam
+        correct_counter (int): The number of correctly answered questions
+    """
+
+    standing = LeaderBoardStanding.objects.filter(UserID=user, ProgrammeID=programme)
+
+    # Every right-hand side refers to the values before the update
+    updated = standing.update(
+                TestsTaken=F('TestsTaken') + 1,
+                TotalCorrect=F('TotalCorrect') + correct_counter,
+                AverageScore=Cast(F('TotalCorrect') + correct_counter, FloatField()) / (F('TestsTaken') + 1),
+            )
+
+    if updated:
+        return
+
+    try:
+        with transaction.atomic():
+            LeaderBoardStanding.objects.create(
+                UserID=user,
+                ProgrammeID=programme,
+                TestsTaken=1,
+                TotalCorrect=correct_counter,
+                AverageScore=correct_counter
+            )
+
+    except IntegrityError:
+        # Another exam of the same user created the row in the meantime
+        UpdateStanding(user, programme, correct_counter)
+
+
+def RebuildStandings():
+    """
+    Recompute the counters of every user in each programme from the stored exams
+
+    Returns:
+        int: The number of standings created
+    """
+
+    grouped_exams = (
+        Exams.objects
+        .values('UserID', 'ProgrammeID')
+        .annotate(tests_taken=Count('ID'), total_correct=Sum('CorrectCounter'))
+    )
+
+    standings = [
+        LeaderBoardStanding(
+            UserID_id=row['UserID'],
+            ProgrammeID_id=row['ProgrammeID'],
+            TestsTaken=row['tests_taken'],
+            TotalCorrect=row['total_correct'],
+            AverageScore=row['total_correct'] / row['tests_taken'],
+        )
+        for row in grouped_exams
+    ]
+
+    with transaction.atomic():
+        LeaderBoardStanding.objects.all().delete()
+        LeaderBoardStanding.objects.bulk_create(standings, batch_size=1000)
+
+    return len(standings)
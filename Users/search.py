@@ -1,25 +1,62 @@
+"""
+Every filter turns the admin's search-type into lookups on a queryset, so
+the filtering runs in the database and the caller only materializes the
+page it displays. Invalid searching values return an empty queryset.
+"""
+
+import re
 import datetime
-import requests
+from django.db.models import Q
 from .models import *
+from .full_text import FullTextSearch
+from api import services
 
 
-def compare_date(from_db, from_user, format='%Y-%m-%d'):
-    """
-    Compare two date strings using the specified format
+def parse_date(value, format='%Y-%m-%d'):
     """
+    Convert a date string entered by the admin into a date
 
-    if from_db is None:
-        return False
+    Returns:
+        date: The parsed date or None if the value is not a valid date
+    """
 
     try:
-        from_db = datetime.datetime.strptime(from_db, format).date()
+        return datetime.datetime.strptime(value, format).date()
+
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_number(value):
+    """
+    Convert a number entered by the admin into an integer
+
+    Returns:
+        int: The parsed number or None if the value is not a number
+    """
+
+    if value is None or value.strip().isdigit() is False:
+        return None
+
+    return int(value)
+
+
+SEARCH_CONTEXT_KEYS = ['user', 'programme', 'subject']
+
 
-    except ValueError:
-        from_db = datetime.datetime.strptime(from_db, "%Y-%m-%dT%H:%M:%S.%fZ").date()
+def GetSearchContext(request):
+    """
+    Read the drill-down scope of an admin search from the query string
+
+    The list pages render their scope as hidden inputs of the search form,
+    so a search always runs on the page it was submitted from, whichever
+    process serves it
 
-    from_user = datetime.datetime.strptime(from_user, format).date()
+    Returns:
+        dict: The 'user', 'programme' and 'subject' of the search, empty when not given
+    """
 
-    return from_db == from_user
+    return {key: request.GET.get(key, '').strip() for key in SEARCH_CONTEXT_KEYS}
 
 
 class UserFilter:
@@ -27,51 +64,64 @@ class UserFilter:
     Utility class for filtering users based on various criteria
     """
 
-    def __init__(self, host_url, searching_value):
+    def __init__(self, searching_value):
         self.searching_value = searching_value
-        self.data = requests.get(f'http://{host_url}/api/users').json()
+        self.data = services.QueryUsers()
 
     def SearchByEmail(self, search_type):
         """
         Filter users by email
 
         Returns:
-            List: A list of users matching the specified email
+            QuerySet: Users matching the specified email
         """
 
-        return list(filter(lambda value: value[search_type] == self.searching_value, self.data))
+        return self.data.filter(**{search_type: self.searching_value})
 
     def SearchByDOB(self, search_type):
         """
         Filter users by date of birth
 
         Returns:
-            List: A list of users matching the specified date of birth
+            QuerySet: Users matching the specified date of birth
         """
 
-        return list(filter(lambda value: compare_date(value[search_type], self.searching_value), self.data))
+        date = parse_date(self.searching_value)
+
+        if date is None:
+            return self.data.none()
+
+        return self.data.filter(**{search_type: date})
 
     def SearchByGender(self, search_type):
         """
         Filter users by gender
 
         Returns:
-            List: A list of users matching the specified gender
+            QuerySet: Users matching the specified gender
         """
 
+        if not self.searching_value:
+            return self.data.none()
+
         gender = self.searching_value.lower()[0]
 
-        return list(filter(lambda value: value[search_type] and value[search_type][0] == gender, self.data))
+        return self.data.filter(**{f'{search_type}__startswith': gender})
 
     def SearchByMemberSince(self, search_type):
         """
         Filter users by the date they became members
 
         Returns:
-            List: A list of users who became members on the specified date
+            QuerySet: Users who became members on the specified date
         """
 
-        return list(filter(lambda value: compare_date(value[search_type], self.searching_value), self.data))
+        date = parse_date(self.searching_value)
+
+        if date is None:
+            return self.data.none()
+
+        return self.data.filter(**{f'{search_type}__date': date})
 
     def SearchByAdmin(self, is_admin=True):
         """
@@ -81,10 +131,10 @@ class UserFilter:
             is_admin (bool): If True, filter for admin users; if False, filter for non-admin users
 
         Returns:
-            List: A list of users matching the specified admin status
+            QuerySet: Users matching the specified admin status
         """
 
-        return list(filter(lambda value: value['is_superuser'] == is_admin, self.data))
+        return self.data.filter(is_superuser=is_admin)
 
     def SearchByActive(self, is_active=True):
         """
@@ -94,10 +144,10 @@ class UserFilter:
             is_active (bool): If True, filter for active users; if False, filter for inactive users
 
         Returns:
-            List: A list of users matching the specified active status
+            QuerySet: Users matching the specified active status
         """
 
-        return list(filter(lambda value: value['is_active'] == is_active, self.data))
+        return self.data.filter(is_active=is_active)
 
 
 class UsersExamsFilter:
@@ -105,72 +155,71 @@ class UsersExamsFilter:
     Utility class for filtering exams based on various criteria
     """
 
-    def __init__(self, host_url, searching_value):
+    def __init__(self, searching_value):
         self.searching_value = searching_value
-        self.data = requests.get(f'http://{host_url}/api/users_exams').json()
+        self.data = services.QueryUsersExams()
 
     def SearchByEmail(self, search_type):
         """
         Filter exams by user's email
 
         Returns:
-            List: A list of exams taken by the specified user's email
+            QuerySet: Users matching the specified email
         """
 
-        return list(filter(lambda value: value[search_type].lower() == self.searching_value.lower(), self.data))
+        return self.data.filter(**{f'{search_type}__lower': self.searching_value.lower()})
 
     def SearchByUsername(self, search_type):
         """
         Filter exams by user's username
 
+        A user matches when any word of their name is one of the searched words
+
         Returns:
-            List: A list of exams taken by the specified user's username
+            QuerySet: Users sharing at least one word with the specified username
         """
 
-        def check_username(from_db):
-            """
-            Check if there is any common word between the provided 'from_db'
-            string and the searching value in the current instance
-            """
+        words = (self.searching_value or '').split()
 
-            from_db = set(from_db.lower().split())
-            from_user = set(self.searching_value.lower().split())
+        if not words:
+            return self.data.none()
 
-            return (from_db & from_user) != set()
+        query = Q()
 
-        return list(filter(lambda value: check_username(value[search_type].lower()), self.data))
+        for word in words:
+            query |= Q(**{f'{search_type}__iregex': rf'(^|\s){re.escape(word)}(\s|$)'})
+
+        return self.data.filter(query)
 
     def SearchByTestsTaken(self, search_type):
         """
         Filter exams by the total number of tests taken
 
         Returns:
-            List: A list of exams with the specified total number of tests taken
+            QuerySet: Users with the specified total number of tests taken
         """
 
-        if self.searching_value.isdigit() is False:
-            return []
+        tests_taken = parse_number(self.searching_value)
 
-        self.searching_value = int(self.searching_value)
+        if tests_taken is None:
+            return self.data.none()
 
-        return list(filter(lambda value: value[search_type] == self.searching_value, self.data))
+        return self.data.filter(**{f'resultsextradetails__{search_type}': tests_taken})
 
     def SearchByDate(self):
         """
         Filter exams by date
 
         Returns:
-            List: A list of exams taken on the specified date
+            QuerySet: Exams taken on the specified date
         """
 
-        programmes = []
-        date = datetime.datetime.strptime(self.searching_value, '%Y-%m-%d').date()
+        date = parse_date(self.searching_value)
 
-        for detail in Exams.objects.all():
-            if detail.Date == date:
-                programmes.append(detail)
+        if date is None:
+            return Exams.objects.none()
 
-        return programmes
+        return Exams.objects.filter(Date=date)
 
 
 class UsersExamsProgrammeListsFilter:
@@ -178,9 +227,9 @@ class UsersExamsProgrammeListsFilter:
     Utility class for filtering exams based on various criteria
     """
 
-    def __init__(self, host, user_id, searching_value):
+    def __init__(self, user_id, searching_value):
         self.searching_value = searching_value
-        self.data = requests.get(f'http://{host}/api/users_exams_each_programmes/{user_id}').json()
+        self.data = services.GetUsersExamsInEachProgramme(user_id)
 
     def SearchByProgrammeName(self):
         """
@@ -193,10 +242,11 @@ class UsersExamsProgrammeListsFilter:
         if self.data:
             self.data = self.data[0]
 
-            searching_value = self.searching_value.upper()
+            searching_value = self.searching_value.lower()
+            programmes = [k for k in self.data if k.lower() == searching_value and k not in ['UserID', 'UserEmail', 'TestsTaken']]
 
-            if searching_value in self.data:
-                return [{k:v for k, v in self.data.items() if k in ['UserID', 'UserEmail', searching_value]}]
+            if programmes:
+                return [{k:v for k, v in self.data.items() if k in ['UserID', 'UserEmail', *programmes]}]
 
     def SearchByTestsTaken(self):
         """
@@ -220,33 +270,39 @@ class DetailedExamsFilter:
     Utility class for filtering exams based on various criteria
     """
 
-    def __init__(self, host, user_id, programme, searching_value):
+    def __init__(self, user_id, programme, searching_value):
         self.searching_value = searching_value.lower()
-        self.data = requests.get(f'http://{host}/api/exams/{user_id}/{programme}').json()
+        self.data = services.QueryExams(user_id, programme)
 
     def SearchByDate(self, search_type):
         """
         Filter exams by date
 
         Returns:
-            List: A list of exams taken on the specified date
+            QuerySet: Exams taken on the specified date
         """
 
-        return list(filter(lambda value: compare_date(value[search_type], self.searching_value), self.data))
+        date = parse_date(self.searching_value)
+
+        if date is None:
+            return self.data.none()
+
+        return self.data.filter(**{search_type: date})
 
     def SearchByTotalCorrectAnswered(self, search_type):
         """
         Filter exams by total correct answered by user
 
         Returns:
-            List: A list of exams taken on the specified total correct answered by user
+            QuerySet: Exams with the specified total correct answered by user
         """
 
-        if self.searching_value.isdigit() is False:
-            return []
+        correct_counter = parse_number(self.searching_value)
+
+        if correct_counter is None:
+            return self.data.none()
 
-        self.searching_value = int(self.searching_value)
-        return list(filter(lambda value: value[search_type] == self.searching_value, self.data))
+        return self.data.filter(**{search_type: correct_counter})
 
 
 class SubjectFilter:
@@ -257,58 +313,55 @@ class SubjectFilter:
     def __init__(self, searching_value):
         self.searching_value = searching_value
 
-    def SearchByProgrammeName(self, host, api_url):
+    def SearchByProgrammeName(self):
         """
         Filter subjects by program name
 
         Returns:
-            List: A list of subjects matching the specified program name
+            QuerySet: Programmes matching the specified program name
         """
 
-        programmes = requests.get(f'http://{host}/api/{api_url}').json()
-        programmes = filter(lambda programme: programme['Name'].lower() == self.searching_value.lower(), programmes)
-
-        return list(programmes)
+        return services.QuerySubjectProgrammes().filter(Name__lower=self.searching_value.lower())
 
-    def SearchByTotalSubjects(self, host, api_url):
+    def SearchByTotalSubjects(self):
         """
         Filter subjects by total number of subjects
 
         Returns:
-            List: A list of subjects matching the total number of subjects
+            QuerySet: Programmes having the specified number of subjects
         """
 
-        searching_value = int(self.searching_value)
-        programmes = requests.get(f'http://{host}/api/{api_url}').json()
-        programmes = filter(lambda programme: programme['TotalQuestions'] == searching_value, programmes)
+        total_subjects = parse_number(self.searching_value)
 
-        return list(programmes)
+        if total_subjects is None:
+            return Programme.objects.none()
 
-    def SearchBySubjectName(self, host, programme):
+        return services.QuerySubjectProgrammes().filter(total_subjects=total_subjects)
+
+    def SearchBySubjectName(self, programme):
         """
         Filter subjects by subject name
 
         Returns:
-            List: A list of subjects matching the specified subject name
+            QuerySet: Subjects matching the specified subject name
         """
 
-        subjects = requests.get(f'http://{host}/api/subjects/{programme}').json()
-        subjects = list(filter(lambda subject: subject['Name'].lower() == self.searching_value.lower(), subjects))
-
-        return subjects
+        return services.QuerySubjects(programme).filter(Name__lower=self.searching_value.lower())
 
-    def SearchByTotalQuestionsToSelect(self, host, programme, api_url):
+    def SearchByTotalQuestionsToSelect(self, programme):
         """
         Filter subjects by the total number of questions to select
 
         Returns:
-            List: A list of subjects matching the specified total number of questions to select
+            QuerySet: Subjects matching the specified total number of questions to select
         """
 
-        programmes = requests.get(f'http://{host}/api/{api_url}/{programme}').json()
-        programmes = filter(lambda programme: programme['TotalQuestionsToSelect'] == int(self.searching_value), programmes)
+        total_questions = parse_number(self.searching_value)
 
-        return list(programmes)
+        if total_questions is None:
+            return Subject.objects.none()
+
+        return services.QuerySubjects(programme).filter(TotalQuestionsToSelect=total_questions)
 
 
 class QuestionProgrammeFilter:
@@ -316,31 +369,34 @@ class QuestionProgrammeFilter:
     Utility class for filtering questions based on various criteria
     """
 
-    def __init__(self, host, searching_value):
+    def __init__(self, searching_value):
         self.searching_value = searching_value
-        self.data = requests.get(f'http://{host}/api/questions').json()
+        self.data = services.QueryProgrammes()
 
     def SearchByProgramme(self):
         """
         Filter programme by programme name
 
         Returns:
-            List: A list of programme matching the specified programme name
+            QuerySet: Programmes matching the specified programme name
         """
 
-        return [data for data in self.data if data['Name'].lower() == self.searching_value.lower()]
+        return self.data.filter(Name__lower=self.searching_value.lower())
 
     def SearchByTotalQuestions(self):
         """
         Filter programme by total question
 
         Returns:
-            List: A list of programme matching the specified total question
+            QuerySet: Programmes matching the specified total question
         """
 
-        searching_value = int(self.searching_value)
+        total_questions = parse_number(self.searching_value)
+
+        if total_questions is None:
+            return self.data.none()
 
-        return [data for data in self.data if data['TotalQuestions'] == searching_value]
+        return self.data.filter(TotalQuestions=total_questions)
 
 
 class QuestionPerProgrammeFilter:
@@ -348,31 +404,34 @@ class QuestionPerProgrammeFilter:
     Utility class for filtering questions based on various criteria
     """
 
-    def __init__(self, host, programme, searching_value):
+    def __init__(self, programme, searching_value):
         self.searching_value = searching_value
-        self.data = requests.get(f'http://{host}/api/questions/{programme}').json()
+        self.data = services.QuerySubjects(programme)
 
     def SearchBySubject(self):
         """
         Filter subjects by subject name
 
         Returns:
-            List: A list of subjects matching the specified subject name
+            QuerySet: Subjects matching the specified subject name
         """
 
-        return [data for data in self.data if data['Name'].lower() == self.searching_value.lower()]
+        return self.data.filter(Name__lower=self.searching_value.lower())
 
     def SearchByTotalQuestions(self):
         """
         Filter programme by total question
 
         Returns:
-            List: A list of programme matching the specified total question
+            QuerySet: Subjects matching the specified total question
         """
 
-        searching_value = int(self.searching_value)
+        total_questions = parse_number(self.searching_value)
 
-        return [data for data in self.data if data['TotalQuestions'] == searching_value]
+        if total_questions is None:
+            return self.data.none()
+
+        return self.data.filter(TotalQuestions=total_questions)
 
 
 class QuestionFilter:
@@ -380,39 +439,39 @@ class QuestionFilter:
     Utility class for filtering questions based on various criteria
     """
 
-    def __init__(self, host, programme, subject, searching_value):
+    def __init__(self, programme, subject, searching_value):
         self.searching_value = searching_value
-        self.data = requests.get(f'http://{host}/api/questions/{programme}/{subject}').json()
+        self.data = services.QueryQuestionsPerSubject(programme, subject)
 
     def SearchByTitle(self):
         """
-        Filter questions by title
+        Search questions by title
 
         Returns:
-            List: A list of questions matching the specified title
+            QuerySet: Questions whose title matches the searched words, phrases or prefixes, most relevant first
         """
 
-        return list(filter(lambda question: question['Title'].lower() == self.searching_value.lower(), self.data))
+        return FullTextSearch(self.data, self.searching_value, ['Title'])
 
     def SearchByAnswer(self):
         """
         Filter questions by answer
 
         Returns:
-            List: A list of questions matching the specified answer
+            QuerySet: Questions matching the specified answer
         """
 
-        return list(filter(lambda question: question['Answer'].lower() == self.searching_value.lower(), self.data))
+        return self.data.filter(Answer__lower=self.searching_value.lower())
 
     def SearchByOptions(self):
         """
-        Filter questions by options
+        Search questions by options
 
         Returns:
-            List: A list of questions matching the specified options
+            QuerySet: Questions whose options match the searched words, phrases or prefixes, most relevant first
         """
 
-        return list(filter(lambda question: self.searching_value.lower() in question['Options'].lower(), self.data))
+        return FullTextSearch(self.data, self.searching_value, ['OptionOne', 'OptionTwo', 'OptionThree', 'OptionFour'])
 
 
 class ReportFilter:
@@ -422,66 +481,52 @@ class ReportFilter:
 
     def __init__(self, searching_value):
         self.searching_value = searching_value
+        self.data = services.QueryReports()
 
     def SearchByUser(self):
         """
         Filter reports by user
 
         Returns:
-            List: A list of reports related to the specified user
+            QuerySet: Reports related to the specified user
         """
 
-        user = CustomUser.objects.filter(email=self.searching_value).first()
-        user = ReportQuestion.objects.filter(UserID=user).first()
-
-        if user:
-            return user
-
-        return []
+        return self.data.filter(UserID__email__lower=self.searching_value.lower())
 
     def SearchByQuestion(self):
         """
         Filter reports by question
 
         Returns:
-            List: A list of reports related to the specified question
+            QuerySet: Reports related to the specified question
         """
 
-        issues = []
-
-        for issue in ReportQuestion.objects.all():
-            if issue.QuestionID.Title.lower().strip() == self.searching_value.lower().strip():
-                issues.append(issue)
-
-        return issues
+        return self.data.filter(QuestionID__Title__lower=self.searching_value.strip().lower())
 
     def SearchByIssue(self):
         """
-        Filter reports by issue
+        Search reports by issue
 
         Returns:
-            List: A list of reports related to the specified issue
+            QuerySet: Reports whose issue matches the searched words, phrases or prefixes, most relevant first
         """
 
-        issues = []
-
-        for issue in ReportQuestion.objects.all():
-            if self.searching_value.lower() == issue.Issue.lower():
-                issues.append(issue)
-
-        return issues
+        return FullTextSearch(self.data, self.searching_value)
 
     def SearchByDate(self):
         """
         Filter reports by date
 
         Returns:
-            List: A list of reports related to the specified date
+            QuerySet: Reports related to the specified date
         """
 
-        date = datetime.datetime.strptime(self.searching_value, '%Y-%m-%d').date()
+        date = parse_date(self.searching_value)
 
-        return ReportQuestion.objects.filter(Date=date)
+        if date is None:
+            return self.data.none()
+
+        return self.data.filter(Date=date)
 
     def SearchByMarked(self, is_marked=True):
         """
@@ -491,10 +536,10 @@ class ReportFilter:
             is_marked (bool): If True, filter for marked reports; if False, filter for unmarked reports
 
         Returns:
-            List: A list of reports matching the specified marked status
+            QuerySet: Reports matching the specified marked status
         """
 
-        return ReportQuestion.objects.filter(IsMarked=is_marked)
+        return self.data.filter(IsMarked=is_marked)
 
 
 class FeedbackFilter:
@@ -504,48 +549,37 @@ class FeedbackFilter:
 
     def __init__(self, searching_value):
         self.searching_value = searching_value
+        self.data = services.QueryFeedbacks()
 
     def SearchByName(self):
         """
         Filter feedback by name
 
         Returns:
-            List: A list of feedback matching the specified name
+            QuerySet: Feedback matching the specified name
         """
 
-        feedbacks = []
-
-        for feedback in FeedBack.objects.all():
-            if self.searching_value.lower() == feedback.Name.lower():
-                feedbacks.append(feedback)
-
-        return feedbacks
+        return self.data.filter(Name__lower=self.searching_value.lower())
 
     def SearchByEmail(self):
         """
         Filter feedback by email
 
         Returns:
-            List: A list of feedback matching the specified email
+            QuerySet: Feedback matching the specified email
         """
 
-        return FeedBack.objects.filter(Email=self.searching_value)
+        return self.data.filter(Email__lower=self.searching_value.lower())
 
     def SearchByMessage(self):
         """
-        Filter feedback by message content
+        Search feedback by message content
 
         Returns:
-            List: A list of feedback matching the specified message content
+            QuerySet: Feedback whose message matches the searched words, phrases or prefixes, most relevant first
         """
 
-        feedbacks = []
-
-        for feedback in FeedBack.objects.all():
-            if self.searching_value.lower() == feedback.Message.lower():
-                feedbacks.append(feedback)
-
-        return feedbacks
+        return FullTextSearch(self.data, self.searching_value)
 
     def SearchByMarked(self, is_marked=True):
         """
@@ -555,19 +589,22 @@ class FeedbackFilter:
             is_marked (bool): If True, filter for marked feedback; if False, filter for unmarked feedback
 
         Returns:
-            List: A list of feedback matching the specified marked status
+            QuerySet: Feedback matching the specified marked status
         """
 
-        return FeedBack.objects.filter(IsMarked=is_marked)
+        return self.data.filter(IsMarked=is_marked)
 
     def SearchByDate(self):
         """
         Filter feedback by date
 
         Returns:
-            List: A list of feedback matching the specified date
+            QuerySet: Feedback matching the specified date
         """
 
-        date = datetime.datetime.strptime(self.searching_value, '%Y-%m-%d').date()
+        date = parse_date(self.searching_value)
+
+        if date is None:
+            return self.data.none()
 
-        return FeedBack.objects.filter(Date=date)
+        return self.data.filter(Date__date=date)
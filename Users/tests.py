@@ -1,3 +1,594 @@
-from django.test import TestCase
+import os
+import re
+import json
+import random
+import tempfile
+import datetime
+import unittest
+from collections import deque
+from django.db import connection, models
+from django.urls import reverse
+from django.core.cache import cache, caches
+from django.utils.timezone import now
+from django.core.management import call_command
+from django.http import QueryDict
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from .models import *
+from .analytics import StoredAfter, RefreshAnalytics, QUESTION_COUNTERS
+from .full_text import FullTextSearch, GetMissingTriggers, RebuildSearchIndexes
+from .results import ScorePaper, PackAnswers, UnpackAnswers, SKIPPED, UNKNOWN
+from .exam_store import GetExamSessionStore
+from .dashboard_stats import BuildDashboardStats
+from .paper_buffer import GetPaperBuffer, BuildPaper
+from .question_pool import GetPoolConfig, GetQuestionPools, MakeKey
+from .near_duplicates import FindNearDuplicates, LoadNearDuplicateIndex
+from .management.commands.StressResultSubmission import StressResultSubmission
+from .management.commands.PopulateQuestions import PopulateQuestions
+from api import services
 
-# Create your tests here.
+
+# A plan line reading "SCAN <table>" without "USING ... INDEX" walks the whole table
+FULL_SCAN = re.compile(r'\bSCAN (\w+)$')
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'Query plans are read with EXPLAIN QUERY PLAN of SQLite')
+class QueryPlanTests(TestCase):
+    """
+    Every filter run by the endpoints in api/views.py and by the hot admin
+    searches must be served by an index instead of a full table scan
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        programme = Programme.objects.create(Name='BCA')
+        subject = Subject.objects.create(ProgrammeID=programme, Name='Mathematics')
+
+        question = Questions.objects.create(
+                        SubjectID=subject,
+                        Title='What is the value of 2 + 2?',
+                        Answer='4',
+                        OptionOne='3',
+                        OptionTwo='4',
+                        OptionThree='5',
+                        OptionFour='22',
+                    )
+
+        user = CustomUser.objects.create_user('student@example.com', FullName='Student', Gender='male')
+        ResultsExtraDetails.objects.create(UserID=user, TestsTaken=1)
+        LeaderBoardStanding.objects.create(UserID=user, ProgrammeID=programme, TestsTaken=1, TotalCorrect=1, AverageScore=1)
+
+        exam = Exams.objects.create(UserID=user, ProgrammeID=programme, CorrectCounter=1, TotalQuestions=1)
+        report = ReportQuestion.objects.create(UserID=user, QuestionID=question, Issue='Two options are correct')
+        feedback = FeedBack.objects.create(Name='Student', Email=user.email, Message='Thanks')
+
+        email = user.email
+
+        cls.Queries = {
+            'api/users': services.QueryUsers(),
+            'api/users/<email>': services.QueryUsers(email),
+            'api/users/<id>': services.QueryUsers(str(user.id)),
+            'api/users_exams': services.QueryUsersExams(),
+            'api/users_exams_each_programmes/<email>': LeaderBoardStanding.objects.filter(UserID__email__lower=email.lower()),
+            'api/exams/<email>/<programme>': services.QueryExams(email, programme.Name),
+            'api/programmes/<name>': Programme.objects.filter(Name__lower=programme.Name.lower()),
+            'api/subject-programmes': services.QuerySubjectProgrammes(),
+            'api/subjects/<programme>': services.QuerySubjects(programme.Name),
+            'api/subjects/<programme>/<subject>': services.QuerySubjects(programme.Name, subject.Name),
+            'api/questions/<programme>/<subject>': services.QueryQuestionsPerSubject(programme.Name, subject.Name),
+            'api/analytics/questions/<programme>/<subject>': services.QueryQuestionStatistics(programme.Name, subject.Name),
+            'api/reports': services.QueryReports(),
+            'api/reports/<id>': services.QueryReports(str(report.ID)),
+            'api/reports/<email>': services.QueryReports(email),
+            'api/reports/<title>': services.QueryReports(question.Title),
+            'api/feedbacks': services.QueryFeedbacks(),
+            'api/histories/<id>': services.QueryHistories(str(user.id)),
+            'api/histories/<email>': services.QueryHistories(email),
+            'search exams by date': Exams.objects.filter(Date=exam.Date),
+            'dashboard recent results': Exams.objects.filter(UserID=user).order_by('-CreatedAt', '-ID'),
+            'analytics new answers': ResultSheet.objects.filter(ResultID__in=Exams.objects.filter(StoredAfter(exam.CreatedAt, exam.ID)).values('ID')),
+            'leaderboard': LeaderBoardStanding.objects.filter(ProgrammeID__Name__lower=programme.Name.lower()).order_by('-AverageScore'),
+            'search marked reports': services.QueryReports().filter(IsMarked=True),
+            'search marked feedbacks': services.QueryFeedbacks().filter(IsMarked=True),
+            'search feedbacks by email': services.QueryFeedbacks().filter(Email__lower=feedback.Email.lower()),
+        }
+
+    def test_filters_use_an_index(self):
+        for name, queryset in self.Queries.items():
+            with self.subTest(query=name):
+                plan = queryset[:100].explain()
+                full_scans = [match.group(1) for match in map(FULL_SCAN.search, plan.splitlines()) if match]
+
+                self.assertEqual(full_scans, [], f'Full table scan in the plan of {name}:\n{plan}')
+
+
+# The submissions are posted with the localhost host, only allowed by DEBUG outside of tests
+@override_settings(ALLOWED_HOSTS=['localhost'])
+class ConcurrentSubmissionTests(TransactionTestCase):
+    """
+    Exams of the same user submitted at the same time must each be counted
+    once by the F() expressions of CountExam and UpdateStanding
+    """
+
+    Submissions = 20
+    Workers = 8
+
+    def setUp(self):
+        programme = Programme.objects.create(Name='BCA')
+        subject = Subject.objects.create(ProgrammeID=programme, Name='Mathematics', TotalQuestionsToSelect=5)
+
+        for number in range(10):
+            Questions.objects.create(
+                SubjectID=subject,
+                Title=f'What is {number} + {number}?',
+                Answer=str(number * 2),
+                OptionOne=str(number * 2),
+                OptionTwo=str(number * 2 + 1),
+                OptionThree=str(number * 2 + 2),
+                OptionFour=str(number * 2 + 3),
+            )
+
+    def test_parallel_submissions_keep_every_increment(self):
+        stress = StressResultSubmission(self.Submissions, self.Workers, PaperSize=5)
+
+        for name, counted, expected in stress.Action(Keep=True):
+            with self.subTest(counter=name):
+                self.assertEqual(counted, expected)
+
+        standing = LeaderBoardStanding.objects.get()
+        self.assertAlmostEqual(standing.AverageScore, standing.TotalCorrect / self.Submissions)
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'Full-text search uses the FTS5 tables of SQLite')
+class FullTextSearchTests(TestCase):
+    """
+    The search index must not depend on the implicit rowid of the model
+    tables, which VACUUM and table rebuilds may renumber
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        subject = Subject.objects.create(ProgrammeID=Programme.objects.create(Name='BCA'), Name='Mathematics')
+
+        for number in range(6):
+            Questions.objects.create(
+                SubjectID=subject,
+                Title=f'Find the {number}. term of the sequence{number}',
+                Answer='1',
+                OptionOne='1',
+                OptionTwo='2',
+                OptionThree='3',
+                OptionFour='4',
+            )
+
+    def Search(self, text):
+        return [question.Title for question in FullTextSearch(Questions.objects.all(), text)]
+
+    def test_renumbered_rowids_keep_the_index(self):
+        Questions.objects.filter(Title__contains='sequence0').delete()
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'UPDATE {Questions._meta.db_table} SET rowid = rowid + 1000')
+
+        self.assertEqual(self.Search('sequence3'), ['Find the 3. term of the sequence3'])
+        self.assertEqual(self.Search('sequence0'), [])
+
+        Questions.objects.filter(Title__contains='sequence4').update(Title='Find the sum of the series')
+        Questions.objects.filter(Title__contains='sequence5').delete()
+
+        self.assertEqual(self.Search('series'), ['Find the sum of the series'])
+        self.assertEqual(self.Search('sequence4'), [])
+        self.assertEqual(self.Search('sequence5'), [])
+        self.assertEqual(len(self.Search('term')), 3)
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'Full-text search uses the FTS5 tables of SQLite')
+class SearchIndexMigrationTests(TransactionTestCase):
+    """
+    Migrations after 0037 must be able to remake the searchable tables,
+    the search triggers dropped with the old table are then restored
+    """
+
+    def Search(self, text):
+        return [question.Title for question in FullTextSearch(Questions.objects.all(), text)]
+
+    def test_alter_field_remakes_questions(self):
+        subject = Subject.objects.create(ProgrammeID=Programme.objects.create(Name='BCA'), Name='Mathematics')
+        Questions.objects.create(SubjectID=subject, Title='Find the sum of the series', Answer='1', OptionOne='1', OptionTwo='2', OptionThree='3', OptionFour='4')
+
+        old_field = Questions._meta.get_field('Title')
+        new_field = models.TextField(null=True)
+        new_field.set_attributes_from_name('Title')
+
+        # A nullable column cannot be altered in place by SQLite, the table is remade
+        with connection.schema_editor() as editor:
+            editor.alter_field(Questions, old_field, new_field)
+
+        try:
+            self.assertNotEqual(GetMissingTriggers(), [])
+
+            call_command('migrate', 'Users', verbosity=0)
+
+            self.assertEqual(GetMissingTriggers(), [])
+            self.assertEqual(self.Search('series'), ['Find the sum of the series'])
+
+            Questions.objects.create(SubjectID=subject, Title='Find the term of the sequence', Answer='1', OptionOne='1', OptionTwo='2', OptionThree='3', OptionFour='4')
+            self.assertEqual(self.Search('sequence'), ['Find the term of the sequence'])
+
+        finally:
+            with connection.schema_editor() as editor:
+                editor.alter_field(Questions, new_field, old_field)
+
+            RebuildSearchIndexes()
+
+class DetailedHistoryTests(TestCase):
+    """
+    A past exam must show the chosen option of each question, and the kept
+    text of an answer matching none of its options
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        subject = Subject.objects.create(ProgrammeID=Programme.objects.create(Name='BCA'), Name='Mathematics')
+
+        cls.Questions = [
+            Questions.objects.create(SubjectID=subject, Title=f'What is {number} + 2?', Answer=str(number + 2), OptionOne=str(number + 1), OptionTwo=str(number + 2), OptionThree=str(number + 3), OptionFour=str(number + 4))
+            for number in range(3)
+        ]
+        cls.User = CustomUser.objects.create_user('student@example.com', FullName='Student', Gender='male')
+
+        cls.Exam = Exams.objects.create(UserID=cls.User, ProgrammeID=subject.ProgrammeID, CorrectCounter=1, TotalQuestions=3)
+        paper, answers, unknown_answers = PackAnswers([(cls.Questions[0].ID, 2, '2'), (cls.Questions[1].ID, SKIPPED, '-'), (cls.Questions[2].ID, UNKNOWN, 'Four')])
+        ResultSheet.objects.create(ResultID=cls.Exam, Paper=paper, Answers=answers, UserAnswers=unknown_answers)
+
+    def test_answers(self):
+        self.client.force_login(self.User)
+        questions = self.client.get(reverse('detailed-history', args=[self.Exam.Slug])).context['questions']
+
+        self.assertEqual([(details['UserAnswer'], details['is_correct']) for details in questions], [('2', True), ('-', False), ('Four', False)])
+        self.assertEqual(ResultSheet.objects.get().UserAnswers, 'Four')
+
+
+class ResultSubmissionTests(TestCase):
+    """
+    A submitted paper must be stored even when one of its questions was
+    deleted during the exam, the others keeping their numbering
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        subject = Subject.objects.create(ProgrammeID=Programme.objects.create(Name='BCA'), Name='Mathematics')
+
+        cls.Questions = [
+            Questions.objects.create(SubjectID=subject, Title=f'What is {number} + {number}?', Answer=str(number * 2), OptionOne=str(number * 2), OptionTwo='a', OptionThree='b', OptionFour='c')
+            for number in range(3)
+        ]
+        cls.User = CustomUser.objects.create_user('student@example.com', FullName='Student', Gender='male')
+        ResultsExtraDetails.objects.create(UserID=cls.User)
+
+    def test_deleted_question_is_skipped(self):
+        store = GetExamSessionStore()
+        attempt_key = store.Create(
+            {
+                'UserID': str(self.User.id),
+                'Programme': 'BCA',
+                'Questions': [question.ID.hex for question in self.Questions],
+                'ChoiceOrders': ['0123'] * len(self.Questions),
+            }
+        )
+
+        self.Questions[1].delete()
+
+        self.client.force_login(self.User)
+        response = self.client.post(reverse('get-result'), {'attempt': attempt_key, 'choices 1': '1', 'choices 2': '2', 'choices 3': '1'})
+
+        exam = Exams.objects.get()
+        answers = UnpackAnswers(exam.resultsheet)
+
+        self.assertRedirects(response, reverse('detailed-history', args=[exam.Slug]), fetch_redirect_response=False)
+        self.assertEqual((exam.CorrectCounter, exam.TotalQuestions), (2, 2))
+        self.assertEqual([question_id for question_id, _, _ in answers], [self.Questions[0].ID, self.Questions[2].ID])
+        self.assertIsNone(store.Get(attempt_key))
+
+class PaperBufferTests(TestCase):
+    """
+    Buffered papers must be dropped only once a change of the questions is
+    committed, and only programmes of the catalog may be buffered
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        subject = Subject.objects.create(ProgrammeID=Programme.objects.create(Name='BCA'), Name='Mathematics')
+
+        cls.Question = Questions.objects.create(SubjectID=subject, Title='What is 2 + 2?', Answer='4', OptionOne='3', OptionTwo='4', OptionThree='5', OptionFour='6')
+        cls.User = CustomUser.objects.create_user('student@example.com', FullName='Student', Gender='male')
+
+    def setUp(self):
+        cache.clear()
+        self.Buffer = GetPaperBuffer()
+        self.Buffer.Clear()
+
+    def test_edited_question_clears_the_buffer_on_commit(self):
+        self.Buffer.papers['BCA'] = deque([[]])
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            Questions.objects.filter(ID=self.Question.ID).get().save()
+
+            self.assertEqual(len(self.Buffer.papers['BCA']), 1)
+
+        for callback in callbacks:
+            callback()
+
+        self.assertNotIn('BCA', self.Buffer.papers)
+
+    def test_unknown_programme_is_not_found(self):
+        self.client.force_login(self.User)
+
+        self.assertEqual(self.client.get(reverse('model-test', args=['Unknown'])).status_code, 404)
+        self.assertNotIn('Unknown', self.Buffer.Stats())
+
+
+class DashboardStatsTests(TestCase):
+    """
+    The series of recent exams must follow the time the exams were stored,
+    also between exams of the same day
+    """
+
+    def test_same_day_exams_keep_their_order(self):
+        programme = Programme.objects.create(Name='BCA')
+        user = CustomUser.objects.create_user('student@example.com', FullName='Student', Gender='male')
+        start = datetime.datetime(2026, 10, 18, 9, tzinfo=datetime.timezone.utc)
+
+        # Stored in another order than they were taken
+        for hour, correct in [(3, 3), (1, 1), (4, 4), (2, 2)]:
+            Exams.objects.create(UserID=user, ProgrammeID=programme, CorrectCounter=correct, TotalQuestions=5, Date=start.date(), CreatedAt=start + datetime.timedelta(hours=hour))
+
+        stats = BuildDashboardStats(user.id, WINDOW=3, POINTS=10)
+
+        self.assertEqual([(point['first'], point['correct']) for point in stats['series']], [(2, 2), (3, 3), (4, 4)])
+
+
+class AnalyticsRefreshTests(TestCase):
+    """
+    Folding the answers of new exams into the stored statistics must give
+    the same statistics as recounting every answer
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.Programme = Programme.objects.create(Name='BCA')
+        cls.User = CustomUser.objects.create_user('student@example.com', FullName='Student', Gender='male')
+        cls.Questions = []
+
+        for subject_name in ['Mathematics', 'English']:
+            subject = Subject.objects.create(ProgrammeID=cls.Programme, Name=subject_name)
+
+            for number in range(4):
+                cls.Questions.append(
+                    Questions.objects.create(SubjectID=subject, Title=f'{subject_name} {number}', Answer='a', OptionOne='a', OptionTwo='b', OptionThree='c', OptionFour='d')
+                )
+
+    def TakeExams(self, count, created_at, seed):
+        rng = random.Random(seed)
+
+        for _ in range(count):
+            answers = []
+
+            for question in rng.sample(self.Questions, 5):
+                option = rng.choice([SKIPPED, 1, 2, 3, 4, UNKNOWN])
+                answers.append((question.ID, option, '-' if option == SKIPPED else 'text'))
+
+            exam = Exams.objects.create(UserID=self.User, ProgrammeID=self.Programme, CreatedAt=created_at)
+            paper, answers, user_answers = PackAnswers(answers)
+            ResultSheet.objects.create(ResultID=exam, Paper=paper, Answers=answers, UserAnswers=user_answers)
+
+    def GetStatistics(self):
+        return (
+            list(QuestionStatistics.objects.order_by('QuestionID').values('QuestionID', 'SubjectID', 'Difficulty', *QUESTION_COUNTERS)),
+            list(SubjectStatistics.objects.order_by('SubjectID').values('SubjectID', 'TimesAnswered', 'TimesCorrect', 'TimesSkipped', 'Accuracy')),
+        )
+
+    def test_incremental_refresh_matches_rebuild(self):
+        an_hour_ago = now() - datetime.timedelta(hours=1)
+
+        self.TakeExams(6, an_hour_ago, seed=1)
+        self.assertTrue(RefreshAnalytics()['rebuild'])
+
+        self.TakeExams(4, an_hour_ago + datetime.timedelta(minutes=1), seed=2)
+        refresh = RefreshAnalytics()
+
+        self.assertEqual((refresh['rebuild'], refresh['exams']), (False, 4))
+
+        folded = self.GetStatistics()
+        RefreshAnalytics(rebuild=True)
+
+        self.assertEqual(folded, self.GetStatistics())
+
+    def test_exams_inside_the_lag_wait_for_the_next_refresh(self):
+        current_time = now()
+
+        self.TakeExams(2, current_time - datetime.timedelta(minutes=10), seed=1)
+        self.TakeExams(3, current_time - datetime.timedelta(seconds=10), seed=2)
+
+        with override_settings(ANALYTICS={'LAG': 60}):
+            self.assertEqual(RefreshAnalytics()['exams'], 2)
+            self.assertEqual(RefreshAnalytics()['exams'], 0)
+
+        with override_settings(ANALYTICS={'LAG': 0}):
+            self.assertEqual(RefreshAnalytics()['exams'], 3)
+
+        self.assertEqual(sum(row['TimesAnswered'] for row in QuestionStatistics.objects.values('TimesAnswered')), 25)
+
+
+class NearDuplicateTests(TestCase):
+    """
+    Reworded questions and questions with reordered options must be flagged
+    as near-duplicates within their subject, questions only sharing a
+    template title must not
+    """
+
+    Title = 'Which of the following is the largest planet in our solar system?'
+    Options = ['Jupiter', 'Saturn', 'Earth', 'Mars']
+
+    @classmethod
+    def setUpTestData(cls):
+        programme = Programme.objects.create(Name='BCA')
+
+        cls.Subject = Subject.objects.create(ProgrammeID=programme, Name='Science')
+        cls.OtherSubject = Subject.objects.create(ProgrammeID=programme, Name='English')
+
+        cls.Planet = cls.AddQuestion(cls.Subject, cls.Title, cls.Options)
+        cls.OddOneOut = cls.AddQuestion(cls.Subject, 'Choose the odd one out', ['Apple', 'Banana', 'Mango', 'Carrot'])
+
+    @classmethod
+    def AddQuestion(cls, subject, title, options):
+        return Questions.objects.create(SubjectID=subject, Title=title, Answer=options[0], OptionOne=options[0], OptionTwo=options[1], OptionThree=options[2], OptionFour=options[3])
+
+    def setUp(self):
+        # A new catalog version reloads the index of the process
+        cache.clear()
+
+    def Find(self, subject, title, options):
+        return [question for question, _ in FindNearDuplicates(subject.ID, title, options)]
+
+    def test_reworded_title_is_flagged(self):
+        self.assertEqual(self.Find(self.Subject, 'Which one of the following is the largest planet of the solar system?', self.Options), [self.Planet])
+
+    def test_reordered_options_are_flagged(self):
+        self.assertEqual(self.Find(self.Subject, self.Title, ['Mars', 'Earth', 'Jupiter', 'Saturn']), [self.Planet])
+
+    def test_template_title_is_not_flagged(self):
+        self.assertEqual(self.Find(self.Subject, 'Choose the odd one out', ['Dog', 'Cat', 'Cow', 'Rose']), [])
+
+    def test_other_subject_is_ignored(self):
+        self.assertEqual(self.Find(self.OtherSubject, self.Title, self.Options), [])
+
+    def test_clusters(self):
+        copy = self.AddQuestion(self.Subject, self.Title.upper(), list(reversed(self.Options)))
+        self.AddQuestion(self.Subject, 'Choose the odd one out', ['Dog', 'Cat', 'Cow', 'Rose'])
+        self.AddQuestion(self.OtherSubject, self.Title, self.Options)
+
+        clusters = LoadNearDuplicateIndex().Clusters()
+
+        self.assertEqual([sorted(cluster) for cluster in clusters], [sorted([self.Planet.ID, copy.ID])])
+
+    def test_populate_questions_counts_near_duplicates(self):
+        records = [
+            {'question': 'Which one of the following is the largest planet of the solar system?', 'choices': self.Options},
+            {'question': 'What is the capital of Nepal?', 'choices': ['Kathmandu', 'Pokhara', 'Lalitpur', 'Biratnagar']},
+        ]
+
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+            json.dump([{**record, 'answer': record['choices'][0], 'programme': 'BCA', 'subject': 'Science', 'TotalQuestionsToSelect': 2} for record in records], f)
+
+        self.addCleanup(os.remove, f.name)
+
+        for skip, inserted in [(True, 1), (False, 2)]:
+            with self.subTest(skip_near_duplicates=skip):
+                stats = PopulateQuestions(f.name, SkipNearDuplicates=skip).Action()
+
+                self.assertEqual((stats['near_duplicates'], stats['inserted']), (1, inserted))
+
+                Questions.objects.exclude(ID__in=[self.Planet.ID, self.OddOneOut.ID]).delete()
+
+
+class QuestionPoolTests(TestCase):
+    """
+    Papers must be sampled from the pool of each subject, which is dropped
+    only once a change of its questions is committed
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        programme = Programme.objects.create(Name='BCA')
+        cls.Subjects = []
+
+        for subject_name, total_questions_to_select in [('Mathematics', 4), ('English', 2)]:
+            subject = Subject.objects.create(ProgrammeID=programme, Name=subject_name, TotalQuestionsToSelect=total_questions_to_select)
+            cls.Subjects.append(subject)
+
+            for number in range(6):
+                Questions.objects.create(SubjectID=subject, Title=f'{subject_name} {number}', Answer='a', OptionOne='a', OptionTwo='b', OptionThree='c', OptionFour='d')
+
+        cls.User = CustomUser.objects.create_user('student@example.com', FullName='Student', Gender='male')
+
+    def setUp(self):
+        cache.clear()
+
+    def IsCached(self, subject):
+        return caches[GetPoolConfig()['CACHE']].get(MakeKey(subject.ID)) is not None
+
+    def test_paper_samples_distinct_questions_of_each_subject(self):
+        for _ in range(10):
+            paper = BuildPaper('BCA')
+            question_ids = [value['id'] for value in paper]
+
+            self.assertEqual(len(set(question_ids)), len(question_ids))
+
+            for subject in self.Subjects:
+                with self.subTest(subject=subject.Name):
+                    picked = Questions.objects.filter(ID__in=question_ids, SubjectID=subject).count()
+                    self.assertEqual(picked, subject.TotalQuestionsToSelect)
+
+    def test_specific_test_serves_distinct_questions_of_its_subject(self):
+        self.client.force_login(self.User)
+
+        questions = self.client.get('/model-test/BCA/English').context['questions']
+        question_ids = {value['id'] for value in questions}
+
+        self.assertEqual(len(question_ids), len(questions))
+        self.assertEqual(question_ids, set(Questions.objects.filter(SubjectID=self.Subjects[1]).values_list('ID', flat=True)))
+
+    def test_pool_is_dropped_on_commit(self):
+        subject, other_subject = self.Subjects
+        question = Questions.objects.filter(SubjectID=subject).first()
+
+        for name, change in [('save', question.save), ('delete', question.delete)]:
+            with self.subTest(change=name):
+                GetQuestionPools([subject.ID, other_subject.ID])
+
+                with self.captureOnCommitCallbacks() as callbacks:
+                    change()
+
+                    self.assertTrue(self.IsCached(subject))
+
+                for callback in callbacks:
+                    callback()
+
+                self.assertFalse(self.IsCached(subject))
+                self.assertTrue(self.IsCached(other_subject))
+
+
+class ScorePaperTests(SimpleTestCase):
+    """
+    Only the values of the option inputs, '1' to '4', may answer a question
+    """
+
+    def Score(self, submitted):
+        values = [
+            {
+                'number': 1,
+                'choices': ['4', '3', '5', '6'],
+                'answer': '4',
+                'option_order': [1, 0, 2, 3],
+            }
+        ]
+        form = QueryDict(mutable=True)
+
+        if submitted is not None:
+            form['choices 1'] = submitted
+
+        return ScorePaper(values, form), values[0]
+
+    def test_submitted_options(self):
+        for submitted, option, correct_counter in [('1', 2, 1), ('2', 1, 0), ('4', 4, 0), (None, SKIPPED, 0)]:
+            with self.subTest(submitted=submitted):
+                counted, value = self.Score(submitted)
+
+                self.assertEqual((counted, value['option']), (correct_counter, option))
+
+    def test_invalid_options_are_skipped(self):
+        for submitted in ['0', '-1', '5', 'a', '1.0', ' 1', '']:
+            with self.subTest(submitted=submitted):
+                counted, value = self.Score(submitted)
+
+                self.assertEqual((counted, value['UserAnswer'], value['option'], value['is_correct']), (0, '-', SKIPPED, False))
@@ -0,0 +1,487 @@
+import time
+import random
+import hashlib
+import threading
+from collections import OrderedDict, Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from django.db import connections, transaction
+from django.conf import settings
+from django.core.cache import caches
+from django.dispatch import receiver
+from django.core.signals import setting_changed
+from django.db.models.signals import post_save, post_delete
+from .models import *
+
+
+DEFAULT_TIERED_CACHE = {
+    'ENABLED': True,
+    'CACHE': 'default',
+    'TTL': 60,
+    'STALE': 5 * 60,
+    'JITTER': 0.1,
+    'LOCAL_TTL': 5,
+    'LOCAL_MAX_ENTRIES': 1000,
+    'LOCK_TIMEOUT': 30,
+    'WORKERS': 2,
+    'NAMESPACES': {},
+}
+
+KEY_PREFIX = 'tiered'
+
+# Namespaces serving rows of each model, invalidated whenever one of its rows is written. The
+# leaderboard shows the name, profile image and admin status of users besides their standings
+INVALIDATED_BY = {
+    CustomUser: ['leaderboard', 'api-lists'],
+    Exams: ['leaderboard', 'api-lists'],
+    Questions: ['api-lists'],
+    ReportQuestion: ['api-lists'],
+    FeedBack: ['api-lists'],
+}
+
+# Saves of only these fields change nothing served by a namespace, e.g. the last_login of every sign-in
+IGNORED_UPDATE_FIELDS = {'last_login'}
+
+# Longer keys, e.g. URLs with a cursor, are hashed to stay within the limits of memcached
+MAX_KEY_LENGTH = 200
+POLL_INTERVAL = 0.05
+
+_namespaces = {}
+_namespaces_lock = threading.Lock()
+_executor = None
+
+
+def GetTieredCacheConfig(name):
+    config = {**DEFAULT_TIERED_CACHE, **getattr(settings, 'TIERED_CACHE', {})}
+
+    return {**config, **config['NAMESPACES'].get(name, {})}
+
+
+def GetExecutor(workers):
+    global _executor
+
+    with _namespaces_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='tiered-cache')
+
+    return _executor
+
+
+class TieredCache:
+    """
+    Values computed on demand and kept in two tiers: a bounded LRU in the
+    memory of the process, in front of a Django cache shared by every process
+
+    A value is fresh for TTL seconds, give or take JITTER, so that values
+    computed together do not expire together. For STALE seconds more it is
+    still served while one background thread recomputes it. A missing value
+    is computed by a single caller, in this process and across processes;
+    the others wait for its result. Shared keys include the version of the
+    namespace, so Invalidate drops every value at once. The memory tier only
+    keeps values for LOCAL_TTL seconds, which bounds how long a deleted or
+    invalidated value stays visible in other processes. A disabled cache
+    computes the value on every call
+    """
+
+    def __init__(self, name, ENABLED=True, CACHE='default', TTL=60, STALE=5 * 60, JITTER=0.1, LOCAL_TTL=5,
+                 LOCAL_MAX_ENTRIES=1000, LOCK_TIMEOUT=30, WORKERS=2, **options):
+        self.name = name
+        self.enabled = ENABLED
+        self.cache = caches[CACHE]
+        self.ttl = TTL
+        self.stale = STALE
+        self.jitter = JITTER
+        self.local_ttl = LOCAL_TTL
+        self.local_max_entries = LOCAL_MAX_ENTRIES
+        self.lock_timeout = LOCK_TIMEOUT
+        self.workers = WORKERS
+
+        self.lock = threading.Lock()
+        self.local = OrderedDict()
+        self.inflight = {}
+        self.version = None
+
+        self.counters = Counter()
+        self.compute_seconds = 0.0
+        self.compute_max = 0.0
+
+    def MakeKey(self, key, version):
+        if len(key) > MAX_KEY_LENGTH:
+            key = hashlib.sha256(key.encode()).hexdigest()
+
+        return f'{KEY_PREFIX}:{self.name}:{version}:{key}'
+
+    def MakeVersionKey(self):
+        return f'{KEY_PREFIX}:{self.name}:version'
+
+    def GetVersion(self):
+        """
+        Return the current version of the namespace, shared by every process through the cache
+
+        A version missing from the cache restarts from the clock, so that a
+        version lost to eviction is never reused
+
+        Returns:
+            int: The version
+        """
+
+        version_key = self.MakeVersionKey()
+        version = self.cache.get(version_key)
+
+        if version is None:
+            version = time.time_ns()
+
+            if not self.cache.add(version_key, version, None):
+                version = self.cache.get(version_key, version)
+
+        self.SeeVersion(version)
+
+        return version
+
+    def SeeVersion(self, version):
+        # Values of the memory tier stored under another version are not served anymore
+        with self.lock:
+            if version != self.version:
+                self.version = version
+                self.local.clear()
+
+    def Count(self, counter, amount=1):
+        with self.lock:
+            self.counters[counter] += amount
+
+    def ReadLocal(self, key, current_time):
+        with self.lock:
+            stored = self.local.get(key)
+
+            if stored is None:
+                return None
+
+            entry, local_until, version = stored
+
+            if current_time >= local_until or version != self.version:
+                del self.local[key]
+                return None
+
+            self.local.move_to_end(key)
+
+            return entry
+
+    def WriteLocal(self, key, version, entry, current_time):
+        with self.lock:
+            # A value computed before an invalidation is not kept
+            if version != self.version:
+                return
+
+            self.local[key] = (entry, min(current_time + self.local_ttl, entry[2]), version)
+            self.local.move_to_end(key)
+
+            while len(self.local) > self.local_max_entries:
+                self.local.popitem(last=False)
+
+    def Store(self, key, version, value):
+        """
+        Save a freshly computed value in both tiers
+
+        The value is stored under the version read before computing it, so a
+        value computed while the namespace was invalidated is never served
+        as part of the new version
+
+        Returns:
+            tuple: The stored (value, fresh until, stale until) entry
+        """
+
+        current_time = time.time()
+        fresh_until = current_time + self.ttl * random.uniform(1 - self.jitter, 1 + self.jitter)
+        entry = (value, fresh_until, fresh_until + self.stale)
+
+        self.cache.set(self.MakeKey(key, version), entry, max(1, int(entry[2] - current_time)))
+        self.WriteLocal(key, version, entry, current_time)
+
+        return entry
+
+    def Get(self, key, compute):
+        """
+        Return the value of a key, computing it when missing
+
+        Parameters:
+            key (str): Key of the value within the namespace
+            compute (callable): Computes the value, called without arguments
+
+        Returns:
+            The cached or computed value
+        """
+
+        if not self.enabled:
+            return compute()
+
+        current_time = time.time()
+        local_version = self.version
+        entry = self.ReadLocal(key, current_time)
+
+        if entry is not None and current_time < entry[1]:
+            self.Count('local_hits')
+            return entry[0]
+
+        version = self.GetVersion()
+        shared_entry = self.cache.get(self.MakeKey(key, version))
+
+        if shared_entry is not None:
+            entry = shared_entry
+            self.WriteLocal(key, version, entry, current_time)
+
+            if current_time < entry[1]:
+                self.Count('shared_hits')
+                return entry[0]
+
+        elif entry is not None and local_version != version:
+            # The stale value of the memory tier belongs to an older version
+            entry = None
+
+        if entry is not None:
+            self.Count('stale_hits')
+            self.ScheduleRefresh(key, version, compute, entry[0])
+
+            return entry[0]
+
+        self.Count('misses')
+
+        return self.ComputeOnce(key, version, compute)
+
+    def ComputeOnce(self, key, version, compute):
+        """
+        Compute a missing value, or wait for the thread already computing it
+        """
+
+        with self.lock:
+            future = self.inflight.get((key, version))
+            is_owner = future is None
+
+            if is_owner:
+                future = self.inflight[(key, version)] = Future()
+
+        if not is_owner:
+            self.Count('waits')
+            return future.result(timeout=self.lock_timeout)
+
+        try:
+            value = self.ComputeShared(key, version, compute, wait=True)
+            future.set_result(value)
+
+            return value
+
+        except Exception as error:
+            future.set_exception(error)
+            raise
+
+        finally:
+            with self.lock:
+                self.inflight.pop((key, version), None)
+
+    def ComputeShared(self, key, version, compute, wait):
+        """
+        Compute a value unless another process is already computing it
+
+        Parameters:
+            key (str): Key of the value within the namespace
+            version (int): Version of the namespace read before computing
+            compute (callable): Computes the value
+            wait (bool): Wait for the value of the other process instead of skipping
+
+        Returns:
+            The value, or None when skipped
+        """
+
+        shared_key = self.MakeKey(key, version)
+        lock_key = f'{shared_key}:lock'
+        is_locked = self.cache.add(lock_key, 1, self.lock_timeout)
+
+        if not is_locked:
+            if not wait:
+                return None
+
+            deadline = time.time() + self.lock_timeout
+
+            while time.time() < deadline:
+                time.sleep(POLL_INTERVAL)
+                entry = self.cache.get(shared_key)
+
+                if entry is not None and time.time() < entry[1]:
+                    self.WriteLocal(key, version, entry, time.time())
+                    return entry[0]
+
+            # The other process took too long, compute it here as well
+
+        try:
+            start = time.perf_counter()
+            value = compute()
+            elapsed = time.perf_counter() - start
+
+            with self.lock:
+                self.counters['computes'] += 1
+                self.compute_seconds += elapsed
+                self.compute_max = max(self.compute_max, elapsed)
+
+            self.Store(key, version, value)
+
+            return value
+
+        finally:
+            if is_locked:
+                self.cache.delete(lock_key)
+
+    def ScheduleRefresh(self, key, version, compute, stale_value):
+        with self.lock:
+            if (key, version) in self.inflight:
+                return
+
+            future = self.inflight[(key, version)] = Future()
+
+        GetExecutor(self.workers).submit(self.Refresh, key, version, compute, stale_value, future)
+
+    def Refresh(self, key, version, compute, stale_value, future):
+        """
+        Recompute a stale value, runs on a worker thread
+
+        Callers waiting meanwhile get the stale value when the refresh is
+        skipped or fails
+        """
+
+        try:
+            value = self.ComputeShared(key, version, compute, wait=False)
+            self.Count('refreshes' if value is not None else 'skipped_refreshes')
+
+            future.set_result(stale_value if value is None else value)
+
+        except Exception:
+            self.Count('errors')
+            future.set_result(stale_value)
+
+        finally:
+            with self.lock:
+                self.inflight.pop((key, version), None)
+
+            connections.close_all()
+
+    def Delete(self, key):
+        """
+        Drop a value from the shared tier and from the memory of this process
+        """
+
+        self.cache.delete(self.MakeKey(key, self.GetVersion()))
+
+        with self.lock:
+            self.local.pop(key, None)
+
+    def Invalidate(self):
+        """
+        Start a new version of the namespace, so that every value is computed again
+
+        Values of the old version are left to expire in the shared tier
+        """
+
+        version_key = self.MakeVersionKey()
+
+        try:
+            version = self.cache.incr(version_key)
+
+        except ValueError:
+            version = time.time_ns()
+            self.cache.set(version_key, version, None)
+
+        self.SeeVersion(version)
+        self.Count('invalidations')
+
+    def Stats(self):
+        """
+        Return the counters of the namespace in this process
+
+        Returns:
+            dict: The hits of each tier, stale hits, misses, computes and their latency
+        """
+
+        with self.lock:
+            counters = dict(self.counters)
+            computes = counters.get('computes', 0)
+            local_entries = len(self.local)
+
+        requests = sum(counters.get(counter, 0) for counter in ['local_hits', 'shared_hits', 'stale_hits', 'misses'])
+        hits = requests - counters.get('misses', 0)
+
+        return {
+            **counters,
+            'local_entries': local_entries,
+            'hit_rate': hits / requests if requests else 0.0,
+            'compute_ms_mean': 1000 * self.compute_seconds / computes if computes else 0.0,
+            'compute_ms_max': 1000 * self.compute_max,
+        }
+
+
+def GetTieredCache(name):
+    """
+    Return the cache of a namespace, configured by the TIERED_CACHE setting
+
+    Parameters:
+        name (str): Name of the namespace, its options are read from TIERED_CACHE['NAMESPACES']
+
+    Returns:
+        TieredCache: The cache shared by every caller of the process
+    """
+
+    with _namespaces_lock:
+        if name not in _namespaces:
+            _namespaces[name] = TieredCache(name, **GetTieredCacheConfig(name))
+
+        return _namespaces[name]
+
+
+def InvalidateTieredCache(*names):
+    """
+    Drop every value of the given namespaces, in every process
+
+    Parameters:
+        *names (str): Names of the namespaces
+    """
+
+    for name in names:
+        GetTieredCache(name).Invalidate()
+
+
+@receiver(setting_changed)
+def reset_tiered_caches(setting, **kwargs):
+    """
+    Signal receiver dropping the namespaces when their settings change, e.g. under override_settings
+    """
+
+    if setting in ['TIERED_CACHE', 'CACHES']:
+        with _namespaces_lock:
+            _namespaces.clear()
+
+
+def GetTieredCacheStats():
+    with _namespaces_lock:
+        namespaces = dict(_namespaces)
+
+    return {name: cache.Stats() for name, cache in namespaces.items()}
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_save, sender=Exams)
+@receiver(post_save, sender=Questions)
+@receiver(post_save, sender=ReportQuestion)
+@receiver(post_save, sender=FeedBack)
+@receiver(post_delete, sender=CustomUser)
+@receiver(post_delete, sender=Exams)
+@receiver(post_delete, sender=Questions)
+@receiver(post_delete, sender=ReportQuestion)
+@receiver(post_delete, sender=FeedBack)
+def invalidate_tiered_caches(sender, instance, update_fields=None, **kwargs):
+    """
+    Signal receiver invalidating the namespaces serving the rows of a model once a change is committed
+
+    Invalidated earlier, a value computed in the meantime would be cached again without the change
+    """
+
+    if update_fields and update_fields <= IGNORED_UPDATE_FIELDS:
+        return
+
+    names = INVALIDATED_BY[sender]
+    transaction.on_commit(lambda: InvalidateTieredCache(*names))
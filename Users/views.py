@@ -1,8 +1,8 @@
 import re
 import json
+import uuid
 import random
 import datetime
-import requests
 from django.http import Http404
 from django.contrib import messages
 from django.shortcuts import render, redirect
@@ -13,23 +13,29 @@ from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
 from django.contrib.auth import update_session_auth_hash, get_user_model
 from .models import *
 from .search import *
+from .exam_store import GetExamSessionStore
+from .results import ScorePaper, SaveResult, UnpackAnswers, GetUserAnswer
+from .question_pool import SampleQuestions
+from .paper_buffer import BuildPaper, GetPaperBuffer
+from .dashboard_stats import GetDashboardStats
+from .tiered_cache import GetTieredCache
+from .near_duplicates import FindNearDuplicates
+from api import services
+from api.serializers import *
 
 
-URL_NEXT = None
-SEARCH_USER_ID = None
-SEARCH_SUBJECT = None
-SEARCH_PROGRAMME = None
 uuid_pattern = r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$'
 
 
-def PaginatePage(request, data, number_of_data=100):
+def PaginatePage(request, data, number_of_data=100, serializer=None):
     """
     Paginate a page of data based on the specified parameters
 
     Parameters:
         request (Request): The HTTP request object
-        data: The data to be paginated
+        data: The data to be paginated, either a list or a queryset
         number_of_data (int): Optional. The number of data items to display per page. Default is 100
+        serializer: Optional. If provided, only the items of the requested page are serialized with it
     """
 
     page = int(request.GET.get('pages', 1))
@@ -46,9 +52,30 @@ def PaginatePage(request, data, number_of_data=100):
         page = paginator.num_pages
         data = paginator.page(paginator.num_pages)
 
+    if serializer is not None:
+        data.object_list = serializer(data.object_list, many=True).data
+
     return paginator, data, page
 
 
+def PageQuery(request, page):
+    """
+    Build the query string of another page of the current list, keeping the search and its scope
+
+    Parameters:
+        request (HttpRequest): The HTTP request object
+        page (int): The page number to link to
+
+    Returns:
+        str: The query string, without the leading '?'
+    """
+
+    query = request.GET.copy()
+    query['pages'] = page
+
+    return query.urlencode()
+
+
 def SignUp(request):
     """
     Handle user sign-up requests
@@ -109,12 +136,10 @@ def Login(request):
     Handle user login functionality
     """
 
-    global URL_NEXT
-
     url_next = request.GET.get('next', None)
 
     if url_next:
-        URL_NEXT = url_next.strip('/')
+        request.session['url-next'] = url_next.strip('/')
 
     if request.user.is_superuser:
         return redirect('admin-index')
@@ -132,18 +157,20 @@ def Login(request):
             if remember_me is False:
                 request.session.set_expiry(0)
 
+            url_next = request.session.pop('url-next', None)
+
             if user.is_superuser:
                 return redirect('admin-index')
 
-            if URL_NEXT is None:
+            if url_next is None:
                 return redirect('user-dashboard')
 
-            slug = re.search(uuid_pattern, URL_NEXT)
+            slug = re.search(uuid_pattern, url_next)
 
             if slug:
                 return redirect("detailed-history", slug=slug.group())
 
-            return redirect(URL_NEXT)
+            return redirect(url_next)
 
         else:
             messages.error(request, 'Email and Password did not match')
@@ -197,40 +224,99 @@ def Index(request):
             )
 
 
+def GetPaperValues(attempt):
+    """
+    Rebuild the questions of a paper stored in the exam session store
+
+    Parameters:
+        attempt (dict): The attempt returned by the exam session store
+
+    Returns:
+        List: The details of each question in the order they were asked, 'number' being its position in the paper
+    """
+
+    questions = Questions.objects.in_bulk(attempt['Questions'])
+    values = []
+
+    for number, (question_id, choice_order) in enumerate(zip(attempt['Questions'], attempt['ChoiceOrders']), 1):
+        question = questions.get(uuid.UUID(question_id))
+
+        # Deleted since the exam was started
+        if question is None:
+            continue
+
+        choices = [question.OptionOne, question.OptionTwo, question.OptionThree, question.OptionFour]
+
+        details = {
+            'id': question.ID,
+            'title': question.Title,
+            'choices': [choices[int(index)] for index in choice_order],
+            'answer': question.Answer,
+            'checked': False,
+            'option_order': [int(index) for index in choice_order],
+            'number': number,
+        }
+
+        if attempt['Programme']:
+            details['program'] = attempt['Programme']
+
+        values.append(details)
+
+    return values
+
+
+def StartAttempt(request, programme, question_ids, choice_orders):
+    """
+    Save a new paper in the exam session store for the current user
+
+    Parameters:
+        request (HttpRequest): The HTTP request object
+        programme (str): Name of the programme of the paper or None
+        question_ids (list): IDs of the questions of the paper in the order they are asked
+        choice_orders (list): The order of the options of each question
+
+    Returns:
+        str: The key of the stored attempt
+    """
+
+    attempt_key = GetExamSessionStore().Create(
+        {
+            'UserID': str(request.user.id),
+            'Programme': programme,
+            'Questions': [question_id.hex for question_id in question_ids],
+            'ChoiceOrders': choice_orders,
+        }
+    )
+
+    request.session['exam-attempt'] = attempt_key
+
+    return attempt_key
+
+
 def TakeModelTest(request, program):
     """
     Render a model test page for a specified program
     """
 
-    global model_test_values
-
     if request.user.is_superuser:
         return redirect('admin-index')
 
-    model_test_values = []
-    programme = Programme.objects.filter(Name=program)[0]
-
-    for subject in Subject.objects.filter(ProgrammeID=programme):
-        questions = list(Questions.objects.filter(SubjectID=subject))
-        random.shuffle(questions)
+    # Only the programmes of the catalog are buffered and built
+    if program not in [programme['Name'] for programme in services.GetProgrammes()]:
+        raise Http404('Programme Not Found')
 
-        questions = questions[:subject.TotalQuestionsToSelect]
+    paper_buffer = GetPaperBuffer()
+    model_test_values = paper_buffer.Pop(program) if paper_buffer else None
 
-        for question in questions:
-            choices = [question.OptionOne, question.OptionTwo, question.OptionThree, question.OptionFour]
-            details = {
-                'id': question.ID,
-                'title': question.Title,
-                'choices': choices,
-                'answer': question.Answer,
-                'checked': False,
-                'program': program
-            }
+    if model_test_values is None:
+        model_test_values = BuildPaper(program)
 
-            model_test_values.append(details)
+    question_ids = [value['id'] for value in model_test_values]
+    attempt_key = StartAttempt(request, program, question_ids, ['0123'] * len(question_ids))
 
     return render(request, 'ModelTest.html',
                     {
+                        'attempt': attempt_key,
                         'questions': model_test_values,
                         'nav_template': 'nav.html',
                         'page_title': f'{program} | Test Ongoing'
@@ -248,10 +334,7 @@ def ProgramSelector(request):
         return redirect('admin-index')
 
     if request.user.is_authenticated:
-        allPrograms = []
-
-        for programObj in Programme.objects.all():
-            allPrograms.append(programObj.Name)
+        allPrograms = [programme['Name'] for programme in services.GetProgrammes()]
 
         return render(request, 'ProgramSelector.html',
                         {
@@ -346,69 +429,21 @@ def GetResult(request):
     Display store exam results
     """
 
-    correct_counter = 0
-
-    for value in model_test_values:
-        value['checked'] = True
-
     if request.method == 'POST':
-        UserObj = CustomUser.objects.get(id=request.user.id)
-        ResultObj = Exams(UserID=UserObj, ProgrammeName=model_test_values[0]['program'])
-        ResultObj.save()
-
-        QuestionNumber = [int(choice.split()[-1]) - 1 for choice in request.POST.keys() if choice.startswith('choices')]
-
-        for qn in QuestionNumber:
-            option = int(request.POST[f'choices {qn + 1}']) - 1
-
-            userAnswer = model_test_values[qn]['choices'][option]
-            model_test_values[qn]['UserAnswer'] = userAnswer
-
-            ResultDetailsObj = ResultDetails(
-                                    ResultID = ResultObj,
-                                    QuestionID = Questions.objects.get(ID=model_test_values[qn]['id']),
-                                    UserAnswer = userAnswer
-                                )
-            ResultDetailsObj.save()
-
-            if userAnswer == model_test_values[qn]['answer']:
-                correct_counter += 1
-                model_test_values[qn]['is_correct'] = True
-
-            else:
-                model_test_values[qn]['is_correct'] = False
-
-        ResultObj.CorrectCounter = correct_counter
-        ResultObj.save()
-
-        remaining = set(range(1, len(model_test_values))) - set(QuestionNumber)
-
-        for rem in remaining:
-            userAnswer = '-'
-            model_test_values[rem]['is_correct'] = False
-            model_test_values[rem]['UserAnswer'] = userAnswer
-
-            ResultDetailsObj = ResultDetails(
-                                    ResultID = ResultObj,
-                                    QuestionID = Questions.objects.get(ID=model_test_values[rem]['id']),
-                                    UserAnswer = userAnswer
-                                )
-            ResultDetailsObj.save()
+        store = GetExamSessionStore()
+        attempt_key = request.POST.get('attempt', request.session.get('exam-attempt', ''))
+        attempt = store.Get(attempt_key)
 
-        model_test_values[0]['CorrectCounter'] = correct_counter
+        if attempt is None or attempt['UserID'] != str(request.user.id):
+            return redirect('program-selector')
 
-        resultExtraDetails = ResultsExtraDetails.objects.get(UserID=UserObj)
+        model_test_values = GetPaperValues(attempt)
 
-        data = requests.get(f'http://127.0.0.1:8000/api/users_exams_each_programmes/{UserObj.id}')
+        correct_counter = ScorePaper(model_test_values, request.POST)
+        ResultObj = SaveResult(request.user, attempt['Programme'], model_test_values, correct_counter)
 
-        if data.status_code == 200:
-            data = data.json()[0]
-
-            data['TestsTaken'] += 1
-            data[model_test_values[0]['program'].upper()] += 1
-
-            data.pop('UserID')
-            resultExtraDetails.update(commit=True, **data)
+        # Kept until the result is stored, so that a failed submission can be sent again
+        store.Delete(attempt_key)
 
         return redirect('detailed-history', slug=ResultObj.Slug)
 
@@ -429,22 +464,31 @@ def DetailedHistory(request, slug):
 
     values = []
 
+    exams = Exams.objects.select_related('resultsheet')
+
     if request.user.is_superuser:
-        Result = Exams.objects.filter(Slug=slug).first()
+        Result = exams.filter(Slug=slug).first()
 
     else:
-        Result = Exams.objects.filter(Slug=slug, UserID=request.user).first()
+        Result = exams.filter(Slug=slug, UserID=request.user).first()
 
     if Result is None:
         raise Http404('Result Not Found')
 
-    ResultDetail = ResultDetails.objects.filter(ResultID=Result)
+    sheet = getattr(Result, 'resultsheet', None)
+    answers = UnpackAnswers(sheet) if sheet else []
+    questions = Questions.objects.in_bulk([question_id for question_id, _, _ in answers])
+
+    for question_id, option, unknown_answer in answers:
+        Question = questions.get(question_id)
+
+        # Deleted since the exam was taken
+        if Question is None:
+            continue
 
-    for res in ResultDetail:
-        Question = res.QuestionID
         Choices = [Question.OptionOne, Question.OptionTwo, Question.OptionThree, Question.OptionFour]
 
-        userAnswer = res.UserAnswer
+        userAnswer = GetUserAnswer(Choices, option, unknown_answer)
 
         details = {
             'id': Question.ID,
@@ -486,9 +530,9 @@ def GetHistories(request, id):
     Retrieve history data for a specific user ID from the API
     """
 
-    results = requests.get(f'http://{request.get_host()}/api/histories/{id}').json()
+    results = services.QueryHistories(id)
 
-    return PaginatePage(request, results)
+    return PaginatePage(request, results, serializer=HistorySerializers)
 
 
 @login_required(login_url='login')
@@ -556,6 +600,8 @@ def UserHistory(request):
                         'redirect_to': 'history',
                         'prev_page_index': page - 1,
                         'next_page_index': page + 1,
+                        'prev_page_query': PageQuery(request, page - 1),
+                        'next_page_query': PageQuery(request, page + 1),
                     }
             )
 
@@ -563,53 +609,40 @@ def UserHistory(request):
 def GetGraphsData(id):
     """
     Retrieve exam-related data for generating graphs
-    """
-
-    values = dict()
-    results = Exams.objects.filter(UserID=id)
-
-    correct_answers = []
-    incorrect_answers = []
-    program_counter = dict()
-
-    for result in results:
-        correct_counter = result.CorrectCounter
 
-        correct_answers.append(correct_counter)
-        incorrect_answers.append(100 - correct_counter)
-
-        programme = result.ProgrammeName
-
-        if programme in program_counter:
-            program_counter[programme] += 1
-
-        else:
-            program_counter[programme] = 1
-
-    values.update(
-            {
-                'Pie-Chart-correct-vs-incorrect': {
-                    'title': 'Overall Correct v/s Incorrect Answer',
-                    'data': [sum(correct_answers), sum(incorrect_answers)],
-                    'labels': ['Correct Answer', 'Incorrect Answer'],
-                },
-
-                'Pie-Chart-each-programme': {
-                    'title': 'Test taken per programme',
-                    'data': list(program_counter.values()),
-                    'labels': list(program_counter.keys())
-                },
-
-                'Stacked-Bar-Chart-Results': {
-                    'correct': correct_answers,
-                    'incorrect': [-ans for ans in incorrect_answers],
-                    'title': 'Correct v/s Incorrect Answer Per Result',
-                    'x-axis-labels': [f'#{i + 1}' for i in range(len(correct_answers))],
-                }
-            }
-    )
+    The numbers come pre-aggregated from the cached dashboard statistics, the
+    bar chart shows the most recent results averaged into at most
+    settings.DASHBOARD_STATS['POINTS'] bars
+    """
+
+    stats = GetDashboardStats(id)
+    series = stats['series']
+
+    values = {
+        'Pie-Chart-correct-vs-incorrect': {
+            'title': 'Overall Correct v/s Incorrect Answer',
+            'data': [stats['correct'], stats['incorrect']],
+            'labels': ['Correct Answer', 'Incorrect Answer'],
+        },
+
+        'Pie-Chart-each-programme': {
+            'title': 'Test taken per programme',
+            'data': list(stats['programmes'].values()),
+            'labels': list(stats['programmes'].keys())
+        },
+
+        'Stacked-Bar-Chart-Results': {
+            'correct': [point['correct'] for point in series],
+            'incorrect': [-point['incorrect'] for point in series],
+            'title': 'Correct v/s Incorrect Answer Per Result',
+            'x-axis-labels': [
+                f"#{point['first']}" if point['first'] == point['last'] else f"#{point['first']}-{point['last']}"
+                for point in series
+            ],
+        }
+    }
 
-    if correct_answers:
+    if stats['tests_taken']:
         return {
             'data': json.dumps(values)
         }
@@ -625,43 +658,47 @@ def LeaderBoard(request):
     Generates and renders the leaderboard based on exam scores for
     non-superuser users
 
-    This function retrieves exam scores for each non-superuser user,
-    finds their maximum score for a specified program, sorts users based
-    on their average scores, and generates a leaderboard with user ranks,
-    names, profile images, and scores
+    The average score of every user in each programme is kept in the
+    LeaderBoardStanding table, which is updated whenever an exam is stored.
+    The top ranks are read from its (ProgrammeID, AverageScore) index and
+    turned into a leaderboard with user ranks, names, profile images, and scores,
+    kept in the 'leaderboard' tiered cache for a few seconds
     """
 
-    positions = dict()
     show_rank_up_to = 50
     search_by = request.GET.get('rank-by', 'bca')
 
-    for user in CustomUser.objects.all():
-        if user.is_superuser is False:
-            scores = Exams.objects.filter(UserID=user, ProgrammeName__iexact=search_by)
-            total_scores = scores.count()
-
-            if total_scores > 0:
-                avg_score = round(sum([score.CorrectCounter for score in scores]) / total_scores, 2)
-                positions.update({user: avg_score})
-
-    positions = sorted(positions.items(), key=lambda position: position[1], reverse=True)
-    LeaderBoardScores = []
-
-    for rank, (user, score) in enumerate(positions):
-        if rank >= show_rank_up_to:
-            break
-
-        LeaderBoardScores.append(
-            {
-                'rank': rank + 1,
-                'user_name': user.FullName,
-                'user_img': user.ProfileImage.url,
-                'user_score': score
-            }
+    programmes = services.GetProgrammes()
+    programmes = [programme['Name'].upper() for programme in programmes]
+
+    def GetLeaderBoardScores():
+        standings = (
+            LeaderBoardStanding.objects
+            .filter(ProgrammeID__Name__lower=search_by.lower(), UserID__is_superuser=False)
+            .select_related('UserID')
+            .order_by('-AverageScore')[:show_rank_up_to]
         )
 
-    programmes = requests.get(f'http://{request.get_host()}/api/programmes').json()
-    programmes = [programme['Name'].upper() for programme in programmes]
+        LeaderBoardScores = []
+
+        for rank, standing in enumerate(standings):
+            LeaderBoardScores.append(
+                {
+                    'rank': rank + 1,
+                    'user_name': standing.UserID.FullName,
+                    'user_img': standing.UserID.ProfileImage.url,
+                    'user_score': round(standing.AverageScore, 2)
+                }
+            )
+
+        return LeaderBoardScores
+
+    # Only known programmes are cached, any other value ranks nobody
+    if search_by.upper() in programmes:
+        LeaderBoardScores = GetTieredCache('leaderboard').Get(search_by.lower(), GetLeaderBoardScores)
+
+    else:
+        LeaderBoardScores = []
 
     return render(request, 'LeaderBoard.html',
                     {
@@ -678,21 +715,22 @@ def GetSpecificQuestions(request, programme, subject):
     Retrieve specific questions based on the specified program and subject
     """
 
-    global model_test_values
-
     model_test_values = []
     programme = Programme.objects.filter(Name=programme).first()
     subject = Subject.objects.filter(ProgrammeID=programme, Name=subject).first()
-    questions = list(Questions.objects.filter(SubjectID=subject))
 
-    random.shuffle(questions)
+    question_ids = SampleQuestions({subject.ID: 100}) if subject else []
+    questions = Questions.objects.in_bulk(question_ids)
+    questions = [questions[question_id] for question_id in question_ids if question_id in questions]
 
-    questions = questions[:100]
+    choice_orders = []
 
     for question in questions:
         choices = [question.OptionOne, question.OptionTwo, question.OptionThree, question.OptionFour]
+        choice_order = random.sample('0123', 4)
 
-        random.shuffle(choices)
+        choices = [choices[int(index)] for index in choice_order]
+        choice_orders.append(''.join(choice_order))
 
         details = {
             'id': question.ID,
@@ -700,10 +738,13 @@ def GetSpecificQuestions(request, programme, subject):
             'choices': choices,
             'answer': question.Answer,
             'checked': False,
+            'option_order': [int(index) for index in choice_order],
         }
 
         model_test_values.append(details)
 
+    attempt_key = StartAttempt(request, programme.Name if programme else None, [question.ID for question in questions], choice_orders)
+
     if request.user.is_superuser:
         nav_template = 'admin/nav.html'
 
@@ -712,6 +753,7 @@ def GetSpecificQuestions(request, programme, subject):
 
     return render(request, 'ModelTest.html',
                     {
+                        'attempt': attempt_key,
                         'questions': model_test_values,
                         'nav_template': nav_template,
                         'page_title': 'Specific Test Ongoing'
@@ -784,12 +826,14 @@ def GetUserLists(request, users=None):
     drop_down_options = ['Email', 'DOB', 'Gender', 'Member Since', 'Admin', 'Non-Admin', 'Active', 'Non-Active']
 
     if users is None:
-        users = requests.get(f'http://{request.get_host()}/api/users').json()
+        users = services.QueryUsers()
 
     else:
         is_searching_being_done = True
 
-    if len(users) == 0:
+    paginator, data, page = PaginatePage(request, users, serializer=UserSerializers)
+
+    if paginator.count == 0:
         return render(request, 'admin/Users.html',
                         {
                             'page_title': 'Users',
@@ -798,8 +842,6 @@ def GetUserLists(request, users=None):
                         }
                 )
 
-    paginator, data, page = PaginatePage(request, users)
-
     return render(request, 'admin/Users.html',
                 {
                     'data': data,
@@ -807,11 +849,13 @@ def GetUserLists(request, users=None):
                     'paginator': paginator,
                     'prev_page_index': page - 1,
                     'next_page_index': page + 1,
+                    'prev_page_query': PageQuery(request, page - 1),
+                    'next_page_query': PageQuery(request, page + 1),
                     'search_form_url': 'users-search',
                     'template_type': 'template::users',
                     'js_path': 'js/admin/UserSearch.js',
                     'drop_down_options': drop_down_options,
-                    'total_searched': len(users) if is_searching_being_done else None,
+                    'total_searched': paginator.count if is_searching_being_done else None,
                 }
             )
 
@@ -825,12 +869,14 @@ def GetUsersExamsLists(request, exams=None):
     drop_down_options = ['Email', 'Username', 'Tests Taken']
 
     if exams is None:
-        exams = requests.get(f'http://{request.get_host()}/api/users_exams').json()
+        exams = services.QueryUsersExams()
 
     else:
         is_searching_being_done = True
 
-    if len(exams) == 0:
+    paginator, data, page = PaginatePage(request, exams, serializer=UsersExamsSerializers)
+
+    if paginator.count == 0:
         return render(request, 'admin/UsersExams.html',
                         {
                             'page_title': 'Exams',
@@ -839,8 +885,6 @@ def GetUsersExamsLists(request, exams=None):
                         }
                     )
 
-    paginator, data, page = PaginatePage(request, exams)
-
     return render(request, 'admin/UsersExams.html',
                 {
                     'data': data,
@@ -848,11 +892,13 @@ def GetUsersExamsLists(request, exams=None):
                     'paginator': paginator,
                     'prev_page_index': page - 1,
                     'next_page_index': page + 1,
+                    'prev_page_query': PageQuery(request, page - 1),
+                    'next_page_query': PageQuery(request, page + 1),
                     'template_type': 'template::exams',
                     'drop_down_options': drop_down_options,
                     'search_form_url': 'users-exams-search',
                     'js_path': 'js/admin/UsersExamsSearch.js',
-                    'total_searched': len(exams) if is_searching_being_done else None,
+                    'total_searched': paginator.count if is_searching_being_done else None,
                 }
             )
 
@@ -862,20 +908,14 @@ def GetUsersExamsProgrammeLists(request, user_email, exams=None):
     Retrieve and display a list of exams with optional filtering
     """
 
-    global SEARCH_USER_ID
-
-    if SEARCH_USER_ID != user_email:
-        SEARCH_USER_ID = user_email
-
     is_searching_being_done = False
     drop_down_options = ['Programme', 'Tests Taken']
 
     if exams is None:
-        exams = requests.get(f'http://{request.get_host()}/api/users_exams_each_programmes/{user_email}').json()
+        exams = services.GetUsersExamsInEachProgramme(user_email)
 
     else:
         is_searching_being_done = True
-        user_email = exams[0]['UserEmail']
 
     paginator, data, page = PaginatePage(request, exams)
 
@@ -887,9 +927,12 @@ def GetUsersExamsProgrammeLists(request, user_email, exams=None):
                     'url_email': user_email,
                     'prev_page_index': page - 1,
                     'next_page_index': page + 1,
+                    'prev_page_query': PageQuery(request, page - 1),
+                    'next_page_query': PageQuery(request, page + 1),
                     'template_type': 'template::exams',
                     'drop_down_options': drop_down_options,
                     'search_form_url': 'users-exams-programme-search',
+                    'search_context': {'user': user_email},
                     'js_path': 'js/admin/UsersExamsProgrammeSearch.js',
                     'total_searched': len(exams) if is_searching_being_done else None,
                 }
@@ -901,35 +944,27 @@ def GetDetailedExamsLists(request, user_email, programme, exams=None):
     Retrieve and display a list of exams with optional filtering
     """
 
-    global SEARCH_USER_ID, SEARCH_PROGRAMME
-
-    if SEARCH_USER_ID != user_email:
-        SEARCH_USER_ID = user_email
-
-    if SEARCH_PROGRAMME != programme:
-        SEARCH_PROGRAMME = programme
-
     is_searching_being_done = False
     drop_down_options = ['Date', 'Total Correct Answered']
 
     if exams is None:
-        exams = requests.get(f'http://{request.get_host()}/api/exams/{user_email}/{programme}').json()
+        exams = services.QueryExams(user_email, programme)
 
     else:
         is_searching_being_done = True
 
-    if len(exams) == 0:
+    paginator, data, page = PaginatePage(request, exams, serializer=ExamSerializers)
+
+    if paginator.count == 0:
         return render(request, 'admin/DetailedExams.html',
                         {
                             'page_title': 'Exams',
                             'data_details': 'No data found',
                             'template_type': 'template::exams',
-                            'total_searched': len(exams) if is_searching_being_done else None,
+                            'total_searched': paginator.count if is_searching_being_done else None,
                         }
                     )
 
-    paginator, data, page = PaginatePage(request, exams)
-
     return render(request, 'admin/DetailedExams.html',
                 {
                     'data': data,
@@ -937,11 +972,14 @@ def GetDetailedExamsLists(request, user_email, programme, exams=None):
                     'paginator': paginator,
                     'prev_page_index': page - 1,
                     'next_page_index': page + 1,
+                    'prev_page_query': PageQuery(request, page - 1),
+                    'next_page_query': PageQuery(request, page + 1),
                     'template_type': 'template::exams',
                     'js_path': 'js/admin/ExamSearch.js',
                     'drop_down_options': drop_down_options,
                     'search_form_url': 'detailed-exams-search',
-                    'total_searched': len(exams) if is_searching_being_done else None,
+                    'search_context': {'user': user_email, 'programme': programme},
+                    'total_searched': paginator.count if is_searching_being_done else None,
                 }
             )
 
@@ -951,8 +989,8 @@ def GetProgrammeLists(request):
     Retrieve a list of programmes from an API and render them on a paginated HTML template
     """
 
-    DATA = requests.get(f'http://{request.get_host()}/api/programmes').json()
-    paginator, data, page = PaginatePage(request, DATA)
+    DATA = services.QueryProgrammes()
+    paginator, data, page = PaginatePage(request, DATA, serializer=ProgrammeSerializers)
 
     return render(request, 'admin/Programmes.html',
                 {
@@ -961,6 +999,8 @@ def GetProgrammeLists(request):
                     'page_title': 'Programmes',
                     'prev_page_index': page - 1,
                     'next_page_index': page + 1,
+                    'prev_page_query': PageQuery(request, page - 1),
+                    'next_page_query': PageQuery(request, page + 1),
                     'template_type': 'template::programmes'
                 }
             )
@@ -975,12 +1015,14 @@ def GetSubjectPrograms(request, programme=None):
     drop_down_options = ['Programme', 'Total Subjects']
 
     if programme is None:
-        programme = requests.get(f'http://{request.get_host()}/api/subject-programmes').json()
+        programme = services.QuerySubjectProgrammes()
 
     else:
         is_searching_being_done = True
 
-    if len(programme) == 0:
+    paginator, data, page = PaginatePage(request, programme, serializer=SubjectProgrammesSerializers)
+
+    if paginator.count == 0:
         return render(request, 'admin/QuestionsProgrammesSubjects.html',
                         {
                             'page_title': 'Subjects',
@@ -989,8 +1031,6 @@ def GetSubjectPrograms(request, programme=None):
                         }
                 )
 
-    paginator, data, page = PaginatePage(request, programme)
-
     return render(request, 'admin/QuestionsProgrammesSubjects.html',
                 {
                     'data': data,
@@ -999,12 +1039,14 @@ def GetSubjectPrograms(request, programme=None):
                     'next___url': 'subjects',
                     'prev_page_index': page - 1,
                     'next_page_index': page + 1,
+                    'prev_page_query': PageQuery(request, page - 1),
+                    'next_page_query': PageQuery(request, page + 1),
                     'sub__text': 'Total Subjects: ',
                     'search_form_url': 'subject-search',
                     'template_type': 'template::subjects',
                     'drop_down_options': drop_down_options,
                     'js_path': 'js/admin/SubjectSearch.js',
-                    'total_searched': len(programme) if is_searching_being_done else None,
+                    'total_searched': paginator.count if is_searching_being_done else None,
                 }
             )
 
@@ -1014,21 +1056,18 @@ def GetSubjectLists(request, programme, subjects=None):
     Retrieve and render a paginated list of subjects
     """
 
-    global SEARCH_PROGRAMME
-
-    if programme and SEARCH_PROGRAMME != programme:
-        SEARCH_PROGRAMME = programme
-
     is_searching_being_done = False
     drop_down_options = ['Subject', 'Total Questions To Select']
 
     if subjects is None:
-        subjects = requests.get(f'http://{request.get_host()}/api/subjects/{programme}').json()
+        subjects = services.QuerySubjects(programme)
 
     else:
         is_searching_being_done = True
 
-    if len(subjects) == 0:
+    paginator, data, page = PaginatePage(request, subjects, serializer=SubjectProgrammeSerializers)
+
+    if paginator.count == 0:
         return render(request, 'admin/QuestionsProgrammesSubjects.html',
                         {
                             'page_title': 'Subjects',
@@ -1037,8 +1076,6 @@ def GetSubjectLists(request, programme, subjects=None):
                         }
                 )
 
-    paginator, data, page = PaginatePage(request, subjects)
-
     return render(request, 'admin/QuestionsProgrammesSubjects.html',
                 {
                     'data': data,
@@ -1047,13 +1084,16 @@ def GetSubjectLists(request, programme, subjects=None):
                     'page_title': 'Subjects',
                     'prev_page_index': page - 1,
                     'next_page_index': page + 1,
+                    'prev_page_query': PageQuery(request, page - 1),
+                    'next_page_query': PageQuery(request, page + 1),
                     'search_form_url': 'subject-search',
                     'template_type': 'template::subjects',
                     'next___url': f'subjects/{programme}',
+                    'search_context': {'programme': programme},
                     'drop_down_options': drop_down_options,
                     'js_path': 'js/admin/SubjectSearch.js',
                     'sub__text': 'Total Questions To Select: ',
-                    'total_searched': len(subjects) if is_searching_being_done else None,
+                    'total_searched': paginator.count if is_searching_being_done else None,
                 }
             )
 
@@ -1068,12 +1108,14 @@ def GetQuestionsProgrammes(request, questions=None):
     drop_down_options = ['Programme', 'Total Questions']
 
     if questions is None:
-        questions = requests.get(f'http://{request.get_host()}/api/questions').json()
+        questions = services.QueryProgrammes()
 
     else:
         is_searching_being_done = True
 
-    if len(questions) == 0:
+    paginator, data, page = PaginatePage(request, questions, serializer=QuestionProgrammesSerializers)
+
+    if paginator.count == 0:
         return render(request, 'admin/QuestionsProgramme.html',
                         {
                             'page_title': 'Questions',
@@ -1082,8 +1124,6 @@ def GetQuestionsProgrammes(request, questions=None):
                         }
                 )
 
-    paginator, data, page = PaginatePage(request, questions)
-
     return render(request, 'admin/QuestionsProgrammesSubjects.html',
                 {
                     'data': data,
@@ -1092,12 +1132,14 @@ def GetQuestionsProgrammes(request, questions=None):
                     'next___url': 'questions',
                     'prev_page_index': page - 1,
                     'next_page_index': page + 1,
+                    'prev_page_query': PageQuery(request, page - 1),
+                    'next_page_query': PageQuery(request, page + 1),
                     'sub__text': 'Total Questions: ',
                     'template_type': 'template::questions',
                     'js_path': 'js/admin/QuestionSearch.js',
                     'drop_down_options': drop_down_options,
                     'search_form_url': 'question-programme-search',
-                    'total_searched': len(questions) if is_searching_being_done else None,
+                    'total_searched': paginator.count if is_searching_being_done else None,
                 }
             )
 
@@ -1108,20 +1150,19 @@ def GetQuestionsPerProgram(request, programme, questions=None):
     an API and render them on a paginated HTML template
     """
 
-    global SEARCH_PROGRAMME
-
-    SEARCH_PROGRAMME = programme
     is_searching_being_done = False
 
     drop_down_options = ['Subjects', 'Total Questions']
 
     if questions is None:
-        questions = requests.get(f'http://{request.get_host()}/api/questions/{programme}').json()
+        questions = services.QuerySubjects(programme)
 
     else:
         is_searching_being_done = True
 
-    if len(questions) == 0:
+    paginator, data, page = PaginatePage(request, questions, serializer=QuestionProgrammesSubjectsSerializers)
+
+    if paginator.count == 0:
         return render(request, 'admin/QuestionsProgrammesSubjects.html',
                         {
                             'page_title': 'Questions',
@@ -1130,8 +1171,6 @@ def GetQuestionsPerProgram(request, programme, questions=None):
                         }
                 )
 
-    paginator, data, page = PaginatePage(request, questions)
-
     return render(request, 'admin/QuestionsProgrammesSubjects.html',
                 {
                     'data': data,
@@ -1140,37 +1179,38 @@ def GetQuestionsPerProgram(request, programme, questions=None):
                     'url_programme': programme,
                     'prev_page_index': page - 1,
                     'next_page_index': page + 1,
+                    'prev_page_query': PageQuery(request, page - 1),
+                    'next_page_query': PageQuery(request, page + 1),
                     'sub__text': 'Total Questions: ',
                     'next___url': f'questions/{programme}',
                     'template_type': 'template::questions',
                     'drop_down_options': drop_down_options,
                     'js_path': 'js/admin/QuestionSearch.js',
                     'search_form_url': 'question-per-programme-search',
-                    'total_searched': len(questions) if is_searching_being_done else None,
+                    'search_context': {'programme': programme},
+                    'total_searched': paginator.count if is_searching_being_done else None,
                 }
             )
 
+
 def GetQuestionLists(request, programme=None, subject=None, questions=None):
     """
     Retrieve a list of questions of selected subjects and programmes for
     questions from an API and render them on a paginated HTML template
     """
 
-    global SEARCH_PROGRAMME, SEARCH_SUBJECT
-
-    SEARCH_SUBJECT = subject
-    SEARCH_PROGRAMME = programme
-
     is_searching_being_done = False
     drop_down_options = ['Title', 'Answer', 'Options']
 
     if questions is None:
-        questions = requests.get(f'http://{request.get_host()}/api/questions/{programme}/{subject}').json()
+        questions = services.QueryQuestionsPerSubject(programme, subject)
 
     else:
         is_searching_being_done = True
 
-    if len(questions) == 0:
+    paginator, data, page = PaginatePage(request, questions, serializer=QuestionSerializers)
+
+    if paginator.count == 0:
         return render(request, 'admin/Questions.html',
                         {
                             'page_title': 'Questions',
@@ -1179,8 +1219,6 @@ def GetQuestionLists(request, programme=None, subject=None, questions=None):
                         }
                 )
 
-    paginator, data, page = PaginatePage(request, questions)
-
     return render(request, 'admin/Questions.html',
                 {
                     'data': data,
@@ -1188,11 +1226,14 @@ def GetQuestionLists(request, programme=None, subject=None, questions=None):
                     'page_title': 'Questions',
                     'prev_page_index': page - 1,
                     'next_page_index': page + 1,
+                    'prev_page_query': PageQuery(request, page - 1),
+                    'next_page_query': PageQuery(request, page + 1),
                     'search_form_url': 'question-search',
+                    'search_context': {'programme': programme, 'subject': subject},
                     'template_type': 'template::questions',
                     'js_path': 'js/admin/QuestionSearch.js',
                     'drop_down_options': drop_down_options,
-                    'total_searched': len(questions) if is_searching_being_done else None,
+                    'total_searched': paginator.count if is_searching_being_done else None,
                 }
             )
 
@@ -1205,9 +1246,11 @@ def GetFeedbackLists(request, feedbacks=None):
     drop_down_options = ['Name', 'Email', 'Date', 'Message', 'Marked', 'Not-Marked']
 
     if feedbacks is None:
-        feedbacks = requests.get(f'http://{request.get_host()}/api/feedbacks').json()
+        feedbacks = services.QueryFeedbacks()
 
-    elif len(feedbacks) == 0:
+    paginator, data, page = PaginatePage(request, feedbacks, serializer=FeedbackSerializers)
+
+    if paginator.count == 0:
         return render(request, 'admin/Feedbacks.html',
                         {
                             'page_title': 'FeedBacks',
@@ -1216,8 +1259,6 @@ def GetFeedbackLists(request, feedbacks=None):
                         }
                 )
 
-    paginator, data, page = PaginatePage(request, feedbacks)
-
     return render(request, 'admin/Feedbacks.html',
                 {
                     'data': data,
@@ -1225,6 +1266,8 @@ def GetFeedbackLists(request, feedbacks=None):
                     'page_title': 'FeedBacks',
                     'prev_page_index': page - 1,
                     'next_page_index': page + 1,
+                    'prev_page_query': PageQuery(request, page - 1),
+                    'next_page_query': PageQuery(request, page + 1),
                     'search_form_url': 'feedback-search',
                     'template_type': 'template::feedbacks',
                     'js_path': 'js/admin/FeedbackSearch.js',
@@ -1241,9 +1284,11 @@ def GetReportsLists(request, reports=None):
     drop_down_options = ['User', 'Issue', 'Date', 'Question', 'Marked', 'Not-Marked']
 
     if reports is None:
-        reports = requests.get(f'http://{request.get_host()}/api/reports').json()
+        reports = services.QueryReports()
 
-    if len(reports) == 0:
+    paginator, data, page = PaginatePage(request, reports, serializer=ReportSerializers)
+
+    if paginator.count == 0:
         return render(request, 'admin/Reports.html',
                         {
                             'page_title': 'Reports',
@@ -1252,8 +1297,6 @@ def GetReportsLists(request, reports=None):
                         }
                 )
 
-    paginator, data, page = PaginatePage(request, reports)
-
     return render(request, 'admin/Reports.html',
                 {
                     'data': data,
@@ -1261,6 +1304,8 @@ def GetReportsLists(request, reports=None):
                     'page_title': 'Reports',
                     'prev_page_index': page - 1,
                     'next_page_index': page + 1,
+                    'prev_page_query': PageQuery(request, page - 1),
+                    'next_page_query': PageQuery(request, page + 1),
                     'search_form_url': 'report-search',
                     'template_type': 'template::reports',
                     'js_path': 'js/admin/ReportSearch.js',
@@ -1390,7 +1435,7 @@ def EditUsers(request, id):
 
         return redirect('edit-user', id=id)
 
-    DATA = requests.get(f'http://{request.get_host()}/api/users/{id}').json()
+    DATA = services.GetUsers(id)
 
     for data in DATA:
         data['MemberSince'] = datetime.datetime.strptime(data['MemberSince'], '%Y-%m-%dT%H:%M:%S.%fZ').strftime("%d %b %Y, %I:%M %p")
@@ -1410,7 +1455,7 @@ def EditSubject(request, programme, subject):
     View to edit the details of specific subject in admin template
     """
 
-    subject = Subject.objects.get(ProgrammeID__Name__iexact=programme, Name__iexact=subject)
+    subject = Subject.objects.get(ProgrammeID__Name__lower=programme.lower(), Name__lower=subject.lower())
 
     if request.method == 'POST':
         subject.TotalQuestionsToSelect = request.POST['Total Questions To Select']
@@ -1420,7 +1465,7 @@ def EditSubject(request, programme, subject):
 
         return redirect('edit-subject', programme=programme, subject=subject)
 
-    data = requests.get(f'http://{request.get_host()}/api/subjects/{programme}/{subject}').json()[0]
+    data = services.GetSubjects(programme, subject.Name)[0]
     data = [
         {
             'ID': data['ID'],
@@ -1457,16 +1502,25 @@ def AddQuestion(request):
         question.OptionThree = request.POST['Option Three']
         question.OptionFour = request.POST['Option Four']
 
+        # Checked before saving, so the question is not compared with itself
+        near_duplicates = FindNearDuplicates(
+                            question.SubjectID_id, question.Title,
+                            [question.OptionOne, question.OptionTwo, question.OptionThree, question.OptionFour]
+                        )
+
         question.save()
         messages.success(request, 'Question Added Successful', extra_tags='question_added')
 
+        if near_duplicates:
+            similar = ', '.join(f'"{match.Title[:60]}" ({similarity:.0%})' for match, similarity in near_duplicates[:3])
+            messages.warning(request, f'Similar to {len(near_duplicates)} questions of {SubjectID.Name}: {similar}', extra_tags='near_duplicate')
+
         return redirect('add-question')
 
     select_options = dict()
 
-    for head in Programme.objects.all():
-        tails = [tail.Name for tail in Subject.objects.filter(ProgrammeID=head)]
-        select_options[head.Name] = tails
+    for head in services.GetProgrammes():
+        select_options[head['Name']] = [tail['Name'] for tail in services.GetSubjects(head['Name'])]
 
     select_options = json.dumps(select_options)
     data = [
@@ -1531,7 +1585,7 @@ def EditReports(request, id):
     View to edit the details of specific report in admin template
     """
 
-    data = requests.get(f'http://{request.get_host()}/api/reports/{id}').json()[0]
+    data = services.GetReports(id)[0]
 
     return render(request, 'admin/Edit-Report.html',
                     {
@@ -1578,7 +1632,7 @@ def UserSearch(request):
     searching_type = request.GET.get('search-type')
     searching_value = request.GET.get('search-value')
 
-    usrSearch = UserFilter(request.get_host(), searching_value)
+    usrSearch = UserFilter(searching_value)
 
     maps = {
         'admin': lambda: usrSearch.SearchByAdmin(),
@@ -1607,7 +1661,7 @@ def UsersExamsSearch(request):
     searching_type = request.GET.get('search-type')
     searching_value = request.GET.get('search-value')
 
-    examSearch = UsersExamsFilter(request.get_host(), searching_value)
+    examSearch = UsersExamsFilter(searching_value)
 
     maps = {
         'email': lambda: examSearch.SearchByEmail('email'),
@@ -1631,7 +1685,8 @@ def UsersExamsProgrammeSearch(request):
     searching_type = request.GET.get('search-type')
     searching_value = request.GET.get('search-value')
 
-    examSearch = UsersExamsProgrammeListsFilter(request.get_host(), SEARCH_USER_ID, searching_value)
+    search_context = GetSearchContext(request)
+    examSearch = UsersExamsProgrammeListsFilter(search_context['user'], searching_value)
 
     maps = {
         'tests taken': examSearch.SearchByTestsTaken,
@@ -1643,7 +1698,7 @@ def UsersExamsProgrammeSearch(request):
     if exams:
         exams = exams()
 
-    return GetUsersExamsProgrammeLists(request, None, exams)
+    return GetUsersExamsProgrammeLists(request, search_context['user'], exams)
 
 
 def DetailedExamsSearch(request):
@@ -1654,7 +1709,8 @@ def DetailedExamsSearch(request):
     searching_type = request.GET.get('search-type')
     searching_value = request.GET.get('search-value')
 
-    examSearch = DetailedExamsFilter(request.get_host(), SEARCH_USER_ID, SEARCH_PROGRAMME, searching_value)
+    search_context = GetSearchContext(request)
+    examSearch = DetailedExamsFilter(search_context['user'], search_context['programme'], searching_value)
 
     maps = {
         'date': lambda: examSearch.SearchByDate('Date'),
@@ -1666,7 +1722,7 @@ def DetailedExamsSearch(request):
     if exams:
         exams = exams()
 
-    return GetDetailedExamsLists(request, None, None, exams)
+    return GetDetailedExamsLists(request, search_context['user'], search_context['programme'], exams)
 
 
 def SubjectSearch(request):
@@ -1677,13 +1733,14 @@ def SubjectSearch(request):
     searching_type = request.GET.get('search-type')
     searching_value = request.GET.get('search-value')
 
+    programme = GetSearchContext(request)['programme']
     subjectSearch = SubjectFilter(searching_value)
 
     maps = {
-        'subject': lambda: subjectSearch.SearchBySubjectName(request.get_host(), SEARCH_PROGRAMME),
-        'programme': lambda: subjectSearch.SearchByProgrammeName(request.get_host(), 'subject-programmes'),
-        'total subjects': lambda: subjectSearch.SearchByTotalSubjects(request.get_host(), 'subject-programmes'),
-        'total questions to select': lambda: subjectSearch.SearchByTotalQuestionsToSelect(request.get_host(), SEARCH_PROGRAMME, 'subjects'),
+        'subject': lambda: subjectSearch.SearchBySubjectName(programme),
+        'programme': lambda: subjectSearch.SearchByProgrammeName(),
+        'total subjects': lambda: subjectSearch.SearchByTotalSubjects(),
+        'total questions to select': lambda: subjectSearch.SearchByTotalQuestionsToSelect(programme),
     }
 
     subjects = maps.get(searching_type.lower(), None)
@@ -1694,8 +1751,8 @@ def SubjectSearch(request):
     redirect_maps = {
         'programme': lambda: GetSubjectPrograms(request, programme=subjects),
         'total subjects': lambda: GetSubjectPrograms(request, programme=subjects),
-        'subject': lambda: GetSubjectLists(request, SEARCH_PROGRAMME, subjects=subjects),
-        'total questions to select': lambda: GetSubjectLists(request, SEARCH_PROGRAMME, subjects=subjects),
+        'subject': lambda: GetSubjectLists(request, programme, subjects=subjects),
+        'total questions to select': lambda: GetSubjectLists(request, programme, subjects=subjects),
     }
 
     return redirect_maps[searching_type.lower()]()
@@ -1709,7 +1766,7 @@ def QuestionProgrammeSearch(request):
     searching_type = request.GET.get('search-type').strip()
     searching_value = request.GET.get('search-value').strip()
 
-    questionProgrammeSearch = QuestionProgrammeFilter(request.get_host(), searching_value)
+    questionProgrammeSearch = QuestionProgrammeFilter(searching_value)
 
     maps = {
         'programme': lambda: questionProgrammeSearch.SearchByProgramme(),
@@ -1732,7 +1789,8 @@ def QuestionPerProgrammeSearch(request):
     searching_type = request.GET.get('search-type').strip()
     searching_value = request.GET.get('search-value').strip()
 
-    questionPerProgrammeSearch = QuestionPerProgrammeFilter(request.get_host(), SEARCH_PROGRAMME, searching_value)
+    programme = GetSearchContext(request)['programme']
+    questionPerProgrammeSearch = QuestionPerProgrammeFilter(programme, searching_value)
 
     maps = {
         'subjects': lambda: questionPerProgrammeSearch.SearchBySubject(),
@@ -1744,7 +1802,7 @@ def QuestionPerProgrammeSearch(request):
     if questions:
         questions = questions()
 
-    return GetQuestionsPerProgram(request, SEARCH_PROGRAMME, questions)
+    return GetQuestionsPerProgram(request, programme, questions)
 
 
 def QuestionSearch(request):
@@ -1755,7 +1813,8 @@ def QuestionSearch(request):
     searching_type = request.GET.get('search-type').strip()
     searching_value = request.GET.get('search-value').strip()
 
-    questionSearch = QuestionFilter(request.get_host(), SEARCH_PROGRAMME, SEARCH_SUBJECT, searching_value)
+    search_context = GetSearchContext(request)
+    questionSearch = QuestionFilter(search_context['programme'], search_context['subject'], searching_value)
 
     maps = {
         'title': lambda: questionSearch.SearchByTitle(),
@@ -1768,7 +1827,7 @@ def QuestionSearch(request):
     if questions:
         questions = questions()
 
-    return GetQuestionLists(request, questions=questions)
+    return GetQuestionLists(request, search_context['programme'], search_context['subject'], questions)
 
 
 def ReportSearch(request):
@@ -0,0 +1,211 @@
+"""
+Pagination and field selection shared by the list endpoints of the API
+
+The body of a response stays a plain list, the paging information is sent
+in headers so existing clients keep working:
+
+    X-Total-Count: Number of rows matching the request
+    Link: URLs of the next and previous pages, e.g. <...?limit=100&offset=200>; rel="next"
+
+Two ways of paging are supported:
+
+    ?limit=<n>&offset=<n>   Jump to any page, the offset is counted by the database
+    ?cursor=&limit=<n>      Keyset paging, every page continues right after the last
+                            row of the previous one, so deep pages cost the same as
+                            the first one. Follow the "next" link to continue
+"""
+
+import base64
+import json
+from django.db.models import Q
+from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.utils.urls import replace_query_param, remove_query_param
+
+
+class LimitOffsetKeysetPagination(BasePagination):
+    """
+    Paginate a queryset either by limit/offset or by a keyset cursor
+    """
+
+    default_limit = 100
+    max_limit = 1000
+
+    limit_query_param = 'limit'
+    offset_query_param = 'offset'
+    cursor_query_param = 'cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Select the rows of the requested page
+
+        Parameters:
+            queryset (QuerySet): The ordered rows to be paginated
+            request (Request): The HTTP request object
+            view: Optional. The view being paginated
+
+        Returns:
+            List: The rows of the requested page
+        """
+
+        self.request = request
+        self.limit = self.GetLimit(request)
+        self.count = queryset.count()
+        self.next_link = None
+        self.previous_link = None
+
+        if self.cursor_query_param in request.query_params:
+            return self.PaginateByCursor(queryset, request)
+
+        return self.PaginateByOffset(queryset, request)
+
+    def get_paginated_response(self, data):
+        """
+        Return the rows of a page with the paging headers
+        """
+
+        links = []
+
+        if self.next_link:
+            links.append(f'<{self.next_link}>; rel="next"')
+
+        if self.previous_link:
+            links.append(f'<{self.previous_link}>; rel="prev"')
+
+        headers = {'X-Total-Count': str(self.count)}
+
+        if links:
+            headers['Link'] = ', '.join(links)
+
+        return Response(data, headers=headers)
+
+    def GetLimit(self, request):
+        limit = self.GetNumber(request, self.limit_query_param, self.default_limit)
+
+        if limit < 1:
+            raise ValidationError({self.limit_query_param: 'Must be a positive number'})
+
+        return min(limit, self.max_limit)
+
+    def GetNumber(self, request, param, default):
+        value = request.query_params.get(param)
+
+        if value in [None, '']:
+            return default
+
+        try:
+            return int(value)
+
+        except ValueError:
+            raise ValidationError({param: 'Must be a number'})
+
+    def PaginateByOffset(self, queryset, request):
+        offset = max(self.GetNumber(request, self.offset_query_param, 0), 0)
+        url = request.build_absolute_uri()
+
+        rows = list(queryset[offset:offset + self.limit])
+
+        if offset + self.limit < self.count:
+            self.next_link = replace_query_param(url, self.offset_query_param, offset + self.limit)
+
+        if offset > 0:
+            self.previous_link = replace_query_param(url, self.offset_query_param, max(offset - self.limit, 0))
+
+        return rows
+
+    def GetKeyset(self, queryset):
+        """
+        Return the ordering field of a queryset and whether it is descending
+
+        The primary key breaks ties between rows having the same value
+        """
+
+        ordering = queryset.query.order_by or queryset.model._meta.ordering or ['pk']
+        field = ordering[0]
+
+        if field.startswith('-'):
+            return field[1:], True
+
+        return field, False
+
+    def PaginateByCursor(self, queryset, request):
+        field, descending = self.GetKeyset(queryset)
+        cursor = self.DecodeCursor(request.query_params.get(self.cursor_query_param))
+
+        prefix = '-' if descending else ''
+        queryset = queryset.order_by(f'{prefix}{field}', f'{prefix}pk')
+
+        if cursor is not None:
+            lookup = 'lt' if descending else 'gt'
+            value, pk = cursor
+
+            queryset = queryset.filter(
+                            Q(**{f'{field}__{lookup}': value}) |
+                            Q(**{field: value, f'pk__{lookup}': pk})
+                        )
+
+        # One extra row tells whether there is a next page without counting
+        rows = list(queryset[:self.limit + 1])
+
+        if len(rows) > self.limit:
+            rows = rows[:self.limit]
+            last = rows[-1]
+            meta = queryset.model._meta
+
+            # Annotations, e.g. the rank of a search, are kept as JSON values
+            if field in queryset.query.annotations:
+                value = getattr(last, field)
+
+            else:
+                value = (meta.pk if field == 'pk' else meta.get_field(field)).value_to_string(last)
+
+            url = remove_query_param(request.build_absolute_uri(), self.offset_query_param)
+            self.next_link = replace_query_param(url, self.cursor_query_param, self.EncodeCursor(value, str(last.pk)))
+
+        return rows
+
+    def EncodeCursor(self, value, pk):
+        return base64.urlsafe_b64encode(json.dumps([value, pk]).encode()).decode()
+
+    def DecodeCursor(self, encoded):
+        if not encoded:
+            return None
+
+        try:
+            value, pk = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+
+        except (ValueError, TypeError):
+            raise ValidationError({self.cursor_query_param: 'Invalid cursor'})
+
+        return value, pk
+
+
+def SelectFields(serializer, request, param='fields'):
+    """
+    Keep only the fields requested with ?fields=<name>,<name>
+
+    Dropped fields are removed before serialization, so their values are
+    never computed
+
+    Parameters:
+        serializer (ListSerializer): The serializer of the rows of a page
+        request (Request): The HTTP request object
+        param (str): Optional. Name of the query parameter listing the fields
+    """
+
+    requested = request.query_params.get(param)
+
+    if not requested:
+        return
+
+    requested = {name.strip() for name in requested.split(',') if name.strip()}
+    fields = serializer.child.fields
+
+    unknown = requested - set(fields)
+
+    if unknown:
+        raise ValidationError({param: f"Unknown fields: {', '.join(sorted(unknown))}"})
+
+    for name in set(fields) - requested:
+        fields.pop(name)
@@ -51,6 +51,9 @@ class UsersExamsSerializers(serializers.ModelSerializer):
             str: The total number of tests taken by a user
         """
 
+        if hasattr(obj, 'tests_taken'):
+            return obj.tests_taken
+
         return ResultsExtraDetails.objects.get(UserID=obj).TestsTaken
 
 
@@ -58,53 +61,52 @@ class UsersExamsInEachProgrammeSerializers(serializers.ModelSerializer):
     """
     Serializer for the UsersExamsInEachProgramme model
 
-    This serializer is designed to represent the ResultsExtraDetails model,
-    providing a customized representation for specific fields
+    This serializer is designed to represent a CustomUser together with the
+    number of exams taken in each programme, read from the user's
+    LeaderBoardStanding rows. Every programme named in the 'programmes'
+    context gets a key, so programmes without any exam are listed with 0
 
     Fields:
         UserID: Represents the user ID associated with the exam results
-        BCA: Represents the result details for the BCA program
-        BIT: Represents the result details for the BIT program
-        BIM: Represents the result details for the BIM program
-        BSCSIT: Represents the result details for the BSCSIT program
+        UserEmail: Represents the email of the user
+        TestsTaken: Represents the total number of exams taken by the user
+        <programme>: Represents the number of exams taken in the programme
 
     Methods:
-        get_UserID(obj): Custom method to retrieve the user ID from the given object
-
+        get_TestsTaken(obj): Custom method to retrieve the total number of exams taken by the user
     """
 
-    UserID = serializers.SerializerMethodField()
-    UserEmail = serializers.SerializerMethodField()
+    UserID = serializers.UUIDField(source='id', read_only=True)
+    UserEmail = serializers.EmailField(source='email', read_only=True)
+    TestsTaken = serializers.SerializerMethodField()
 
     class Meta:
-        model = ResultsExtraDetails
-        fields = ['UserID', 'UserEmail', 'TestsTaken', 'BCA', 'BIT', 'BIM', 'BSCSIT']
+        model = CustomUser
+        fields = ['UserID', 'UserEmail', 'TestsTaken']
 
-    def get_UserID(self, obj):
+    def get_TestsTaken(self, obj):
         """
-        Custom method to retrieve the user ID from the given object
+        Custom method to retrieve the total number of exams taken by the user
 
         Parameters:
-            obj: An instance of ResultsExtraDetails representing exam results
+            obj (CustomUser): The user whose exams are counted
 
         Returns:
-            The user ID associated with the exam results
+            int: The number of exams taken in every programme
         """
 
-        return obj.UserID.id
+        return sum(standing.TestsTaken for standing in obj.leaderboardstanding_set.all())
 
-    def get_UserEmail(self, obj):
-        """
-        Custom method to retrieve the user email from the given object
+    def to_representation(self, obj):
+        data = super().to_representation(obj)
+        tests_taken = {programme: 0 for programme in self.context.get('programmes', [])}
 
-        Parameters:
-            obj: An instance of ResultsExtraDetails representing exam results
+        for standing in obj.leaderboardstanding_set.all():
+            tests_taken[standing.ProgrammeID.Name] = standing.TestsTaken
 
-        Returns:
-            The user email associated with the exam results
-        """
+        data.update(tests_taken)
 
-        return obj.UserID.email
+        return data
 
 
 class ExamSerializers(serializers.ModelSerializer):
@@ -113,12 +115,14 @@ class ExamSerializers(serializers.ModelSerializer):
 
     Attributes:
         user_email (serializers.SerializerMethodField): A SerializerMethodField to retrieve the user's email
+        ProgrammeName (serializers.CharField): The name of the programme of the exam
 
     Methods:
         get_user_email(obj): A method to retrieve the email of the user associated with the exam
     """
 
     user_email = serializers.SerializerMethodField()
+    ProgrammeName = serializers.CharField(source='ProgrammeID.Name', read_only=True)
 
     class Meta:
         model = Exams
@@ -186,7 +190,10 @@ class SubjectProgrammesSerializers(serializers.ModelSerializer):
             str: Total number of the associated 'Subject' object
         """
 
-        return Subject.objects.filter(ProgrammeID__Name__iexact=obj.Name).count()
+        if hasattr(obj, 'total_subjects'):
+            return obj.total_subjects
+
+        return Subject.objects.filter(ProgrammeID=obj).count()
 
 
 class SubjectProgrammeSerializers(serializers.ModelSerializer):
@@ -415,7 +422,60 @@ class HistorySerializers(serializers.ModelSerializer):
             obj: Exam model instance.
 
         Returns:
-            The value of the 'ProgrammeName' field from the Exam model instance
+            The name of the programme of the Exam model instance
         """
 
-        return obj.ProgrammeName
+        return obj.ProgrammeID.Name
+
+
+class SubjectStatisticsSerializers(serializers.ModelSerializer):
+    """
+    Serializer class for converting SubjectStatistics model instances to JSON format
+
+    Attributes:
+        Subject: The name of the subject
+        Programme: The name of the programme of the subject
+    """
+
+    Subject = serializers.CharField(source='SubjectID.Name', read_only=True)
+    Programme = serializers.CharField(source='SubjectID.ProgrammeID.Name', read_only=True)
+
+    class Meta:
+        model = SubjectStatistics
+        fields = ['SubjectID', 'Subject', 'Programme', 'TimesAnswered', 'TimesCorrect', 'TimesSkipped', 'Accuracy', 'UpdatedAt']
+
+
+class QuestionStatisticsSerializers(serializers.ModelSerializer):
+    """
+    Serializer class for converting QuestionStatistics model instances to JSON format
+
+    Attributes:
+        Title: The title of the question
+        Answer: The correct option of the question
+        Options: How many times each option of the question was chosen
+
+    Methods:
+        get_Options(obj): Custom method to map every option of the question to the number of times it was chosen
+    """
+
+    Title = serializers.CharField(source='QuestionID.Title', read_only=True)
+    Answer = serializers.CharField(source='QuestionID.Answer', read_only=True)
+    Options = serializers.SerializerMethodField()
+
+    class Meta:
+        model = QuestionStatistics
+        fields = ['QuestionID', 'Title', 'Answer', 'Options', 'TimesAnswered', 'TimesCorrect', 'TimesSkipped', 'Difficulty', 'UpdatedAt']
+
+    def get_Options(self, obj):
+        """
+        Map every option of the question to the number of times it was chosen
+        """
+
+        question = obj.QuestionID
+
+        return [
+            {'Option': question.OptionOne, 'Chosen': obj.OptionOneChosen},
+            {'Option': question.OptionTwo, 'Chosen': obj.OptionTwoChosen},
+            {'Option': question.OptionThree, 'Chosen': obj.OptionThreeChosen},
+            {'Option': question.OptionFour, 'Chosen': obj.OptionFourChosen},
+        ]
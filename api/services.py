@@ -0,0 +1,477 @@
+"""
+In-process query layer shared by the API views and the admin views
+
+Every function returns exactly what the matching endpoint in api/views.py
+sends back, so callers inside the project can use the data directly instead
+of requesting the same server over HTTP
+"""
+
+import uuid
+from Users.models import *
+from Users.catalog import GetCatalog
+from Users.full_text import FullTextSearch
+from django.db.models import Q, Count, OuterRef, Subquery, Prefetch
+from .serializers import *
+
+
+def ParseUUID(value):
+    """
+    Convert an ID given in a URL into a UUID
+
+    Returns:
+        UUID: The parsed ID or None if the value is not an ID
+    """
+
+    try:
+        return uuid.UUID(str(value))
+
+    except ValueError:
+        return None
+
+
+def QueryUsers(get_by=None):
+    """
+    Build the queryset of all users or of a specific user by email or ID
+
+    Parameters:
+        get_by (str): Optional. If provided, selects a specific user by email or ID
+
+    Returns:
+        QuerySet: The selected users
+    """
+
+    if get_by:
+        user_id = ParseUUID(get_by)
+
+        if user_id:
+            return CustomUser.objects.filter(id=user_id)
+
+        return CustomUser.objects.filter(email__lower=get_by.lower())
+
+    return CustomUser.objects.order_by('MemberSince')
+
+
+def GetUsers(get_by=None):
+    """
+    Retrieve a list of all users or a specific user by email or ID
+
+    Parameters:
+        get_by (str): Optional. If provided, retrieves a specific user by email or ID
+
+    Returns:
+        List: Serialized user information
+    """
+
+    return UserSerializers(QueryUsers(get_by), many=True).data
+
+
+def QueryUsersExams():
+    """
+    Build the queryset of every non-superuser whose exams are listed
+
+    Returns:
+        QuerySet: The non-superusers annotated with their number of tests taken
+    """
+
+    tests_taken = ResultsExtraDetails.objects.filter(UserID=OuterRef('pk')).values('TestsTaken')[:1]
+
+    return CustomUser.objects.filter(is_superuser=False).annotate(tests_taken=Subquery(tests_taken)).order_by('MemberSince')
+
+
+def GetUsersExams():
+    """
+    Retrieve email, FullName, ProfileImage and TestsTaken for every non-superuser
+
+    Returns:
+        List: Serialized exams data for non-superuser
+    """
+
+    return UsersExamsSerializers(QueryUsersExams(), many=True).data
+
+
+def GetUsersExamsInEachProgramme(user_email):
+    """
+    Retrieve the number of exams taken in each programme by a user
+
+    Parameters:
+        user_email (str): Email of the user whose exam details are to be retrieved
+
+    Returns:
+        List: Serialized exam details of the user
+    """
+
+    standings = LeaderBoardStanding.objects.select_related('ProgrammeID')
+    users = CustomUser.objects.filter(email__lower=user_email.lower()).prefetch_related(Prefetch('leaderboardstanding_set', queryset=standings))
+    programmes = Programme.objects.order_by('Name').values_list('Name', flat=True)
+
+    return UsersExamsInEachProgrammeSerializers(users, many=True, context={'programmes': programmes}).data
+
+
+def QueryExams(user_email, programme):
+    """
+    Build the queryset of the exams taken by a user in a programme
+
+    Parameters:
+        user_email (str): Email of the user who took the exams
+        programme (str): Name of the programme the exams belong to
+
+    Returns:
+        QuerySet: The selected exams
+    """
+
+    exams = Exams.objects.filter(Q(UserID__email__lower=user_email.lower()) & Q(ProgrammeID__Name__lower=programme.lower()))
+
+    return exams.select_related('UserID', 'ProgrammeID').order_by('Date')
+
+
+def GetExams(user_email, programme):
+    """
+    Retrieve the exams taken by a user in a programme
+
+    Parameters:
+        user_email (str): Email of the user who took the exams
+        programme (str): Name of the programme the exams belong to
+
+    Returns:
+        List: Serialized exam information
+    """
+
+    return ExamSerializers(QueryExams(user_email, programme), many=True).data
+
+
+def GetProgrammes(get_by=None):
+    """
+    Retrieve a list of all programmes or a specific programme by ID or Name
+
+    Served from the catalog cache, the programmes are ordered by Name
+
+    Parameters:
+        get_by (str): Optional. If provided, retrieves a specific programme by ID or Name
+
+    Returns:
+        List: Serialized programme information
+    """
+
+    programmes = GetCatalog('programmes', lambda: list(ProgrammeSerializers(QueryProgrammes(), many=True).data))
+
+    if get_by:
+        programme_id = ParseUUID(get_by)
+
+        if programme_id:
+            return [programme for programme in programmes if programme['ID'] == str(programme_id)]
+
+        return [programme for programme in programmes if programme['Name'].lower() == get_by.lower()]
+
+    return programmes
+
+
+def QueryProgrammes():
+    """
+    Build the queryset of every programme
+
+    Returns:
+        QuerySet: The programmes
+    """
+
+    return Programme.objects.order_by('Name')
+
+
+def QuerySubjectProgrammes():
+    """
+    Build the queryset of every programme along with its number of subjects
+
+    Returns:
+        QuerySet: The programmes annotated with total_subjects
+    """
+
+    return QueryProgrammes().annotate(total_subjects=Count('subject'))
+
+
+def GetSubjectProgrammes():
+    """
+    Retrieve every programme along with its number of subjects
+
+    Returns:
+        List: Serialized subject programme information
+    """
+
+    return GetCatalog('subject-programmes', lambda: list(SubjectProgrammesSerializers(QuerySubjectProgrammes(), many=True).data))
+
+
+def QuerySubjects(programme, subject=None):
+    """
+    Build the queryset of the subjects of a programme or of a specific subject of a programme
+
+    Parameters:
+        programme (str): Name of the programme the subjects belong to
+        subject (str): Optional. If provided, selects a specific subject by Name
+
+    Returns:
+        QuerySet: The selected subjects
+    """
+
+    subjects = Subject.objects.filter(ProgrammeID__Name__lower=programme.lower()).select_related('ProgrammeID')
+
+    if subject:
+        subjects = subjects.filter(Name__lower=subject.lower())
+
+    return subjects.order_by('Name')
+
+
+def GroupSubjectsByProgramme(serializer_class):
+    """
+    Serialize every subject and group them by the lowercased name of their programme
+
+    Parameters:
+        serializer_class (Serializer): The serializer of a subject
+
+    Returns:
+        dict: The serialized subjects of each programme, ordered by Name
+    """
+
+    subjects = list(Subject.objects.select_related('ProgrammeID').order_by('Name'))
+    grouped = {}
+
+    for subject, data in zip(subjects, serializer_class(subjects, many=True).data):
+        grouped.setdefault(subject.ProgrammeID.Name.lower(), []).append(data)
+
+    return grouped
+
+
+def GetSubjects(programme, subject=None):
+    """
+    Retrieve the subjects of a programme or a specific subject of a programme
+
+    Parameters:
+        programme (str): Name of the programme the subjects belong to
+        subject (str): Optional. If provided, retrieves a specific subject by Name
+
+    Returns:
+        List: Serialized subject information
+    """
+
+    subjects = GetCatalog('subjects', lambda: GroupSubjectsByProgramme(SubjectProgrammeSerializers)).get(programme.lower(), [])
+
+    if subject:
+        return [data for data in subjects if data['Name'].lower() == subject.lower()]
+
+    return subjects
+
+
+def GetQuestionProgrammes():
+    """
+    Retrieve every programme along with its total number of questions
+
+    Returns:
+        List: Serialized question programme information
+    """
+
+    return GetCatalog('question-programmes', lambda: list(QuestionProgrammesSerializers(QueryProgrammes(), many=True).data))
+
+
+def GetQuestionProgrammeSubjects(progamme_name):
+    """
+    Retrieve the subjects of a programme along with their total number of questions
+
+    Parameters:
+        progamme_name (str): Name of the programme the subjects belong to
+
+    Returns:
+        List: Serialized question subject information
+    """
+
+    return GetCatalog('question-subjects', lambda: GroupSubjectsByProgramme(QuestionProgrammesSubjectsSerializers)).get(progamme_name.lower(), [])
+
+
+def QueryQuestionsPerSubject(programme, subject):
+    """
+    Build the queryset of the questions of a subject of a programme
+
+    Parameters:
+        programme (str): Name of the programme the subject belongs to
+        subject (str): Name of the subject the questions belong to
+
+    Returns:
+        QuerySet: The selected questions
+    """
+
+    questions = Questions.objects.filter(Q(SubjectID__ProgrammeID__Name__lower=programme.lower()) & Q(SubjectID__Name__lower=subject.lower()))
+
+    return questions.select_related('SubjectID__ProgrammeID').order_by('Title')
+
+
+def GetQuestionsPerSubject(programme, subject):
+    """
+    Retrieve the questions of a subject of a programme
+
+    Parameters:
+        programme (str): Name of the programme the subject belongs to
+        subject (str): Name of the subject the questions belong to
+
+    Returns:
+        List: Serialized question information
+    """
+
+    return QuestionSerializers(QueryQuestionsPerSubject(programme, subject), many=True).data
+
+
+def QueryReports(get_by=None):
+    """
+    Build the queryset of all reports or of specific reports by ID, user email, question ID or question title
+
+    Parameters:
+        get_by (str): Optional. If provided, selects specific reports
+
+    Returns:
+        QuerySet: The selected reports
+    """
+
+    reports = ReportQuestion.objects.select_related('UserID', 'QuestionID').order_by('Date')
+
+    if get_by:
+        report_id = ParseUUID(get_by)
+
+        if report_id:
+            reports = reports.filter(Q(ID=report_id) | Q(QuestionID=report_id))
+
+        else:
+            # Subqueries keep each branch on an index of the reports table
+            users = CustomUser.objects.filter(email__lower=get_by.lower()).values('id')
+            questions = Questions.objects.filter(Title__lower=get_by.lower()).values('ID')
+
+            reports = reports.filter(Q(UserID__in=users) | Q(QuestionID__in=questions))
+
+    return reports
+
+
+def GetReports(get_by=None):
+    """
+    Retrieve a list of all reports or specific reports by ID, user email, question ID or question title
+
+    Parameters:
+        get_by (str): Optional. If provided, retrieves specific reports
+
+    Returns:
+        List: Serialized report information
+    """
+
+    return ReportSerializers(QueryReports(get_by), many=True).data
+
+
+def QueryFeedbacks():
+    """
+    Build the queryset of all feedbacks
+
+    Returns:
+        QuerySet: The feedbacks
+    """
+
+    return FeedBack.objects.order_by('Date')
+
+
+def GetFeedbacks():
+    """
+    Retrieve a list of all feedbacks
+
+    Returns:
+        List: Serialized feedback information
+    """
+
+    return FeedbackSerializers(QueryFeedbacks(), many=True).data
+
+
+# Rows searched by api/search/<kind>, with their serializer
+SEARCH_KINDS = {
+    'questions': (lambda: Questions.objects.select_related('SubjectID__ProgrammeID'), QuestionSerializers),
+    'reports': (lambda: ReportQuestion.objects.select_related('UserID', 'QuestionID'), ReportSerializers),
+    'feedbacks': (lambda: FeedBack.objects.all(), FeedbackSerializers),
+}
+
+
+def QuerySearch(kind, text):
+    """
+    Build the queryset of the questions, reports or feedbacks matching a full-text search
+
+    Parameters:
+        kind (str): One of SEARCH_KINDS
+        text (str): The searched words, "phrases" and prefix* terms
+
+    Returns:
+        QuerySet: The matching rows, most relevant first
+    """
+
+    query, _ = SEARCH_KINDS[kind]
+
+    return FullTextSearch(query(), text)
+
+
+def QueryHistories(get_by):
+    """
+    Build the queryset of the exam history of a user
+
+    Parameters:
+        get_by (str): ID or email of the user
+
+    Returns:
+        QuerySet: The exams taken by the user
+    """
+
+    user_id = ParseUUID(get_by)
+
+    if user_id:
+        exams = Exams.objects.filter(UserID=user_id)
+
+    else:
+        exams = Exams.objects.filter(UserID__email__lower=get_by.lower())
+
+    return exams.select_related('ProgrammeID').order_by('Date')
+
+
+def GetHistories(get_by):
+    """
+    Retrieve the exam history of a user
+
+    Parameters:
+        get_by (str): ID or email of the user
+
+    Returns:
+        List: Serialized history information
+    """
+
+    return HistorySerializers(QueryHistories(get_by), many=True).data
+
+
+def QuerySubjectStatistics(programme=None):
+    """
+    Build the queryset of the answer statistics of every subject or of the subjects of a programme
+
+    Parameters:
+        programme (str): Optional. If provided, only the subjects of this programme are selected
+
+    Returns:
+        QuerySet: The selected subject statistics, least accurate first
+    """
+
+    statistics = SubjectStatistics.objects.all()
+
+    if programme:
+        statistics = statistics.filter(SubjectID__ProgrammeID__Name__lower=programme.lower())
+
+    return statistics.select_related('SubjectID__ProgrammeID').order_by('Accuracy')
+
+
+def QueryQuestionStatistics(programme, subject):
+    """
+    Build the queryset of the answer statistics of the questions of a subject
+
+    Parameters:
+        programme (str): Name of the programme the subject belongs to
+        subject (str): Name of the subject the questions belong to
+
+    Returns:
+        QuerySet: The selected question statistics, most difficult first
+    """
+
+    statistics = QuestionStatistics.objects.filter(Q(SubjectID__ProgrammeID__Name__lower=programme.lower()) & Q(SubjectID__Name__lower=subject.lower()))
+
+    return statistics.select_related('QuestionID').order_by('-Difficulty')
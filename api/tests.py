@@ -0,0 +1,209 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from Users.models import *
+from Users.results import PackAnswers, CountExam
+from Users.analytics import RefreshAnalytics
+from Users.tiered_cache import GetTieredCache
+
+
+# Number of queries each endpoint runs, whatever the number of rows
+QUERY_COUNTS = {
+    'api/users': 2,
+    'api/users/<email>': 2,
+    'api/users_exams': 2,
+    'api/users_exams_each_programmes/<email>': 3,
+    'api/exams/<email>/<programme>': 2,
+    'api/programmes': 0,
+    'api/subject-programmes': 0,
+    'api/subjects/<programme>': 0,
+    'api/questions': 0,
+    'api/questions/<programme>': 0,
+    'api/questions/<programme>/<subject>': 2,
+    'api/reports': 2,
+    'api/feedbacks': 2,
+    'api/histories/<email>': 2,
+    'api/analytics/subjects': 2,
+    'api/analytics/subjects/<programme>': 2,
+    'api/analytics/questions/<programme>/<subject>': 2,
+    'api/search/questions?q=the': 2,
+    'api/search/reports?q=the': 2,
+    'api/search/feedbacks?q=the': 2,
+}
+
+PAGINATED_ENDPOINTS = [
+    'api/users',
+    'api/users/<email>',
+    'api/users_exams',
+    'api/exams/<email>/<programme>',
+    'api/questions/<programme>/<subject>',
+    'api/reports',
+    'api/feedbacks',
+    'api/histories/<email>',
+    'api/analytics/subjects',
+    'api/analytics/subjects/<programme>',
+    'api/analytics/questions/<programme>/<subject>',
+    'api/search/questions?q=the',
+    'api/search/reports?q=the',
+    'api/search/feedbacks?q=the',
+]
+
+
+# Count the queries of computing each response, not of serving it from the tiered cache
+@override_settings(TIERED_CACHE={**getattr(settings, 'TIERED_CACHE', {}), 'ENABLED': False})
+class APIQueryCountTests(TestCase):
+    """
+    Every API endpoint must run a constant number of queries, so a serializer
+    reading a relation row by row shows up as soon as there is more than one row
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        programme = Programme.objects.create(Name='BCA')
+        questions = []
+
+        for subject_name in ['Mathematics', 'English']:
+            subject = Subject.objects.create(ProgrammeID=programme, Name=subject_name, TotalQuestionsToSelect=3)
+
+            for number in range(3):
+                questions.append(
+                    Questions.objects.create(
+                        SubjectID=subject,
+                        Title=f'Which is the {number + 1}. answer of {subject_name}?',
+                        Answer=f'{subject_name[:3]} {number}',
+                        OptionOne=f'{subject_name[:3]} {number}',
+                        OptionTwo=f'{subject_name[:3]} {number + 1}',
+                        OptionThree=f'{subject_name[:3]} {number + 2}',
+                        OptionFour=f'{subject_name[:3]} {number + 3}',
+                    )
+                )
+
+        for number in range(3):
+            user = CustomUser.objects.create_user(f'student{number}@example.com', FullName=f'Student {number}', Gender='male')
+            ResultsExtraDetails.objects.create(UserID=user)
+
+            for options in [[1, 2, 3, 4, 0, 1], [1, 1, 1, 1, 1, 1]]:
+                correct_counter = options.count(1)
+
+                exam = Exams.objects.create(UserID=user, ProgrammeID=programme, CorrectCounter=correct_counter, TotalQuestions=len(questions))
+                answers = []
+
+                for question, option in zip(questions, options):
+                    choices = [question.OptionOne, question.OptionTwo, question.OptionThree, question.OptionFour]
+                    answers.append((question.ID, option, choices[option - 1] if option else '-'))
+
+                paper, answers, user_answers = PackAnswers(answers)
+                ResultSheet.objects.create(ResultID=exam, Paper=paper, Answers=answers, UserAnswers=user_answers)
+
+                CountExam(user, programme, correct_counter)
+
+            ReportQuestion.objects.create(UserID=user, QuestionID=questions[number], Issue=f'Option {number} of the question is wrong')
+            FeedBack.objects.create(Name=f'Student {number}', Email=user.email, Message=f'Thanks for the {number + 1}. test')
+
+        RefreshAnalytics(rebuild=True)
+
+        cls.Values = {
+            '<email>': 'student0@example.com',
+            '<programme>': 'BCA',
+            '<subject>': 'Mathematics',
+        }
+
+    def setUp(self):
+        cache.clear()
+
+    def BuildURL(self, endpoint):
+        url = f'/{endpoint}'
+
+        for placeholder, value in self.Values.items():
+            url = url.replace(placeholder, value)
+
+        return url
+
+    def assertQueryCount(self, url, expected):
+        # Only the queries of a warm process are counted, not the one-off lookups of the first request
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        with self.assertNumQueries(expected):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+
+        return response
+
+    def test_query_counts(self):
+        for endpoint, expected in QUERY_COUNTS.items():
+            with self.subTest(endpoint=endpoint):
+                response = self.assertQueryCount(self.BuildURL(endpoint), expected)
+
+                if endpoint in PAGINATED_ENDPOINTS:
+                    self.assertGreater(len(response.data), 0)
+
+    def test_page_size_does_not_change_query_counts(self):
+        for endpoint in PAGINATED_ENDPOINTS:
+            url = self.BuildURL(endpoint)
+            separator = '&' if '?' in url else '?'
+
+            for limit in [1, 1000]:
+                with self.subTest(endpoint=endpoint, limit=limit):
+                    self.assertQueryCount(f'{url}{separator}limit={limit}', QUERY_COUNTS[endpoint])
+
+
+class TieredCacheInvalidationTests(TestCase):
+    """
+    Pages served from the 'api-lists' tiered cache must show a committed
+    write on the next request instead of after TTL + STALE seconds
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        programme = Programme.objects.create(Name='BCA')
+        subject = Subject.objects.create(ProgrammeID=programme, Name='Mathematics')
+
+        cls.Question = Questions.objects.create(SubjectID=subject, Title='What is 2 + 2?', Answer='4', OptionOne='3', OptionTwo='4', OptionThree='5', OptionFour='6')
+        cls.User = CustomUser.objects.create_user('student@example.com', FullName='Student', Gender='male')
+        cls.Programme = programme
+
+    def setUp(self):
+        cache.clear()
+
+    def GetIDs(self, url, field='ID'):
+        return [row[field] for row in self.client.get(url).data]
+
+    def test_new_exam_is_listed(self):
+        self.assertEqual(self.GetIDs('/api/histories/student@example.com', 'Slug'), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            exam = Exams.objects.create(UserID=self.User, ProgrammeID=self.Programme, CorrectCounter=1, TotalQuestions=1)
+
+        self.assertEqual(self.GetIDs('/api/histories/student@example.com', 'Slug'), [exam.Slug])
+
+    def test_deleted_report_is_not_listed(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            report = ReportQuestion.objects.create(UserID=self.User, QuestionID=self.Question, Issue='Two options are correct')
+
+        self.assertEqual(self.GetIDs('/api/reports'), [str(report.ID)])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            report.delete()
+
+        self.assertEqual(self.GetIDs('/api/reports'), [])
+
+    def test_login_keeps_the_caches(self):
+        invalidations = {name: GetTieredCache(name).Stats().get('invalidations', 0) for name in ['leaderboard', 'api-lists']}
+
+        # Signing in saves the last_login of the user
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.force_login(self.User)
+
+        for name, count in invalidations.items():
+            with self.subTest(namespace=name):
+                self.assertEqual(GetTieredCache(name).Stats().get('invalidations', 0), count)
+
+    def test_renamed_user_invalidates_the_leaderboard(self):
+        invalidations = GetTieredCache('leaderboard').Stats().get('invalidations', 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.User.FullName = 'Renamed Student'
+            self.User.save(update_fields=['FullName'])
+
+        self.assertEqual(GetTieredCache('leaderboard').Stats().get('invalidations', 0), invalidations + 1)
@@ -1,11 +1,60 @@
-from Users.models import *
-from django.db.models import Q
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.permissions import IsAdminUser
+from rest_framework.exceptions import NotFound
+from . import services
 from .serializers import *
+from .pagination import LimitOffsetKeysetPagination, SelectFields
+from Users.paper_buffer import GetPaperBuffer
+from Users.tiered_cache import GetTieredCache, GetTieredCacheStats
+from Users.analytics import RefreshAnalytics
 
 
-class Users(APIView):
+class PaginatedAPIView(APIView):
+    """
+    Base view for endpoints returning a paginated list of rows
+
+    Supports ?limit=&offset=, ?cursor= and ?fields=, see api/pagination.py.
+    Pages are kept in the 'api-lists' tiered cache, keyed by their URL
+
+    Attributes:
+        serializer_class: The serializer of a single row
+        pagination_class: The paginator used to select the rows of a page
+    """
+
+    serializer_class = None
+    pagination_class = LimitOffsetKeysetPagination
+
+    def PaginatedResponse(self, request, queryset):
+        """
+        Serialize only the requested page of a queryset
+
+        Parameters:
+            request (Request): The HTTP request object
+            queryset (QuerySet): The ordered rows of the endpoint
+
+        Returns:
+            Response: A JSON response containing the serialized rows of the page with paging headers
+        """
+
+        def GetPage():
+            paginator = self.pagination_class()
+            page = paginator.paginate_queryset(queryset, request, view=self)
+
+            serializer = self.serializer_class(page, many=True)
+            SelectFields(serializer, request)
+
+            response = paginator.get_paginated_response(serializer.data)
+
+            return list(response.data), {header: response[header] for header in ['X-Total-Count', 'Link'] if response.has_header(header)}
+
+        # The paging links are absolute, so the key includes the host
+        data, headers = GetTieredCache('api-lists').Get(request.build_absolute_uri(), GetPage)
+
+        return Response(data, headers=headers)
+
+
+class Users(PaginatedAPIView):
     """
     API View for retrieving user information
 
@@ -19,6 +68,8 @@ class Users(APIView):
         JSON Response: A serialized list of user information in the response body
     """
 
+    serializer_class = UserSerializers
+
     def get(self, request, get_by=None):
         """
         Handle GET requests for retrieving user information
@@ -31,17 +82,10 @@ class Users(APIView):
             Response: A JSON response containing serialized user information
         """
 
-        if get_by:
-            users = CustomUser.objects.filter(Q(email__iexact=get_by) | Q(id__iexact=get_by))
-
-        else:
-            users = CustomUser.objects.all()
+        return self.PaginatedResponse(request, services.QueryUsers(get_by))
 
-        serialized_user = UserSerializers(users, many=True)
-        return Response(serialized_user.data)
 
-
-class UsersExams(APIView):
+class UsersExams(PaginatedAPIView):
     """
     API view to retrieve exams data for non-superuser
 
@@ -55,6 +99,8 @@ class UsersExams(APIView):
         Response: A serialized response containing email, FirstName, ProfileImage, TestsTaken for non-superuser
     """
 
+    serializer_class = UsersExamsSerializers
+
     def get(self, request):
         """
         Retrieves and serializes exams data for non-superuser
@@ -66,10 +112,7 @@ class UsersExams(APIView):
             Response: A serialized response containing exams data for non-superuser
         """
 
-        users = CustomUser.objects.filter(is_superuser=False)
-
-        serialized_exams = UsersExamsSerializers(users, many=True)
-        return Response(serialized_exams.data)
+        return self.PaginatedResponse(request, services.QueryUsersExams())
 
 
 class UsersExamsInEachProgramme(APIView):
@@ -97,13 +140,10 @@ class UsersExamsInEachProgramme(APIView):
             Response: Django Response object containing serialized exam details
         """
 
-        resultExtraDetails = ResultsExtraDetails.objects.filter(UserID__email__iexact=user_email)
-        serialized_resultExtraDetails = UsersExamsInEachProgrammeSerializers(resultExtraDetails, many=True)
-
-        return Response(serialized_resultExtraDetails.data)
+        return Response(services.GetUsersExamsInEachProgramme(user_email))
 
 
-class Exam(APIView):
+class Exam(PaginatedAPIView):
     """
     API View for retrieving exam information
 
@@ -117,6 +157,8 @@ class Exam(APIView):
         JSON Response: A serialized list of exam information in the response body
     """
 
+    serializer_class = ExamSerializers
+
     def get(self, request, user_email, programme):
         """
         Handle GET requests for retrieving exam information
@@ -129,9 +171,7 @@ class Exam(APIView):
             Response: A JSON response containing serialized exam information
         """
 
-        exams = Exams.objects.filter(Q(UserID__email__iexact=user_email) & Q(ProgrammeName__iexact=programme))
-        serialized_exams = ExamSerializers(exams, many=True)
-        return Response(serialized_exams.data)
+        return self.PaginatedResponse(request, services.QueryExams(user_email, programme))
 
 
 class Programmes(APIView):
@@ -160,14 +200,7 @@ class Programmes(APIView):
             Response: A JSON response containing serialized programme information
         """
 
-        if get_by:
-            programmes = Programme.objects.filter(Q(ID__iexact=get_by) | Q(Name__iexact=get_by))
-
-        else:
-            programmes = Programme.objects.all()
-
-        serialized_programmes = ProgrammeSerializers(programmes, many=True)
-        return Response(serialized_programmes.data)
+        return Response(services.GetProgrammes(get_by))
 
 
 class SubjectProgrammes(APIView):
@@ -192,10 +225,7 @@ class SubjectProgrammes(APIView):
             Response: A JSON response containing serialized subject information
         """
 
-        subject_programmes = Programme.objects.all()
-        serialized_subjects = SubjectProgrammesSerializers(subject_programmes, many=True)
-
-        return Response(serialized_subjects.data)
+        return Response(services.GetSubjectProgrammes())
 
 
 class Subjects(APIView):
@@ -225,14 +255,7 @@ class Subjects(APIView):
             Response: A JSON response containing serialized subject information
         """
 
-        if subject:
-            subjects = Subject.objects.filter(ProgrammeID__Name__iexact=programme, Name__iexact=subject)
-
-        else:
-            subjects = Subject.objects.filter(ProgrammeID__Name__iexact=programme)
-
-        serialized_subjects = SubjectProgrammeSerializers(subjects, many=True)
-        return Response(serialized_subjects.data)
+        return Response(services.GetSubjects(programme, subject))
 
 
 class QuestionProgrammes(APIView):
@@ -261,10 +284,7 @@ class QuestionProgrammes(APIView):
         - Response: A JSON response containing serialized question information
         """
 
-        questions_progammes = Programme.objects.all()
-
-        serialized_questions = QuestionProgrammesSerializers(questions_progammes, many=True)
-        return Response(serialized_questions.data)
+        return Response(services.GetQuestionProgrammes())
 
 
 class QuestionProgrammeSubjects(APIView):
@@ -293,13 +313,10 @@ class QuestionProgrammeSubjects(APIView):
         - Response: A JSON response containing serialized question information
         """
 
-        questions_progammes_subjects = Subject.objects.filter(ProgrammeID__Name__iexact=progamme_name)
-
-        serialized_questions = QuestionProgrammesSubjectsSerializers(questions_progammes_subjects, many=True)
-        return Response(serialized_questions.data)
+        return Response(services.GetQuestionProgrammeSubjects(progamme_name))
 
 
-class QuestionPerSubject(APIView):
+class QuestionPerSubject(PaginatedAPIView):
     """
     API View for retrieving question information
 
@@ -313,6 +330,8 @@ class QuestionPerSubject(APIView):
         JSON Response: A serialized list of question information in the response body
     """
 
+    serializer_class = QuestionSerializers
+
     def get(self, request, programme, subject):
         """
         Handle GET requests for retrieving question information
@@ -325,13 +344,10 @@ class QuestionPerSubject(APIView):
         - Response: A JSON response containing serialized question information
         """
 
-        questions_per_subjects = Questions.objects.filter(Q(SubjectID__ProgrammeID__Name__iexact=programme) & Q(SubjectID__Name__iexact=subject))
-
-        serialized_questions = QuestionSerializers(questions_per_subjects, many=True)
-        return Response(serialized_questions.data)
+        return self.PaginatedResponse(request, services.QueryQuestionsPerSubject(programme, subject))
 
 
-class Reports(APIView):
+class Reports(PaginatedAPIView):
     """
     API View for retrieving reports information
 
@@ -345,6 +361,8 @@ class Reports(APIView):
         JSON Response: A serialized list of report information in the response body
     """
 
+    serializer_class = ReportSerializers
+
     def get(self, request, get_by=None):
         """
         Handle GET requests for retrieving report information
@@ -357,17 +375,10 @@ class Reports(APIView):
             Response: A JSON response containing serialized report information
         """
 
-        if get_by:
-            reports = ReportQuestion.objects.filter(Q(ID__iexact=get_by) | Q(UserID__email__iexact=get_by) | Q(QuestionID__ID__iexact=get_by) | Q(QuestionID__Title__iexact=get_by))
-
-        else:
-            reports = ReportQuestion.objects.all()
+        return self.PaginatedResponse(request, services.QueryReports(get_by))
 
-        serialized_reports = ReportSerializers(reports, many=True)
-        return Response(serialized_reports.data)
 
-
-class Feedbacks(APIView):
+class Feedbacks(PaginatedAPIView):
     """
     API View for retrieving feedback information
 
@@ -381,6 +392,8 @@ class Feedbacks(APIView):
         JSON Response: A serialized list of feedback information in the response body
     """
 
+    serializer_class = FeedbackSerializers
+
     def get(self, request):
         """
         Handle GET requests for retrieving feedback information
@@ -392,13 +405,45 @@ class Feedbacks(APIView):
             Response: A JSON response containing serialized feedback information
         """
 
-        feedbacks = FeedBack.objects.all()
+        return self.PaginatedResponse(request, services.QueryFeedbacks())
+
+
+class Search(PaginatedAPIView):
+    """
+    API View for the full-text search of questions, reports and feedbacks
 
-        serialized_feedbacks = FeedbackSerializers(feedbacks, many=True)
-        return Response(serialized_feedbacks.data)
+    Endpoint:
+        GET api/search/<kind>?q=: Search the questions, reports or feedbacks, most relevant first
 
+    Parameters:
+        kind (str): 'questions', 'reports' or 'feedbacks'
+        q (str): The searched words, "phrases" and prefix* terms
 
-class Histories(APIView):
+    Returns:
+        JSON Response: A serialized list of the matching rows in the response body
+    """
+
+    def get(self, request, kind):
+        """
+        Handle GET requests for searching questions, reports or feedbacks
+
+        Parameters:
+            request (Request): The HTTP request object
+            kind (str): 'questions', 'reports' or 'feedbacks'
+
+        Returns:
+            Response: A JSON response containing the serialized matching rows
+        """
+
+        if kind not in services.SEARCH_KINDS:
+            raise NotFound(f"Unknown search '{kind}', expected one of: {', '.join(services.SEARCH_KINDS)}")
+
+        self.serializer_class = services.SEARCH_KINDS[kind][1]
+
+        return self.PaginatedResponse(request, services.QuerySearch(kind, request.query_params.get('q', '')))
+
+
+class Histories(PaginatedAPIView):
     """
     API View for retrieving history information
 
@@ -413,6 +458,8 @@ class Histories(APIView):
         Response: A JSON response containing serialized history information
     """
 
+    serializer_class = HistorySerializers
+
     def get(self, request, get_by):
         """
         Handle GET requests for retrieving history information
@@ -425,8 +472,146 @@ class Histories(APIView):
             Response: A JSON response containing serialized history information
         """
 
-        histories = Exams.objects.filter(Q(UserID__id__iexact=get_by) | Q(UserID__email__iexact=get_by))
+        return self.PaginatedResponse(request, services.QueryHistories(get_by))
+
+
+class PaperBufferStats(APIView):
+    """
+    API View for monitoring the buffer of ready-made model test papers
+
+    Endpoint:
+        GET api/paper-buffer: Retrieve the depth and the hit rate of the buffer of each programme
 
-        serialized_histories = HistorySerializers(histories, many=True)
+    Returns:
+        JSON Response: The statistics of the paper buffer of the serving process
+    """
+
+    def get(self, request):
+        """
+        Handle GET requests for retrieving the paper buffer statistics
+
+        Parameters:
+            request (Request): The HTTP request object
+
+        Returns:
+            Response: A JSON response containing the buffer statistics or an empty object when the buffer is disabled
+        """
+
+        paper_buffer = GetPaperBuffer()
+
+        return Response(paper_buffer.Stats() if paper_buffer else {})
+
+
+class TieredCacheStats(APIView):
+    """
+    API View for monitoring the tiered caches
+
+    Endpoint:
+        GET api/cache-stats: Retrieve the hits, misses and compute latency of each tiered cache namespace
+
+    Returns:
+        JSON Response: The statistics of the tiered caches of the serving process
+    """
+
+    def get(self, request):
+        """
+        Handle GET requests for retrieving the tiered cache statistics
+
+        Parameters:
+            request (Request): The HTTP request object
+
+        Returns:
+            Response: A JSON response containing the statistics of each namespace used by the process
+        """
+
+        return Response(GetTieredCacheStats())
+
+
+class Analytics(APIView):
+    """
+    API View for recomputing the answer statistics
+
+    Endpoint:
+        POST api/analytics: Add the answers stored since the last refresh to the statistics, superusers only
+        POST api/analytics?rebuild=true: Recount every stored answer instead
+
+    Returns:
+        JSON Response: The number of counted exams and answers and of updated questions and subjects
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        """
+        Handle POST requests for recomputing the answer statistics
+
+        Parameters:
+            request (Request): The HTTP request object
+
+        Returns:
+            Response: A JSON response containing the refresh statistics
+        """
+
+        rebuild = request.query_params.get('rebuild', '').lower() == 'true'
+
+        return Response(RefreshAnalytics(rebuild))
+
+
+class SubjectAnalytics(PaginatedAPIView):
+    """
+    API View for retrieving the answer statistics of subjects
+
+    Endpoint:
+        GET api/analytics/subjects/<programme (optional)>: Retrieve the accuracy of every subject or of the subjects of a programme
+
+    Parameters:
+        programme (str): Optional. If provided, retrieves the subjects of this programme
+
+    Returns:
+        JSON Response: A serialized list of subject statistics, least accurate first
+    """
+
+    serializer_class = SubjectStatisticsSerializers
+
+    def get(self, request, programme=None):
+        """
+        Handle GET requests for retrieving subject statistics
+
+        Parameters:
+            request (Request): The HTTP request object
+            programme (str): Optional. If provided, retrieves the subjects of this programme
+
+        Returns:
+            Response: A JSON response containing serialized subject statistics
+        """
+
+        return self.PaginatedResponse(request, services.QuerySubjectStatistics(programme))
+
+
+class QuestionAnalytics(PaginatedAPIView):
+    """
+    API View for retrieving the answer statistics of questions
+
+    Endpoint:
+        GET api/analytics/questions/<programme>/<subject>: Retrieve the difficulty and the chosen options of the questions of a subject
+
+    Returns:
+        JSON Response: A serialized list of question statistics, most difficult first
+    """
+
+    serializer_class = QuestionStatisticsSerializers
+
+    def get(self, request, programme, subject):
+        """
+        Handle GET requests for retrieving question statistics
+
+        Parameters:
+            request (Request): The HTTP request object
+            programme (str): Name of the programme the subject belongs to
+            subject (str): Name of the subject the questions belong to
+
+        Returns:
+            Response: A JSON response containing serialized question statistics
+        """
 
-        return Response(serialized_histories.data)
+        return self.PaginatedResponse(request, services.QueryQuestionStatistics(programme, subject))